@@ -33,6 +33,23 @@ import matplotlib.pyplot as plt
 from scipy.stats import norm
 
 
+# #### Hilfsmodule verfügbar machen
+# 
+# Die Hilfsmodule im Ordner datenvis (eine Ebene höher) werden über den Suchpfad von Python verfügbar gemacht. Mit figur() wird eine Grafik in der richtigen Grösse erstellt, zeigen() zeigt sie an und schliesst sie danach. Der BildCache aus dem Modul datenvis.bildcache speichert die Grafiken und zeichnet sie nur neu, wenn sich Daten, Plot-Code oder Einstellungen geändert haben.
+
+# In[4]:
+
+
+# Übergeordneten Ordner zum Suchpfad hinzufügen
+import sys
+sys.path.append('..')
+
+from datenvis.bildcache import BildCache, zeige
+from datenvis.figuren import figur, zeigen
+
+cache = BildCache() # Gespeicherte Bilder im Ordner abbildungen.cache
+
+
 # ## Brownsche Bewegung simulieren: Grundlagen
 # 
 # Brownsche Bewegung: Erklärung bei Wolfram Alpha: 
@@ -44,24 +61,25 @@ from scipy.stats import norm
 # Von Scipy wird die Funktion scipy.stats.norm() benötigt: https://docs.scipy.org/doc/scipy/reference/generated/scipy.stats.norm.html
 # Damit können normalverteilte Zufallszahlen generiert werden.
 
-# Die Daten können effizienter erzeugt werden wenn die SciPy-Funktion nur einmal pro Simulation aufgerufen wird. Dazu wird die Funktion brownian(x0, n, dt, delta, out=None) definiert. Parameter der Funktion:
+# Die Daten können effizienter erzeugt werden wenn die SciPy-Funktion nur einmal pro Simulation aufgerufen wird. Dazu wird die Funktion brownian(x0, n, dt, delta, out=None, rng=None) definiert. Parameter der Funktion:
 #     
 #     x0 = Anfangsposition
 #     n = Anzahl Schritte
 #     dt = Zeitschritt
 #     delta = Parameter für die Geschwindigkeit der Brownschen Bewegung
 #     out = Output-Array (wird generiert falls nicht anders spezifiziert)
+#     rng = Zufallsgenerator (z.B. np.random.default_rng(42); gleicher Startwert, gleiche Zufallszahlen)
 
-# In[4]:
+# In[5]:
 
 
 # Funktion zur Berechnung der Brownschen Bewegung:
-def brownian(x0, n, dt, delta, out=None):
+def brownian(x0, n, dt, delta, out=None, rng=None):
 
     x0 = np.asarray(x0) # Punkte auf der x-Achse
 
     # Generiere für jedes x0-Element n Zahlen aus einer Normalverteilung
-    r = norm.rvs(size=x0.shape + (n,), scale=delta*np.sqrt(dt))
+    r = norm.rvs(size=x0.shape + (n,), scale=delta*np.sqrt(dt), random_state=rng)
 
     # Output-Array generieren (falls nicht vorhanden)
     if out is None:
@@ -80,7 +98,7 @@ def brownian(x0, n, dt, delta, out=None):
 
 # Die Parameter der Simulation werden zuerst definiert.
 
-# In[5]:
+# In[6]:
 
 
 # Parameter definieren
@@ -89,11 +107,12 @@ T = 10.0 # Zeit insgesamt
 n = 500 # Anzahl Schritte
 dt = T/n # Zeitschritt
 m = 10 # Anzahl Realisierungen (Trajektorien)
+rng = np.random.default_rng(42) # Zufallsgenerator mit festem Startwert: bei jedem Lauf die gleichen Trajektorien
 
 
 # Die Arrays für die Trajektorien werden initialisiert und dann durch Aufrufen der Funktion brownian() berechnet.
 
-# In[6]:
+# In[7]:
 
 
 # Initialisieren und Trajektorien Berechnen
@@ -101,31 +120,33 @@ x = np.empty((m,n+1)) # Array initialisieren
 # Anfangsbedingungen für x
 x[:, 0] = 0.0
 # Trajektorien Berechnen
-brownian(x[:,0], n, dt, delta, out=x[:,1:])
+brownian(x[:,0], n, dt, delta, out=x[:,1:], rng=rng)
 # Zeitachse erzeugen
 t = np.linspace(0.0, n*dt, n+1)
 
 
-# Die m Realisierungen der Brownschen Bewegung können nun visualisiert werden:
+# Die m Realisierungen der Brownschen Bewegung können nun visualisiert werden. Die Grafik wird nur neu gezeichnet, wenn sich die Trajektorien geändert haben (z.B. mit einem anderen Startwert des Zufallsgenerators).
 
-# In[7]:
+# In[8]:
 
 
 # Trajektorien visualisieren
-for k in range(m):
-    plt.plot(t, x[k])
-plt.xlabel('Zeit [arbitrary units]', fontsize=16)
-plt.ylabel('Position x [arbitrary units]', fontsize=16)
-plt.grid(True)
-plt.savefig('Brownian.png')
-plt.show()
+def zeichne_trajektorien():
+    for k in range(m):
+        plt.plot(t, x[k])
+    plt.xlabel('Zeit [arbitrary units]', fontsize=16)
+    plt.ylabel('Position x [arbitrary units]', fontsize=16)
+    plt.grid(True)
+
+pfad = cache.abbildung('Brownian.png', zeichne_trajektorien, daten=[t, x])
+zeige(pfad)
 
 
 # ## Brownsche Bewegung in 2D
 # 
 # Für die Simulation der Brownschen Bewegung in 2D werden pro Zeitschritt zwei Zufallszahlen (eine für jede Dimension) benötigt.
 
-# In[8]:
+# In[9]:
 
 
 # Parameter definieren
@@ -136,25 +157,25 @@ dt = T/n # Zeitschritt
 nD = 2 # Anzahl Dimensionen 
 
 
-# In[9]:
+# In[10]:
 
 
 # Initialisierung des arrays
 x = np.zeros((nD,n+1))
 
 
-# In[10]:
+# In[11]:
 
 
 # Berechnen der trajektorie
-brownian(x[:,0], n, dt, delta, out=x[:,1:])
+brownian(x[:,0], n, dt, delta, out=x[:,1:], rng=rng)
 
 
 # #### Visualisierung in 2D
 # 
 # Die Visualisierung zeigt die gesamte Trajektorie. Die Zeitdimension ist durch das Markieren der Anfangs und Endpunkte dargestellt.
 
-# In[11]:
+# In[12]:
 
 
 # Plotten der Trajektorie in 2D
@@ -171,7 +192,7 @@ plt.ylabel('y', fontsize=16) # Beschriftung y-Achse
 plt.axis('equal')
 plt.grid(True) # Grid im Plot anzeigen
 plt.legend([ "Trajektorie","Startpunkt","Endpunkt"], fontsize=12) # Datensätze beschriften
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # ## Brownsche Bewegung in 3D
@@ -180,14 +201,13 @@ plt.show()
 
 # Für das 3D-Plotting werden einige zusätzliche Matplotlib-Funktionen benötigt:
 
-# In[12]:
+# In[13]:
 
 
-from pylab import rcParams
 from mpl_toolkits.mplot3d.axes3d import Axes3D
 
 
-# In[13]:
+# In[14]:
 
 
 # Parameter definieren
@@ -198,31 +218,30 @@ dt = T/n # Zeitschritt
 nD = 3 # Anzahl Dimensionen 
 
 
-# In[14]:
+# In[15]:
 
 
 # Initialisierung des arrays
 x = np.zeros((nD,n+1))
 
 
-# In[15]:
+# In[16]:
 
 
 # Berechnen der trajektorie
-brownian(x[:,0], n, dt, delta, out=x[:,1:])
+brownian(x[:,0], n, dt, delta, out=x[:,1:], rng=rng)
 x.shape
 x[0]
 
 
 # #### Visualisierung der Brownschen Bewegung in 3D
 
-# In[16]:
+# In[17]:
 
 
-rcParams['figure.figsize'] = 14, 14 # Grösse des Plots
 plt.rcParams.update({'font.size': 10}) # Grösse der Beschriftung
 
-ax = plt.figure().add_subplot(projection='3d') # 3D Plot initialisieren
+ax = figur(14, 14).add_subplot(projection='3d') # 3D Plot mit Grösse 14 × 14 Zoll initialisieren
 xdata, ydata, zdata = x[:3,:] # Simulationsdaten in 3 Dimensionen aufteilen
 
 # Startpunkt und Endpunkt markieren
@@ -238,7 +257,7 @@ ax.set_title('3D Brownsche Bewegung', fontsize=22) # Titel des Plots
 
 ax.legend(["Startpunkt","Endpunkt", "Trajektorie"], fontsize=15) # Beschrifgung der Daten
 
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # In[ ]:
@@ -30,18 +30,32 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 
-# #### Daten einer einfachen Funktion generieren
+# #### Hilfsmodule verfügbar machen
+# 
+# Die Hilfsmodule im Ordner datenvis (eine Ebene höher) werden über den Suchpfad von Python verfügbar gemacht. zeigen() zeigt eine Grafik an und schliesst sie danach, damit die nächste Grafik in einer neuen Figure gezeichnet wird.
 
 # In[3]:
 
 
+# Übergeordneten Ordner zum Suchpfad hinzufügen
+import sys
+sys.path.append('..')
+
+from datenvis.figuren import zeigen
+
+
+# #### Daten einer einfachen Funktion generieren
+
+# In[4]:
+
+
 # Definition der Punkte auf der x-Achse:
 start = 0 # Anfangspunkt
 end = 10 # Endpunkt
 interval = 0.2 # Abstand der Punkte
 
 
-# In[4]:
+# In[5]:
 
 
 # Generieren der Punkte auf der x-Achse mit numpy.arange
@@ -49,7 +63,7 @@ x = np.arange(start, end, interval)
 print("Datenpunkte auf der x-Achse:\n", x)
 
 
-# In[5]:
+# In[6]:
 
 
 # Funktionswerte (y-Werte) berechnen (sin(x))
@@ -61,21 +75,21 @@ print("Funktionswerte auf der y-Achse:\n", y1)
 # 
 # Auftragen der Funktionswerte auf der y-Achse gegen die Datenpunkte auf der x-Achse
 
-# In[6]:
+# In[7]:
 
 
 plt.title("Einfache Visualisierung einer Funktion") # Titel des Plots
 plt.xlabel('x') # Beschriftung der x-Achse
 plt.ylabel('y') # Beschriftung der y-Achse
 plt.plot(x,y1) # Funktion plotten: x, y1
-plt.show
+zeigen() # Anzeigen und danach schliessen
 
 
 # #### Mehrere Funktionen plotten und labeln
 # 
 # Bei mehreren Datensätzen in einem Plot sollten die einzelnen Sets beschriftet sein.
 
-# In[7]:
+# In[8]:
 
 
 # y-Werte der Funktionen generieren
@@ -83,7 +97,7 @@ y2 = np.cos(x)
 y3 = np.sin(x)*0.3
 
 
-# In[8]:
+# In[9]:
 
 
 plt.title("Einfache Visualisierung mehrerer Funktion") # Titel des Plots
@@ -93,7 +107,7 @@ plt.plot(x,y1) # Funktion plotten: x, y1
 plt.plot(x,y2) # Funktion plotten: x, y2
 plt.plot(x,y3) # Funktion plotten: x, y3
 plt.legend(['cos(x)', 'sin(x)', 'sin(x)*0.3']) # Beschriftung der Datensätze
-plt.show
+zeigen() # Anzeigen und danach schliessen
 
 
 # ## 2. Eigene Daten generieren: Brownsche Bewegung in einer Dimension
@@ -109,7 +123,7 @@ plt.show
 # Von Scipy wird die Funktion scipy.stats.norm() benötigt: https://docs.scipy.org/doc/scipy/reference/generated/scipy.stats.norm.html
 # Damit können normalverteilte Zufallszahlen generiert werden.
 
-# In[9]:
+# In[10]:
 
 
 # Scipy: benötigte Funktionen importieren
@@ -118,7 +132,7 @@ from scipy.stats import norm
 
 # #### Einfache Berechnung der Brownschen Bewegung
 
-# In[10]:
+# In[11]:
 
 
 # Parameter definieren
@@ -128,7 +142,7 @@ x = 0.0 # Ansfangsbedingung (Anfangsposition)
 n = 60 # Anzahl Schritte
 
 
-# In[11]:
+# In[12]:
 
 
 # Berechnen der Brownschen Bewegung über n Schritte im Zeitabstand dt
@@ -145,7 +159,7 @@ print(traj)
 
 # #### Daten visualisieren
 
-# In[12]:
+# In[13]:
 
 
 plt.title("Brownsche Bewegung in 1D") # Titel des Plots
@@ -153,7 +167,7 @@ plt.xlabel('Zeit [arbitrary units]') # Beschriftung der x-Achse
 plt.ylabel('Position [arbitrary units]') # Beschriftung der y-Achse
 plt.plot(traj, 'o:b') # Funktion plotten: Trajektoriendaten gegen Zeit
 plt.savefig('Brownsche_Bewegung_1D.png')
-plt.show
+zeigen() # Anzeigen und danach schliessen
 
 
 # In[ ]:
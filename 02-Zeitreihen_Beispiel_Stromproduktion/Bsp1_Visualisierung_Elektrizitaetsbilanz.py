@@ -34,18 +34,30 @@
 import pandas as pd
 
 
+# #### Hilfsmodule verfügbar machen
+# 
+# Die Hilfsmodule im Ordner datenvis (eine Ebene höher) werden über den Suchpfad von Python verfügbar gemacht.
+
+# In[2]:
+
+
+# Übergeordneten Ordner zum Suchpfad hinzufügen
+import sys
+sys.path.append('..')
+
+
 # #### Datenfile lesen und anzeigen
 # 
 # Pandas stellt Reader für verschiedene Formate zur Verfügung. Der entsprechende Reader read_csv() wird ausgewählt und bekommt als parameter den Filenamen. Die Daten werden dann im Dataframe df gespeichert.
 
-# In[2]:
+# In[3]:
 
 
 # CSV-file lesen
 df = pd.read_csv('ogd35_schweizerische_elektrizitaetsbilanz_monatswerte.csv')
 
 
-# In[3]:
+# In[4]:
 
 
 # Eingelesene Daten anzeigen
@@ -56,25 +68,46 @@ df
 # 
 # Datenstruktur: Dictionnary; die Spalten des CSV-files sind über Keys() zugänglich
 
-# In[4]:
+# In[5]:
 
 
 # Verfügbare Keys anzeigen lassen
 df.keys()
 
 
-# In[5]:
+# In[6]:
 
 
 # Eine bestimmte Spalte auswählen
 df['Endverbrauch_GWh']
 
 
-# In[6]:
+# In[7]:
+
 
+# Alle Werte vom Januar auswählen (Bedingung auf die Spalte Monat)
+df['Endverbrauch_GWh'][df['Monat'] == 1]
 
-# Jeden 12. Datenpunkt einer Spalte auswählen (jeweils erster Monat im Jahr)
-df['Endverbrauch_GWh'][::12]
+
+# #### Daten als Würfel Jahr × Monat × Grösse
+# 
+# Für Auswertungen nach Jahr und Monat werden die Daten einmal mit dem Modul datenvis.bilanz in ein NumPy-Array der Form (Jahre, 12 Monate, Grössen) umgeordnet. Jahr und Monat sind dann direkt Indizes ins Array: eine Auswahl wie "alle Januarwerte" ist ein Slice und hängt weder von der Reihenfolge der Zeilen noch von vollständigen Jahren ab. Fehlende Monate sind NaN und in der Maske wuerfel.gueltig markiert.
+
+# In[8]:
+
+
+from datenvis.bilanz import BilanzWuerfel, MONATE
+
+# Daten umordnen in Würfel (Jahr, Monat, Grösse)
+wuerfel = BilanzWuerfel(df, ['Erzeugung_netto_GWh', 'Einfuhr_GWh', 'Ausfuhr_GWh', 'Endverbrauch_GWh'])
+wuerfel.werte.shape
+
+
+# In[9]:
+
+
+# Endverbrauch im Januar für alle Jahre
+wuerfel.monat(1, 'Endverbrauch_GWh')
 
 
 # ## 2. Visualisierung der Elektrizitätsbilanz
@@ -83,23 +116,28 @@ df['Endverbrauch_GWh'][::12]
 
 # #### Notwendige Module importieren
 
-# In[7]:
+# In[10]:
 
 
 # Matplotlib zum erstellen der Grafiken
 import matplotlib.pyplot as plt
 
+# Grafiken in der richtigen Grösse erstellen und nach dem Anzeigen schliessen
+from datenvis.figuren import figur, zeigen
+
+# Numpy für Berechnungen auf Arrays
+import numpy as np
+
 
 # ### Visualisierung 1: Eine Zeitreihe visualisieren
 # 
 # Die Stromproduktion jedes Energieträgers über die Zeit ist eine Zeitreihe. 
 
-# In[8]:
+# In[11]:
 
 
 # Visualisierung der des Endverbrauchs
-plt.figure().set_figheight(5) # Höhe des Plots
-plt.figure().set_figwidth(15) # Breite des Plots
+figur(15, 5) # Grafik mit Breite 15 und Höhe 5 (in Zoll) erstellen
 plt.rcParams.update({'font.size': 14}) # Schriftgrösse definieren
 
 plt.plot(df['Endverbrauch_GWh']) # Plotten der Stromproduktion nach Datum
@@ -109,19 +147,18 @@ plt.ylabel('Endverbrauch [GWh]') # Beschriftung y-Achse
 
 plt.title("Endverbrauch") # Titel des Plots
 
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # ### Visualisierung 2: Mehrere Zeitreihen visualisieren
 # 
 # Um mehrere Zeitreihen zu vergleichen müssen diese in einem Plot kombiniert werden.
 
-# In[9]:
+# In[12]:
 
 
 # Visualisierung von Einfuhr und Ausfuhr
-plt.figure().set_figheight(5) # Höhe des Plots
-plt.figure().set_figwidth(15) # Breite des Plots
+figur(15, 5) # Grafik mit Breite 15 und Höhe 5 (in Zoll) erstellen
 plt.rcParams.update({'font.size': 14}) # Schriftgrösse definieren
 
 plt.plot(df['Einfuhr_GWh']) # Plotten der Stromproduktion nach Datum
@@ -134,58 +171,115 @@ plt.legend(['Einfuhr', 'Ausfuhr'])
 
 plt.title("Stromeinfuhr und -ausfuhr") # Titel des Plots
 
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # Visualisierung der Daten in mehreren Subplots: die einzelnen Datensätze sind so gut zu erkennen.
 
 # ### Visualisierung 3: Endverbrauch gegen Jahr auftragen
 # 
-# Zur Vereinfachung wird dafür hier nur jeder 12. Datenpunkt verwendet, jeweils der erste Monat des Jahres.
+# Für die Darstellung nach Jahr werden die Monatswerte zu Jahreswerten aggregiert. Das Modul datenvis.aggregation berechnet dazu Summe, Mittelwert, Minimum und Maximum pro Quartal und Jahr. Die Aggregationen werden nur einmal pro Datenfile berechnet und neben dem Datenfile gespeichert. Das Jahr jedes Eintrags ergibt sich aus dem Datum und hängt nicht von der Reihenfolge der Zeilen ab; unvollständige Jahre (z.B. das laufende Jahr) sind markiert und werden hier weggelassen.
 
-# In[10]:
+# In[13]:
 
 
-# Visualisierung der des Endverbrauchs
-plt.figure().set_figheight(5) # Höhe des Plots
-plt.figure().set_figwidth(15) # Breite des Plots
+from datenvis.aggregation import pyramide_bilanz
+
+# Jahreswerte lesen (werden nur bei einem neuen Datenfile neu berechnet)
+bilanz = pyramide_bilanz('ogd35_schweizerische_elektrizitaetsbilanz_monatswerte.csv')
+df_jahr = bilanz['jahr'][bilanz['jahr']['vollstaendig']] # Nur vollständige Jahre
+jahre = df_jahr['Datum'].dt.year
+
+
+# In[14]:
+
+
+# Visualisierung des Endverbrauchs
+figur(15, 5) # Grafik mit Breite 15 und Höhe 5 (in Zoll) erstellen
 plt.rcParams.update({'font.size': 14}) # Schriftgrösse definieren
 
-plt.plot(df['Jahr'][::12], df['Endverbrauch_GWh'][::12]) # Plotten der Stromproduktion nach Datum
+plt.plot(jahre, df_jahr['Endverbrauch_GWh_summe']) # Plotten des Endverbrauchs nach Jahr
 
 plt.xlabel('Jahr') # Beschriftung x-Achse
 plt.ylabel('Endverbrauch [GWh]') # Beschriftung y-Achse
 
-plt.title("Endverbrauch im Januar nach Jahr") # Titel des Plots
+plt.title("Endverbrauch nach Jahr") # Titel des Plots
 
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # ### Visualisierung 4: Erzeugung, Einfuhr, Ausfuhr und Endverbrauch gegen Jahr auftragen
 # 
-# Zur Vereinfachung wird dafür hier nur jeder 12. Datenpunkt verwendet, jeweils der erste Monat des Jahres.
+# Die Jahressummen aller Grössen sind in den gleichen Jahreswerten enthalten.
 
-# In[11]:
+# In[15]:
 
 
-# Visualisierung der des Endverbrauchs
-plt.figure().set_figheight(5) # Höhe des Plots
-plt.figure().set_figwidth(15) # Breite des Plots
+# Visualisierung von Erzeugung, Einfuhr, Ausfuhr und Endverbrauch
+figur(15, 5) # Grafik mit Breite 15 und Höhe 5 (in Zoll) erstellen
 plt.rcParams.update({'font.size': 14}) # Schriftgrösse definieren
 
-plt.plot(df['Jahr'][::12], df['Erzeugung_netto_GWh'][::12]) # Plotten der Stromproduktion nach Datum
-plt.plot(df['Jahr'][::12], df['Einfuhr_GWh'][::12]) # Plotten der Stromproduktion nach Datum
-plt.plot(df['Jahr'][::12], df['Ausfuhr_GWh'][::12]) # Plotten der Stromproduktion nach Datum
-plt.plot(df['Jahr'][::12], df['Endverbrauch_GWh'][::12]) # Plotten der Stromproduktion nach Datum
+plt.plot(jahre, df_jahr['Erzeugung_netto_GWh_summe']) # Plotten der Jahressummen
+plt.plot(jahre, df_jahr['Einfuhr_GWh_summe']) # Plotten der Jahressummen
+plt.plot(jahre, df_jahr['Ausfuhr_GWh_summe']) # Plotten der Jahressummen
+plt.plot(jahre, df_jahr['Endverbrauch_GWh_summe']) # Plotten der Jahressummen
 
 plt.xlabel('Jahr') # Beschriftung x-Achse
-plt.ylabel('Endverbrauch [GWh]') # Beschriftung y-Achse
+plt.ylabel('Energie [GWh]') # Beschriftung y-Achse
 
 plt.legend(['netto Erzeugung', 'Einfuhr', 'Ausfuhr', 'Endverbrauch'])
 
 plt.title("Erzeugung, Einfuhr, Ausfuhr und Endverbrauch") # Titel des Plots
 
-plt.show()
+zeigen() # Anzeigen und danach schliessen
+
+
+# ### Visualisierung 5: Saisonprofil
+# 
+# Das Saisonprofil ist der Mittelwert jedes Monats über alle Jahre. Im Würfel ist das der Mittelwert entlang der Achse der Jahre.
+
+# In[16]:
+
+
+# Visualisierung der Saisonprofile
+figur(15, 5) # Grafik mit Breite 15 und Höhe 5 (in Zoll) erstellen
+plt.rcParams.update({'font.size': 14}) # Schriftgrösse definieren
+
+plt.plot(MONATE, wuerfel.saisonprofil('Erzeugung_netto_GWh')) # Mittlere Erzeugung pro Monat
+plt.plot(MONATE, wuerfel.saisonprofil('Endverbrauch_GWh')) # Mittlerer Endverbrauch pro Monat
+
+plt.xlabel('Monat') # Beschriftung x-Achse
+plt.ylabel('Energie [GWh]') # Beschriftung y-Achse
+
+plt.legend(['netto Erzeugung', 'Endverbrauch'])
+
+plt.title("Saisonprofil: Mittelwert pro Monat %d-%d" % (wuerfel.jahre[0], wuerfel.jahre[-1])) # Titel des Plots
+
+zeigen() # Anzeigen und danach schliessen
+
+
+# ### Visualisierung 6: Nettoimport nach Jahr und Monat
+# 
+# Der Nettoimport (Einfuhr minus Ausfuhr) ist für alle Jahre und Monate eine Differenz zweier Slices des Würfels und kann direkt als Heatmap dargestellt werden. Positive Werte bedeuten einen Importüberschuss.
+
+# In[17]:
+
+
+# Visualisierung des Nettoimports als Heatmap
+figur(15, 8) # Grafik mit Breite 15 und Höhe 8 (in Zoll) erstellen
+plt.rcParams.update({'font.size': 14}) # Schriftgrösse definieren
+
+grenze = np.nanmax(np.abs(wuerfel.nettoimport())) # Symmetrische Farbskala um 0
+plt.imshow(wuerfel.nettoimport().T, cmap='RdBu_r', vmin=-grenze, vmax=grenze, aspect='auto',
+           extent=(wuerfel.jahre[0] - 0.5, wuerfel.jahre[-1] + 0.5, 12.5, 0.5)) # Jahre auf der x-Achse, Monate auf der y-Achse
+plt.colorbar(label='Nettoimport [GWh]')
+
+plt.yticks(range(1, 13), MONATE) # Beschriftung der Monate
+plt.xlabel('Jahr') # Beschriftung x-Achse
+
+plt.title("Nettoimport (Einfuhr - Ausfuhr)") # Titel des Plots
+
+zeigen() # Anzeigen und danach schliessen
 
 
 # In[ ]:
@@ -36,18 +36,30 @@
 import pandas as pd
 
 
+# #### Hilfsmodule verfügbar machen
+# 
+# Die Hilfsmodule im Ordner datenvis (eine Ebene höher) werden über den Suchpfad von Python verfügbar gemacht.
+
+# In[2]:
+
+
+# Übergeordneten Ordner zum Suchpfad hinzufügen
+import sys
+sys.path.append('..')
+
+
 # #### Datenfile lesen und anzeigen
 # 
 # Pandas stellt Reader für verschiedene Formate zur Verfügung. Der entsprechende Reader read_csv() wird ausgewählt und bekommt als parameter den Filenamen. Die Daten werden dann im Dataframe df gespeichert.
 
-# In[2]:
+# In[3]:
 
 
 # CSV-file lesen
 df = pd.read_csv('ogd104_stromproduktion_swissgrid.csv')
 
 
-# In[3]:
+# In[4]:
 
 
 # Eingelesene Daten anzeigen
@@ -58,14 +70,14 @@ df
 # 
 # Datenstruktur: Dictionnary; die Spalten des CSV-files sind über Keys() zugänglich
 
-# In[4]:
+# In[5]:
 
 
 # Verfügbare Keys anzeigen lassen
 df.keys()
 
 
-# In[5]:
+# In[6]:
 
 
 # Eine bestimmte Spalte auswählen
@@ -76,7 +88,7 @@ df['Energietraeger']
 # 
 # Im Inputfile sind alle Energieerzeugungsdaten in der zweiten Spalte gespeichert, der jeweilige Energieträger ist jeweils in der ersten Spalte angegeben. Zur Visualisierung müssen die Daten nach Energieträger gruppiert werden.
 
-# In[6]:
+# In[7]:
 
 
 # Liste der verschiedenen Energieträger erstellen
@@ -92,7 +104,7 @@ print('Liste der Energieträger: \n', Energiearten) # Liste ausgeben
 # 
 # https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.loc.html
 
-# In[7]:
+# In[8]:
 
 
 # Mit df.loc alle Einträge für einen bestimmten Energieträger auswählen und in neuem Dataframe speichern
@@ -104,7 +116,7 @@ df_photo = df.loc[df['Energietraeger'] == 'Photovoltaik']
 df_wind = df.loc[df['Energietraeger'] == 'Wind']
 
 
-# In[8]:
+# In[9]:
 
 
 # Anzahl Datenpunkte pro Energieträger ausgeben
@@ -123,179 +135,294 @@ print('\tWind:\t\t', len(df_wind))
 
 # #### Notwendige Module importieren
 
-# In[9]:
+# In[10]:
 
 
 # Matplotlib zum erstellen der Grafiken
 import matplotlib.pyplot as plt
 
+# Grafiken in der richtigen Grösse erstellen und nach dem Anzeigen schliessen
+from datenvis.figuren import figur, zeigen
+
 
 # ### Visualisierung 1: Eine Zeitreihe visualisieren
 # 
 # Die Stromproduktion jedes Energieträgers über die Zeit ist eine Zeitreihe. 
+# 
+# Die Grafik wird mit dem BildCache aus dem Modul datenvis.bildcache gespeichert. Der Plot ist dazu in einer Funktion zusammengefasst. Aus den Daten, dem Code der Funktion und den Einstellungen (rcParams) wird ein Schlüssel berechnet; hat sich nichts davon geändert, wird das gespeicherte Bild verwendet, ohne neu zu zeichnen.
 
-# In[10]:
+# In[11]:
+
+
+from datenvis.bildcache import BildCache, zeige
+
+cache = BildCache() # Gespeicherte Bilder im Ordner abbildungen.cache
+
+
+# In[12]:
 
 
 # Visualisierung der Stromproduktion aus Flusskraft
-plt.figure().set_figheight(5) # Höhe des Plots
-plt.figure().set_figwidth(15) # Breite des Plots
 plt.rcParams.update({'font.size': 14}) # Schriftgrösse definieren
 
-plt.plot(df_fluss['Datum'],df_fluss['Produktion_GWh']) # Plotten der Stromproduktion nach Datum
+def zeichne_flusskraft():
+    figur(15, 5) # Grafik mit Breite 15 und Höhe 5 (in Zoll) erstellen
 
-plt.xlabel('Datum') # Beschriftung x-Achse
-plt.ylabel('Stromproduktion [GWh]') # Beschriftung y-Achse
+    plt.plot(df_fluss['Datum'],df_fluss['Produktion_GWh']) # Plotten der Stromproduktion nach Datum
 
-# Beschriftung der Achsenpunkte: Reduktion der Punkte zur besseren Lesbarkeit
-plt.xticks(df_fluss['Datum'][0::200], rotation='vertical')  
+    plt.xlabel('Datum') # Beschriftung x-Achse
+    plt.ylabel('Stromproduktion [GWh]') # Beschriftung y-Achse
 
-plt.title("Stromproduktion Flusskraftwerke Schweiz") # Titel des Plots
+    # Beschriftung der Achsenpunkte: Reduktion der Punkte zur besseren Lesbarkeit
+    plt.xticks(df_fluss['Datum'][0::200], rotation='vertical')  
 
-plt.savefig('Stromproduktion_Flusskraft.png', bbox_inches='tight') # Plot in einem PNG-File speichern
+    plt.title("Stromproduktion Flusskraftwerke Schweiz") # Titel des Plots
 
-plt.show()
+# Plot in einem PNG-File speichern (nur neu zeichnen, wenn sich Daten oder Code geändert haben)
+pfad = cache.abbildung('Stromproduktion_Flusskraft.png', zeichne_flusskraft,
+                       daten=[df_fluss['Datum'], df_fluss['Produktion_GWh']], bbox_inches='tight')
+zeige(pfad)
 
 
 # ### Visualisierung 2: Mehrere Zeitreihen visualisieren
 # 
 # Um mehrere Zeitreihen zu vergleichen müssen diese in einem Plot kombiniert werden. Das Plotten der Zeitreihen übereinander erweist sich dabei als nicht nützlich, da die einzelnen Zeitreihen kaum zu erkennen sind. Die Gliederung in verschiedene Subplots ist die bessere Lösung.
+# 
+# Über zehn Jahre sind die Tageswerte zu dicht für einen Plot dieser Breite. Das Modul datenvis.aggregation berechnet Wochen-, Monats-, Quartals- und Jahreswerte (Summe, Mittelwert, Minimum, Maximum) pro Energieträger einmal pro Datenfile und speichert sie neben dem Datenfile. Mit waehle_stufe() wird die feinste Auflösung gewählt, die für den dargestellten Zeitraum höchstens max_punkte Werte liefert.
 
-# In[11]:
+# In[13]:
+
+
+from datenvis.aggregation import pyramide_produktion, waehle_stufe
+
+# Aggregationen lesen (werden nur bei einem neuen Datenfile neu berechnet)
+pyramide = pyramide_produktion('ogd104_stromproduktion_swissgrid.csv')
+
+# Auflösung passend zum Zeitraum wählen
+stufe = waehle_stufe(pyramide, '2015-01-01', '2025-07-31', max_punkte=800)
+df_agg = pyramide[stufe]
+print('Gewählte Auflösung:', stufe)
+
+
+# In[14]:
 
 
 # Visualisierung der verschiedenen Zeitreihen im gleichen Plot
-plt.figure().set_figheight(7) # Höhe des Plots
-plt.figure().set_figwidth(15) # Breite des Plots
+figur(15, 7) # Grafik mit Breite 15 und Höhe 7 (in Zoll) erstellen
 plt.rcParams.update({'font.size': 14}) # Schriftgrösse definieren
 
-plt.plot(df_fluss['Datum'],df_fluss['Produktion_GWh']) # Plotten der Stromproduktion aus Flusskraft
-plt.plot(df_kern['Datum'],df_kern['Produktion_GWh']) # Plotten der Stromproduktion aus Kernkraft
-plt.plot(df_speicher['Datum'],df_speicher['Produktion_GWh']) # Plotten der Stromproduktion aus Speicherkraft
-plt.plot(df_therm['Datum'],df_therm['Produktion_GWh']) # Plotten der Stromproduktion aus Thermische Kraftwerke
+for traeger in ['Flusskraft', 'Kernkraft', 'Speicherkraft', 'Thermische']:
+    df_traeger = df_agg[df_agg['Energietraeger'] == traeger] # Aggregierte Werte eines Energieträgers
+    plt.plot(df_traeger['Datum'], df_traeger['Produktion_GWh_mittel']) # Plotten des Mittelwerts pro Periode
 
 plt.xlabel('Datum') # Beschriftung x-Achse
 plt.ylabel('Stromproduktion [GWh]') # Beschriftung y-Achse
 
-# Beschriftung der Achsenpunkte: Reduktion der Punkte zur besseren Lesbarkeit
-plt.xticks(df_fluss['Datum'][0::200], rotation='vertical')  
-
 plt.legend(['Flusskraft', 'Kernkraft', 'Speicherkraft', 'Thermische']) # Beschriftung der Datensätze
 
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # Visualisierung der Daten in mehreren Subplots: die einzelnen Datensätze sind so gut zu erkennen.
+# 
+# Die sechs Subplots sind gleich aufgebaut. Das Modul datenvis.small_multiples erstellt das Raster mit gemeinsamer x-Achse einmal; serien_nach_gruppe() teilt den Datensatz in einem Schritt in die Zeitreihen der Energieträger auf. Beim Aktualisieren mit neuen Daten werden nur die Daten der bestehenden Linien ersetzt.
 
-# In[12]:
+# In[15]:
+
+
+from datenvis.small_multiples import SmallMultiples, serien_nach_gruppe
+
+# Zeitreihen pro Energieträger: {Energieträger: (Datum, Produktion)}
+serien = serien_nach_gruppe(df)
+
+# Raster mit einem Subplot pro Energieträger
+panel = SmallMultiples(['Flusskraft', 'Kernkraft', 'Speicherkraft', 'Thermische', 'Photovoltaik', 'Wind'],
+                       figsize=(15, 20), ylabel='Stromproduktion [GWh]')
+panel.aktualisieren(serien) # Daten eintragen
 
+zeigen(panel.fig, schliessen=False) # Nicht schliessen: das Raster wird unten wiederverwendet
 
-# Matplotlib subplots
-f, axs = plt.subplots(6,1, figsize=(15, 20)) # Definieren der Subplots
 
-# Subplot Stromproduktion aus Flusskraft
-plt.subplot(6, 1, 1)
-plt.plot(df_fluss['Datum'],df_fluss['Produktion_GWh']) 
-plt.xticks(df_fluss['Datum'][0::500])
-plt.legend(['Flusskraft'])
+# Bei einer Aktualisierung der Daten (z.B. täglich) wird das bestehende Raster wiederverwendet. Bleiben die Achsengrenzen gleich, zeichnet panel.zeichnen() nur die Linien über ein gespeichertes Bild der Achsen und Beschriftungen. Der Vergleich der Zeiten zeigt den Unterschied zum vollständigen Neuerstellen der Grafik.
 
-# Subplot Stromproduktion aus Kernkraft
-plt.subplot(6, 1, 2)
-plt.plot(df_kern['Datum'],df_kern['Produktion_GWh'])
-plt.xticks(df_kern['Datum'][0::500])
-plt.legend(['Kernkraft'])
+# In[16]:
 
-# Subplot Stromproduktion aus Speicherkraftwerke
-plt.subplot(6, 1, 3)
-plt.plot(df_speicher['Datum'],df_speicher['Produktion_GWh'])
-plt.xticks(df_speicher['Datum'][0::500])
-plt.legend(['Speicherkraft'])
 
-# Subplot Stromproduktion thermische Kraftwerke
-plt.subplot(6, 1, 4)
-plt.plot(df_therm['Datum'],df_therm['Produktion_GWh'])
-plt.xticks(df_therm['Datum'][0::500])
-plt.legend(['Thermische'])
-plt.ylabel('Stromproduktion [GWh]')
+import time
 
-# Subplot Stromproduktion aus Photovoltaik
-plt.subplot(6, 1, 5)
-plt.plot(df_photo['Datum'],df_photo['Produktion_GWh'])
-plt.xticks(df_photo['Datum'][0::500])
-plt.legend(['Photovoltaik'])
+panel.zeichnen() # Erstes Zeichnen: Bild der Achsen und Beschriftungen wird gespeichert
 
-# Subplot Stromproduktion aus Windkraft
-plt.subplot(6, 1, 6)
-plt.plot(df_wind['Datum'],df_wind['Produktion_GWh'])
-plt.xticks(df_wind['Datum'][0::500])
-plt.legend(['Wind'])
-plt.xlabel('Datum')
+start = time.perf_counter()
+panel.aktualisieren(serien) # Nur die Daten der Linien ersetzen
+panel.zeichnen()
+print('Aktualisieren: %.3f s' % (time.perf_counter() - start))
 
-plt.show()
+start = time.perf_counter()
+neu = SmallMultiples(panel.namen, figsize=(15, 20), ylabel='Stromproduktion [GWh]') # Raster neu erstellen
+neu.aktualisieren(serien)
+neu.zeichnen()
+plt.close(neu.fig)
+print('Neu erstellen: %.3f s' % (time.perf_counter() - start))
 
 
 # Um die Zeitreihen besser vergleichen zu können werden die x- und y- Achsen zur Visualisierung angeglichen.
+# 
+# Für das interaktive Zoomen und Verschieben wird das Modul datenvis.zoom verwendet. Pro Energieträger wird einmal ein Speicher mit Minimum, Maximum und Mittelwert in Zweierpotenz-Auflösungen berechnet (1, 2, 4, 8, ... Tage pro Eintrag) und neben dem Datenfile gespeichert. Bei jeder Änderung der x-Achse wird die gröbste Auflösung gewählt, die noch einen Eintrag pro Pixel liefert; das Min/Max-Band zeigt dabei auch kurze Spitzen. Die x-Achsen der Subplots sind gekoppelt (sharex=True), das Setzen der Grenzen in einem Subplot wirkt auf alle.
 
-# In[14]:
+# In[17]:
+
+
+from datenvis.zoom import ZoomAnsicht, zoom_produktion
+
+# Zoom-Speicher pro Energieträger lesen (wird nur bei einem neuen Datenfile neu berechnet)
+zoom = zoom_produktion('ogd104_stromproduktion_swissgrid.csv')
+
+
+# In[18]:
 
 
-# Matplotlib subplots
-f, axs = plt.subplots(6,1, figsize=(15, 20)) # Definieren der Subplots
+# Matplotlib subplots mit gemeinsamer x-Achse
+f, axs = plt.subplots(6,1, figsize=(15, 20), sharex=True) # Definieren der Subplots
 
 lx1 = '2016-01-01' # unteres Limit x-Achse
 lx2 = '2025-06-01' # oberes Limit x-Achse
 ly1 = -10.0   # unteres Limit y-Achse
 ly2 = 160.0 # oberes Limit y-Achse
 
-plt.subplot(6, 1, 1) # Subplot Stromproduktion aus Flusskraft
-plt.plot(df_fluss['Datum'],df_fluss['Produktion_GWh'])
-plt.xticks(df_fluss['Datum'][0::400])
-plt.xlim(lx1,lx2)
-plt.ylim(ly1,ly2)
-plt.legend(['Flusskraft'])
-
-plt.subplot(6, 1, 2) # Subplot Stromproduktion aus Kernkraft
-plt.plot(df_kern['Datum'],df_kern['Produktion_GWh'])
-plt.xticks(df_kern['Datum'][0::400])
-plt.xlim(lx1,lx2)
-plt.ylim(ly1,ly2)
-plt.legend(['Kernkraft'])
-
-plt.subplot(6, 1, 3) # Subplot Stromproduktion aus Speicherkraft
-plt.plot(df_speicher['Datum'],df_speicher['Produktion_GWh'])
-plt.xticks(df_speicher['Datum'][0::400])
-plt.xlim(lx1,lx2)
-plt.ylim(ly1,ly2)
-plt.legend(['Speicherkraft'])
-
-plt.subplot(6, 1, 4) # Subplot Stromproduktion aus Thermischen Kraftwerken
-plt.plot(df_therm['Datum'],df_therm['Produktion_GWh'])
-plt.xticks(df_therm['Datum'][0::400])
-plt.legend(['Thermische'])
-plt.xlim(lx1,lx2)
-plt.ylim(ly1,ly2)
-plt.ylabel('Stromproduktion [GWh]')
-
-plt.subplot(6, 1, 5) # Subplot Stromproduktion aus Photovoltaik
-plt.plot(df_photo['Datum'],df_photo['Produktion_GWh'])
-plt.xticks(df_photo['Datum'][0::400])
-plt.xlim(lx1,lx2)
-plt.ylim(ly1,ly2)
-plt.legend(['Photovoltaik'])
-
-plt.subplot(6, 1, 6) # Subplot Stromproduktion aus Windkraft
-plt.plot(df_wind['Datum'],df_wind['Produktion_GWh'])
-plt.xticks(df_wind['Datum'][0::400])
-plt.xlim(lx1,lx2)
-plt.ylim(ly1,ly2)
-plt.legend(['Wind'])
-plt.xlabel('Datum')
-
-plt.show()
+ansichten = [] # Ansichten speichern, damit sie beim Zoomen aktualisiert werden
+for ax, traeger in zip(axs, ['Flusskraft', 'Kernkraft', 'Speicherkraft', 'Thermische', 'Photovoltaik', 'Wind']):
+    ansichten.append(ZoomAnsicht(ax, zoom[traeger], label=traeger)) # Min/Max-Band und Mittelwert
+    ax.set_ylim(ly1,ly2)
+    ax.legend()
+
+axs[3].set_ylabel('Stromproduktion [GWh]')
+axs[5].set_xlabel('Datum')
+axs[0].set_xlim(pd.Timestamp(lx1), pd.Timestamp(lx2)) # Grenzen der x-Achse für alle Subplots
+
+zeigen(f, schliessen=False) # Nicht schliessen: die Ansichten reagieren auf Zoomen und Verschieben
 
 
 # Diese Visualisierung verdeutlicht die Unterschiedlichen Strommengen, die durch die verschiedenen Energieträger erzeugt werden.
 
+# ## 3. Abfragen auf einem spaltenorientierten Datenspeicher
+# 
+# Bisher wird für jede Auswertung der ganze CSV-File gelesen und danach mit df.loc gefiltert. Bei grossen Datensätzen lohnt es sich, die Daten einmal in einem spaltenorientierten Format (Parquet) zu speichern, aufgeteilt nach Energieträger und Jahr. Mit dem Modul datenvis.abfrage wird eine Abfrage zuerst nur beschrieben (Energieträger, Zeitraum, Auflösung, Aggregation) und erst mit lesen() ausgeführt. Dabei werden nur die Teile des Speichers gelesen, die zu den Filtern passen.
+
+# In[19]:
+
+
+from datenvis.abfrage import Abfrage, spaltenspeicher_produktion
+
+# Spaltenspeicher erstellen (nur bei einem neuen Datenfile)
+spalten = spaltenspeicher_produktion('ogd104_stromproduktion_swissgrid.csv')
+
+# Abfrage beschreiben: Photovoltaik 2020-2024, Wochenmittel
+abfrage = Abfrage(spalten).traeger('Photovoltaik').zeitraum('2020-01-01', '2024-12-31').aufloesung('W').aggregieren('mean')
+
+# Anzahl gelesener Files im Vergleich zu allen Files im Speicher
+print(abfrage.erklaeren())
+
+
+# In[20]:
+
+
+# Abfrage ausführen und Resultat visualisieren
+df_pv_woche = abfrage.lesen()
+
+figur(15, 5) # Grafik mit Breite 15 und Höhe 5 (in Zoll) erstellen
+plt.plot(df_pv_woche['Datum'], df_pv_woche['Produktion_GWh'])
+plt.xlabel('Datum') # Beschriftung x-Achse
+plt.ylabel('Stromproduktion [GWh]') # Beschriftung y-Achse
+plt.title('Photovoltaik 2020-2024: Wochenmittel') # Titel des Plots
+zeigen() # Anzeigen und danach schliessen
+
+
+# ## 4. Zyklen in der Stromproduktion: Spektralanalyse und saisonale Zerlegung
+# 
+# In den Plots sind Jahres- und Wochenzyklen zu erkennen. Das Modul datenvis.spektrum macht diese Zyklen messbar. Die Tageswerte werden dazu einmal in eine Matrix mit einer Zeile pro Tag und einer Spalte pro Energieträger umgeordnet; alle Berechnungen laufen gleichzeitig über alle Spalten.
+# 
+# Das Periodogramm zeigt, wie stark jede Frequenz in einer Zeitreihe vorkommt. Es wird mit der schnellen Fourier-Transformation (np.fft.rfft) berechnet. Die stärksten Spitzen ergeben die dominanten Perioden in Tagen.
+
+# In[21]:
+
+
+from datenvis.spektrum import (dominante_perioden, periodogramm, tagesmatrix, zeichne_periodogramme,
+                               zeichne_zerlegung, zerlegen)
+
+# Matrix Tage × Energieträger (fehlende Tage interpoliert)
+tage, matrix, namen = tagesmatrix(df)
+
+# Periodogramme aller Energieträger und die drei stärksten Perioden pro Energieträger
+frequenzen, leistung = periodogramm(matrix)
+perioden = dominante_perioden(frequenzen, leistung, namen, anzahl=3)
+perioden
+
+
+# In[22]:
+
+
+# Periodogramme als Small Multiples, dominante Perioden markiert
+zeichne_periodogramme(frequenzen, leistung, namen, perioden)
+
+zeigen() # Anzeigen und danach schliessen
+
+
+# Die Zerlegung teilt jede Zeitreihe in einen Trend (gleitender Mittelwert über ein Jahr), einen Jahres- und einen Wochenzyklus (Mittelwert pro Tag des Jahres bzw. Tag der Woche) und einen Rest. Die gleitenden Mittelwerte werden als Faltung über die FFT berechnet, ohne Schleife über die Tage.
+
+# In[23]:
+
+
+# Zerlegung in Trend, Wochen- und Jahreszyklus und Rest
+zerlegung = zerlegen(matrix, perioden=(7, 365))
+
+zeichne_zerlegung(tage, matrix, zerlegung, namen)
+
+zeigen() # Anzeigen und danach schliessen
+
+
+# ## 5. Ausfälle und Ausreisser erkennen
+# 
+# Bei der täglichen Aktualisierung der Daten sollen Ausfälle (z.B. ein Kernkraftwerk, das vom Netz geht) sofort auffallen. Der AnomalieDetektor aus dem Modul datenvis.anomalien führt pro Energieträger Mittelwert und Standardabweichung der letzten 30 Tage mit. Ein neuer Wert, dessen z-Wert bezüglich dieser 30 Tage grösser als 4 ist, wird gemeldet.
+# 
+# Mit nachtragen() wird zuerst die ganze Historie auf einmal (vektorisiert) ausgewertet. Die gefundenen Anomalien werden in den Subplots markiert.
+
+# In[24]:
+
+
+from datenvis.anomalien import AnomalieDetektor, markiere_anomalien
+
+detektor = AnomalieDetektor(fenster=30, z_grenze=4.0)
+
+# Historie bis Ende 2024 rückwirkend auswerten
+historie = df[df['Datum'] < '2025-01-01']
+meldungen = detektor.nachtragen(historie)
+print('Anzahl Anomalien:', len(meldungen))
+meldungen.tail()
+
+
+# In[25]:
+
+
+# Zeitreihen mit markierten Anomalien
+panel_anomalien = SmallMultiples(['Flusskraft', 'Kernkraft', 'Speicherkraft', 'Thermische', 'Photovoltaik', 'Wind'],
+                                 figsize=(15, 20), ylabel='Stromproduktion [GWh]')
+panel_anomalien.aktualisieren(serien_nach_gruppe(historie))
+for ax, traeger in zip(panel_anomalien.axs, panel_anomalien.namen):
+    markiere_anomalien(ax, meldungen, traeger)
+
+zeigen() # Anzeigen und danach schliessen
+
+
+# Danach enthält der Detektor den Stand Ende 2024. Neue Tageswerte werden einzeln mit hinzufuegen() bzw. aufnehmen() verarbeitet; der Aufwand pro Wert ist konstant, unabhängig von der Länge der Historie.
+
+# In[26]:
+
+
+# Neue Tageswerte (hier: 2025) einzeln verarbeiten, wie bei der täglichen Aktualisierung
+neu = df[df['Datum'] >= '2025-01-01']
+detektor.aufnehmen(neu)
+
+
 # In[ ]:
 
 
@@ -34,16 +34,28 @@
 import pandas as pd
 
 
-# #### Erste Seite des Excel-Files lesen und anzeigen
+# #### Hilfsmodule verfügbar machen
+# 
+# Die Hilfsmodule im Ordner datenvis (eine Ebene höher) werden über den Suchpfad von Python verfügbar gemacht.
 
 # In[2]:
 
 
+# Übergeordneten Ordner zum Suchpfad hinzufügen
+import sys
+sys.path.append('..')
+
+
+# #### Erste Seite des Excel-Files lesen und anzeigen
+
+# In[3]:
+
+
 # CSV-file lesen
 df = pd.read_csv('ogd104_stromproduktion_swissgrid.csv')
 
 
-# In[3]:
+# In[4]:
 
 
 # Eingelesene Daten anzeigen
@@ -54,14 +66,14 @@ df
 # 
 # Datenstruktur: Dictionnary; die Spalten des CSV-files sind über Keys() zugänglich
 
-# In[4]:
+# In[5]:
 
 
 # Verfügbare Keys anzeigen lassen
 df.keys()
 
 
-# In[5]:
+# In[6]:
 
 
 # Eine bestimmte Spalte auswählen
@@ -72,7 +84,7 @@ df['Energietraeger']
 # 
 # Im Inputfile sind alle Energieerzeugungsdaten in der zweiten Spalte gespeichert, der jeweilige Energieträger ist jeweils in der ersten Spalte angegeben. Zur Visualisierung müssen die Daten nach Energieträger gruppiert werden.
 
-# In[6]:
+# In[7]:
 
 
 # Liste der verschiedenen Energieträger erstellen
@@ -84,7 +96,7 @@ for en in df['Energietraeger']:
 print('Liste der Energieträger: \n', Energiearten)
 
 
-# In[7]:
+# In[8]:
 
 
 # Einen bestimmten Energieträger auswählen und in neuem Dataframe speichern
@@ -103,75 +115,65 @@ print('\tPhotovoltaik:\t', len(df_photo))
 print('\tWind:\t\t', len(df_wind))
 
 
+# #### Daten prüfen: Lücken, Duplikate und Ausreisser
+# 
+# Gleich viele Datenpunkte pro Energieträger bedeuten noch nicht, dass für jeden Tag genau ein Wert vorhanden ist. Fehlende oder doppelte Tage verschieben die Zeitreihen gegeneinander, wenn sie nach Position verglichen werden. Das Modul datenvis.validierung prüft alle Energieträger in einem Durchgang auf Lücken, Duplikate, negative Werte und Ausreisser (z-Wert bezüglich der vorangehenden 30 Tage). Das Resultat ist ein Bericht pro Energieträger, eine Liste der Lücken und eine Maske mit einem Eintrag pro Zeile.
+
+# In[9]:
+
+
+from datenvis.validierung import pruefe_produktion
+
+# Alle Zeitreihen prüfen
+pruefung = pruefe_produktion(df)
+pruefung.bericht
+
+
+# In[10]:
+
+
+# Liste der Lücken
+pruefung.luecken
+
+
 # ## 2. Vergleich der  Stromerzeugung verschiedener Energieträger
 
 # #### Notwendige Module importieren
 
-# In[8]:
+# In[11]:
 
 
 # Matplotlib zum erstellen der Grafiken
 import matplotlib.pyplot as plt
 
+# Grafiken in der richtigen Grösse erstellen und nach dem Anzeigen schliessen
+from datenvis.figuren import figur, zeigen
+
 
 # #### Zeitreihen für alle Energieträger plotten
 # 
-# Für einen allgemeinen Überblick wird zuerst die Stromproduktion aller Energieträger in einzelnen Subplots visualisiert.
+# Für einen allgemeinen Überblick wird zuerst die Stromproduktion aller Energieträger in einzelnen Subplots visualisiert. Das Raster wird mit dem Modul datenvis.small_multiples erstellt (Details im Beispiel 2).
 
-# In[9]:
+# In[12]:
 
 
+from datenvis.small_multiples import SmallMultiples, serien_nach_gruppe
+
 plt.rcParams.update({'font.size': 14}) # Schriftgrösse definieren
 
-# Matplotlib subplots
-f, axs = plt.subplots(6,1, figsize=(15, 20)) # Definieren der Subplots
+# Raster mit einem Subplot pro Energieträger
+panel = SmallMultiples(['Flusskraft', 'Kernkraft', 'Speicherkraft', 'Thermische', 'Photovoltaik', 'Wind'],
+                       figsize=(15, 20), ylabel='Stromproduktion [GWh]')
+panel.aktualisieren(serien_nach_gruppe(df)) # Zeitreihen pro Energieträger eintragen
 
-# Subplot Stromproduktion aus Flusskraft
-plt.subplot(6, 1, 1)
-plt.plot(df_fluss['Datum'],df_fluss['Produktion_GWh']) 
-plt.xticks(df_fluss['Datum'][0::500])
-plt.legend(['Flusskraft'])
-
-# Subplot Stromproduktion aus Kernkraft
-plt.subplot(6, 1, 2)
-plt.plot(df_kern['Datum'],df_kern['Produktion_GWh'])
-plt.xticks(df_kern['Datum'][0::500])
-plt.legend(['Kernkraft'])
-
-# Subplot Stromproduktion aus Speicherkraftwerke
-plt.subplot(6, 1, 3)
-plt.plot(df_speicher['Datum'],df_speicher['Produktion_GWh'])
-plt.xticks(df_speicher['Datum'][0::500])
-plt.legend(['Speicherkraft'])
-
-# Subplot Stromproduktion thermische Kraftwerke
-plt.subplot(6, 1, 4)
-plt.plot(df_therm['Datum'],df_therm['Produktion_GWh'])
-plt.xticks(df_therm['Datum'][0::500])
-plt.legend(['Thermische'])
-plt.ylabel('Stromproduktion [GWh]')
-
-# Subplot Stromproduktion aus Photovoltaik
-plt.subplot(6, 1, 5)
-plt.plot(df_photo['Datum'],df_photo['Produktion_GWh'])
-plt.xticks(df_photo['Datum'][0::500])
-plt.legend(['Photovoltaik'])
-
-# Subplot Stromproduktion aus Windkraft
-plt.subplot(6, 1, 6)
-plt.plot(df_wind['Datum'],df_wind['Produktion_GWh'])
-plt.xticks(df_wind['Datum'][0::500])
-plt.legend(['Wind'])
-plt.xlabel('Datum')
-
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # ## 3. Vergleich zweier Energieträger: Scatterplot, lineare Regression und Korrelationkoeffizient
 # 
 # Die Korrelation zweier Zeitreihen kann visualisiert werden, indem man die Zeitreihen in einem Scatterplot gegeneinander aufträgt. Beispiel hier: Stromproduktion aus Flusskraft gegen Stromproduktion aus Photovoltaik. Als erstes visulalisieren wir beide Zeitreihen im gleichen Plot.
 
-# In[10]:
+# In[13]:
 
 
 ## Matplotlib subplots
@@ -192,22 +194,32 @@ plt.legend(['Flusskraft','Photovoltaik']) # Beschriftung der Datensätze
 plt.ylabel('Stromproduktion [GWh]')
 plt.xlabel('Datum')
 
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # ### Scatterplot zur Datenvisualisierung
 # 
 # Die Stromproduktion aus beiden Quellen wird gegeneinander aufgetragen. Dazu werden Zeitreihen gleicher Länge benötigt, wie sie in diesem Datensatz vorliegen. Bei Zeitreihen ungleicher Länge muss zuerst ein Ausschnitt gleicher Länge gewählt und als neue Zeitreihe gespeichert werden.
+# 
+# Damit jeder Punkt die Werte beider Energieträger vom gleichen Tag enthält, werden die Zeitreihen nach Datum zugeordnet statt nach Position: doppelte Einträge werden mit der Maske aus der Prüfung weggelassen, dann wird mit pivot() eine Spalte pro Energieträger erstellt. Tage, an denen einer der Werte fehlt, werden mit dropna() entfernt.
 
-# In[11]:
+# In[14]:
+
+
+# Zeitreihen nach Datum zuordnen: eine Zeile pro Tag, eine Spalte pro Energieträger
+df_tag = df[~pruefung.maske['duplikat']].pivot(index='Datum', columns='Energietraeger', values='Produktion_GWh')
+df_paar = df_tag[['Flusskraft', 'Photovoltaik']].dropna()
+print('Anzahl Tage mit beiden Werten:', len(df_paar))
 
 
-plt.figure().set_figheight(5)
-plt.figure().set_figwidth(10)
-plt.scatter(df_fluss['Produktion_GWh'], df_photo['Produktion_GWh'], s=10, alpha=0.6, edgecolors="k") # Scatterplot Flusskrft gegen Photovoltaik
+# In[15]:
+
+
+figur(10, 5) # Grafik mit Breite 10 und Höhe 5 (in Zoll) erstellen
+plt.scatter(df_paar['Flusskraft'], df_paar['Photovoltaik'], s=10, alpha=0.6, edgecolors="k") # Scatterplot Flusskrft gegen Photovoltaik
 plt.xlabel('Flusskraft Stromproduktion [GWh]') # Beschriftung x-Achse
 plt.ylabel('Photovoltaik Stromproduktion [GWh]') # Beschriftung y-Achse
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # ### Lineare Regression
@@ -216,7 +228,7 @@ plt.show()
 # 
 # https://numpy.org/doc/stable/reference/generated/numpy.polyfit.html
 
-# In[12]:
+# In[16]:
 
 
 # Numpy importieren
@@ -225,20 +237,19 @@ import numpy as np
 
 # Linearen Regression mit least squares mit np.polyfit() Das Resultat ist die Steigung (b) und Achsenabschitt (a) der Regressionslinie. Der Grad des Polynoms wird über deg=1 (linear) festgelegt.
 
-# In[13]:
+# In[17]:
 
 
 # Fitten der linearen Regression mit least squares with np.polyfit
-b, a = np.polyfit(df_fluss['Produktion_GWh'], df_photo['Produktion_GWh'], deg=1)
+b, a = np.polyfit(df_paar['Flusskraft'], df_paar['Photovoltaik'], deg=1)
 print('b = ', b, '\ta =', a)
 
 
-# In[14]:
+# In[18]:
 
 
-plt.figure().set_figheight(5) # Breite
-plt.figure().set_figwidth(10) # Höhe
-plt.scatter(df_fluss['Produktion_GWh'], df_photo['Produktion_GWh'], s=10, alpha=0.6, edgecolors="k") # Scatterplot Flusskrft gegen Photovoltaik
+figur(10, 5) # Grafik mit Breite 10 und Höhe 5 (in Zoll) erstellen
+plt.scatter(df_paar['Flusskraft'], df_paar['Photovoltaik'], s=10, alpha=0.6, edgecolors="k") # Scatterplot Flusskrft gegen Photovoltaik
 
 # Sequenz der Zahlen von 10 bis 105 generieren (für Darstellung)
 xseq = np.linspace(10, 105, num=100)
@@ -250,7 +261,31 @@ plt.xlabel('Flusskraft Stromproduktion [GWh]')  # Beschriftung x-Achse
 plt.ylabel('Photovoltaik Stromproduktion [GWh]')  # Beschriftung y-Achse
 
 plt.legend(['Datenpunkte','Lineare Regression']) # Beschriftung Daten
-plt.show()
+zeigen() # Anzeigen und danach schliessen
+
+
+# ### Dichte-Darstellung für grosse Datenmengen
+# 
+# Mit Tageswerten hat der Scatterplot einige tausend Punkte. Bei stündlichen oder viertelstündlichen Daten werden es Hunderttausende bis Millionen: jeder Punkt mit Rand und Transparenz gezeichnet dauert lange und das Resultat ist eine einfarbige Fläche. Die Funktion streudiagramm() aus dem Modul datenvis.dichte zeichnet in diesem Fall die Dichte: die Punkte werden in ein Raster gleich grosser Zellen eingeteilt (analog zu np.histogram2d()) und die Anzahl Punkte pro Zelle wird mit einer Farbskala dargestellt. Die Regressionslinie wird darüber gezeichnet.
+# 
+# Mit modus='auto' wird ab einer Grenze (Standard: 20000 Punkte) automatisch die Dichte gezeichnet, mit modus='punkte' oder modus='dichte' kann die Darstellung fest gewählt werden.
+
+# In[19]:
+
+
+from datenvis.dichte import streudiagramm
+
+f, axs = plt.subplots(1, 2, figsize=(20, 6)) # Zwei Plots nebeneinander
+
+# Links: automatische Wahl (hier Scatterplot), rechts: Dichte-Darstellung
+for ax, modus in zip(axs, ['auto', 'dichte']):
+    gewaehlt, b, a = streudiagramm(ax, df_paar['Flusskraft'], df_paar['Photovoltaik'], modus=modus, bins=60)
+    ax.set_xlabel('Flusskraft Stromproduktion [GWh]')  # Beschriftung x-Achse
+    ax.set_ylabel('Photovoltaik Stromproduktion [GWh]')  # Beschriftung y-Achse
+    ax.set_title('Darstellung: ' + gewaehlt)
+    ax.legend()
+
+zeigen() # Anzeigen und danach schliessen
 
 
 # ### Korrelationskoeffizient berechnen mit Numpy
@@ -265,16 +300,46 @@ plt.show()
 # 
 # https://numpy.org/doc/stable/reference/generated/numpy.corrcoef.html
 
-# In[15]:
+# In[20]:
 
 
 # Korrelationsmatrix berechnen
-r = np.corrcoef(df_fluss['Produktion_GWh'], df_photo['Produktion_GWh'])
+r = np.corrcoef(df_paar['Flusskraft'], df_paar['Photovoltaik'])
 
 # Nicht-diagonale Elemente der Korrelationsmatrix ausgeben
 print("Korrelationskoeffizient = ", r[0,1]) 
 
 
+# ### Auswertung grosser Datenfiles in Blöcken
+# 
+# Mit Viertelstundenwerten über viele Jahre passt der Datensatz nicht mehr in den Arbeitsspeicher. Die Funktion blockweise_auswerten() aus dem Modul datenvis.blockweise liest den CSV-File in Blöcken (read_csv mit chunksize) und fasst jeden Block zu Teilresultaten zusammen: Anzahl, Summe, Minimum, Maximum, Mittelwert und Streuung pro Energieträger sowie die Summen, aus denen die Korrelation aller Paare von Energieträgern berechnet wird. Die Teilresultate der Blöcke werden kombiniert; der Speicherbedarf hängt nur von der Blockgrösse ab. Das Resultat ist (bis auf Rundung) gleich wie die Auswertung des ganzen Datensatzes im Speicher mit auswerten().
+
+# In[21]:
+
+
+from datenvis.blockweise import auswerten, blockweise_auswerten
+
+# Blockweise Auswertung direkt aus dem File (hier mit kleinen Blöcken zur Demonstration)
+blockweise = blockweise_auswerten('ogd104_stromproduktion_swissgrid.csv', chunksize=5000)
+blockweise.kennzahlen
+
+
+# In[22]:
+
+
+# Korrelationsmatrix aller Energieträger
+blockweise.korrelation
+
+
+# In[23]:
+
+
+# Vergleich mit der Auswertung im Speicher: maximale Abweichung
+im_speicher = auswerten(df)
+print('Kennzahlen:', (blockweise.kennzahlen - im_speicher.kennzahlen).abs().max().max())
+print('Korrelation:', (blockweise.korrelation - im_speicher.korrelation).abs().max().max())
+
+
 # In[ ]:
 
 
@@ -38,22 +38,32 @@ from pandas import ExcelWriter
 from pandas import ExcelFile
 
 
+# #### Excel-File einmal öffnen
+# 
+# Jedes pd.read_excel('je-d-09.03.03.01.xlsx', ...) öffnet das Excel-File neu und liest es mit openpyxl, das sehr langsam ist. Mit ExcelFile wird das File einmal geöffnet; alle Seiten werden danach aus diesem Objekt gelesen.
+
+# In[3]:
+
+
+mappe = ExcelFile('je-d-09.03.03.01.xlsx')
+
+
 # ## 1. Datenfile anlesen und Daten anzeigen
 # 
 # Einlesen des Datenfiles mit Pandas. Es können verschiedene Seiten und beliebige Ausschitte der Daten ausgewählt und eingelesen werde. Die Daten werden dann in einem Dictionary gespeichert. Dokumentation zur Datenstruktur Dictionary: https://realpython.com/python-dicts/
 
 # #### Erste Seite des Excel-Files lesen und anzeigen
 
-# In[3]:
+# In[4]:
 
 
 # Erste Seite des Excel-Files (default wenn keine Seite spezifiziert ist)
 # Spezifikation Reihen über "header=4"
 # Spezifikation Spalten über "usecols="B,D"" möglich
-df = pd.read_excel('je-d-09.03.03.01.xlsx', header=4)
+df = pd.read_excel(mappe, header=4)
 
 
-# In[4]:
+# In[5]:
 
 
 # Eingelesene Daten anzeigen
@@ -62,30 +72,37 @@ df
 
 # #### Zweite Seite des Excel-Files lesen und anzeigen
 
-# In[5]:
+# In[6]:
 
 
 # Zweite Seite des Excel-Files mit Namen "2020" einlesen
-df2 = pd.read_excel('je-d-09.03.03.01.xlsx', sheet_name="2022", header=4)
+df2 = pd.read_excel(mappe, sheet_name="2022", header=4)
 
 
-# In[6]:
+# In[7]:
 
 
 df2
 
 
 # #### Einen Teilbereich der ersten Seite einlesen (ohne Anmerkungen)
+# 
+# Von Hand geht das mit pd.read_excel(mappe, sheet_name="2023", header=4, skiprows=[32,33,34,35,36,37,38,39,40,41,42]): die Kopfzeile und die übersprungenen Reihen (Anmerkungen) müssen für jede Seite bekannt sein. Das Hilfsmodul datenvis.mietpreise im Ordner datenvis (eine Ebene höher, über den Suchpfad von Python verfügbar gemacht) sucht Kopfzeile und Ende der Tabelle selbst und speichert die Tabelle als Parquet-File neben dem Excel-File; beim nächsten Mal wird das Excel-File gar nicht mehr gelesen.
 
-# In[7]:
+# In[8]:
 
 
-# Zweite Seite mit überspringen der Definierten Reihen einlesen
-# Uebersprungene Reihen definieren mit "Skiprows"
-df1s = pd.read_excel('je-d-09.03.03.01.xlsx', sheet_name="2023", header=4, skiprows=[32,33,34,35,36,37,38,39,40,41,42])
+# Übergeordneten Ordner zum Suchpfad hinzufügen
+import sys
+sys.path.append('..')
 
+from datenvis.mietpreise import lade_mietpreise
+
+# Seite "2023" ohne Anmerkungen
+df1s = lade_mietpreise('je-d-09.03.03.01.xlsx', blatt="2023")
 
-# In[8]:
+
+# In[9]:
 
 
 df1s
@@ -95,21 +112,21 @@ df1s
 # 
 # Datenstruktur: Dicitionnary; die spalten des Excel-Sheets sind über keys() zugänglich
 
-# In[9]:
+# In[10]:
 
 
 # Verfügbare Keys anzeigen lassen
 df1s.keys()
 
 
-# In[10]:
+# In[11]:
 
 
 # Eine bestimmte Spalte auswählen
 df1s['Durch-schnittlicher Mietpreis ']
 
 
-# In[11]:
+# In[12]:
 
 
 # Bestimmte Felder einer bestimmten Zeile ausgeben
@@ -122,29 +139,41 @@ df1s['Durch-schnittlicher Mietpreis '][2:7]
 
 # #### Notwendige Module importieren
 
-# In[12]:
+# In[13]:
 
 
 # Matplotlib zum erstellen der Grafiken
 import matplotlib.pyplot as plt
 
 
-# In[13]:
+# In[14]:
 
 
 # Numpy zur Transformation der Daten
 import numpy as np
 
 
+# #### Hilfsmodule verfügbar machen
+# 
+# Mit figur() wird eine Grafik in der richtigen Grösse erstellt, zeigen() zeigt sie an und schliesst sie danach. Der BildCache aus dem Modul datenvis.bildcache speichert die Grafiken und zeichnet sie nur neu, wenn sich Daten, Plot-Code oder Einstellungen geändert haben.
+
+# In[15]:
+
+
+from datenvis.bildcache import BildCache, zeige
+from datenvis.figuren import figur, zeigen
+
+cache = BildCache() # Gespeicherte Bilder im Ordner abbildungen.cache
+
+
 # #### Visualisierung 1: Durschnittlicher Mietpreis nach Kanton
 # 
 # Einfachster Fall: einen einzelnen Datensatz als Histogramm visualisieren. Die Kantonsnamen werden auf der x-Achse aufgetragen, die Höhe der Mietpreise auf der y-Achse.
 
-# In[14]:
+# In[16]:
 
 
-plt.figure().set_figheight(5)   # Höhe der Grafik
-plt.figure().set_figwidth(15)    # Breite der Grafik
+figur(15, 5) # Grafik mit Breite 15 und Höhe 5 (in Zoll) erstellen
 
 plt.rcParams.update({'font.size': 11}) # Schriftgrösse definieren
 
@@ -158,18 +187,17 @@ plt.xticks(rotation=90) # Labels um 90 Grad drehen
 
 plt.title("Visualisierung 1: Durschnittlicher Mietpreis")
 
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # #### Visualisierungen 2: Vergleich Mietpreise nach Kanton und Wohnungsgrösse, Darstellung übereinander
 # 
 # Für den Vergleich zweier Datensätze können verschiedene Darstellung gewählt werden. Zuerst werden die Datensätze übereinander dargestellt, das heisst der zweite Datensatz wird über dem ersten angezeigt.
 
-# In[15]:
+# In[17]:
 
 
-plt.figure().set_figheight(5)   # Höhe der Grafik
-plt.figure().set_figwidth(15)    # Breite der Grafik
+figur(15, 5) # Grafik mit Breite 15 und Höhe 5 (in Zoll) erstellen
 
 plt.bar(df1s['Unnamed: 0'], df1s['Durch-schnittlicher Mietpreis .2']) # Barplot Datensatz 1
 plt.bar(df1s['Unnamed: 0'], df1s['Durch-schnittlicher Mietpreis .6'], bottom=df1s['Durch-schnittlicher Mietpreis .2']) # Barplot Datensatz 2
@@ -181,36 +209,63 @@ plt.xticks(rotation=90) # Labels um 90 Grad drehen
 
 plt.title("Visualisierung 2: Vergleich Mietpreise nach Wohnungsgrösse und Kanton") # Titel der Grafik
 
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # #### Visualisierungen 3: Vergleich Mietpreise nach Kanton und Wohnungsgrösse, Darstellung nebeneinander
 # 
 # Die Darstellung der Datensätze nebeneinander ist übersichtlicher. Allerding muss der Abstand der Datensätze bestimmt werden.
 
-# In[16]:
+# In[18]:
 
 
 # Berechnen des Abstands zum Visualisieren der Datensätze
-indices = range(len(df1s['Durch-schnittlicher Mietpreis .2'])) # Indices für jeden Eintrag zum bestimmen der Position auf der x-Achse
+indices = np.arange(len(df1s['Durch-schnittlicher Mietpreis .2'])) # Indices für jeden Eintrag zum bestimmen der Position auf der x-Achse
 width = np.min(np.diff(indices))/3. # Breite berechnen
 
-plt.figure().set_figheight(5)   # Höhe der Grafik
-plt.figure().set_figwidth(15)    # Breite der Grafik
+def zeichne_histogramm_2b():
+    figur(15, 5) # Grafik mit Breite 15 und Höhe 5 (in Zoll) erstellen
 
-plt.bar(indices-width/2, df1s['Durch-schnittlicher Mietpreis .2'],width,color='b',label='-Ymin') # Barplot Datensatz 1; x-Postionen Indices-Breite
-plt.bar(indices+width/2, df1s['Durch-schnittlicher Mietpreis .6'],width,color='r',label='Ymax') # Barplot Datensatz 2; x-Postionen Indices+Breite
+    plt.bar(indices-width/2, df1s['Durch-schnittlicher Mietpreis .2'],width,color='b',label='-Ymin') # Barplot Datensatz 1; x-Postionen Indices-Breite
+    plt.bar(indices+width/2, df1s['Durch-schnittlicher Mietpreis .6'],width,color='r',label='Ymax') # Barplot Datensatz 2; x-Postionen Indices+Breite
 
-plt.xticks(indices, df1s['Unnamed: 0'], rotation='vertical') # Beschriftung Datenpunkte nach Kantonen
+    plt.xticks(indices, df1s['Unnamed: 0'], rotation='vertical') # Beschriftung Datenpunkte nach Kantonen
 
-plt.xlabel('Kanton') # Beschriftung x-Achse
-plt.ylabel('Durchschnittlicher Mietpreis [CHF]')  # Beschriftung y-Achse
-plt.legend(['2-Zimmer', '6-Zimmer']) # Datensätze beschriften 
+    plt.xlabel('Kanton') # Beschriftung x-Achse
+    plt.ylabel('Durchschnittlicher Mietpreis [CHF]')  # Beschriftung y-Achse
+    plt.legend(['2-Zimmer', '6-Zimmer']) # Datensätze beschriften 
+
+    plt.title("Visualisierung 3: Mietpreise nach Wohnungsgrösse und Kanton; Darstellung nebeneinander") # Titel der Grafik
+
+# Grafik als .png speichern (nur neu zeichnen, wenn sich Daten oder Code geändert haben)
+pfad = cache.abbildung('Histogram_2b.png', zeichne_histogramm_2b, bbox_inches='tight',
+                       daten=[df1s[['Unnamed: 0', 'Durch-schnittlicher Mietpreis .2', 'Durch-schnittlicher Mietpreis .6']]])
+zeige(pfad)
+
+
+# #### Alle Zimmerzahlen und Jahre: Balken als eine PolyCollection
+# 
+# Mit plt.bar wird pro Datensatz ein Aufruf gebraucht und jeder Balken ist ein eigenes Objekt. Das Hilfsmodul datenvis.balken berechnet die Positionen aller Balken auf einmal (nebeneinander oder mit gestapelt=True übereinander) und zeichnet sie als ein einziges Objekt. Mit aktualisieren() werden nur die Höhen ersetzt, z.B. um ein anderes Jahr zu zeigen (oder in einer Animation), ohne die Grafik neu aufzubauen. Die Mietpreise aller Jahre kommen aus dem Würfel von datenvis.mietwuerfel.
+
+# In[19]:
 
-plt.title("Visualisierung 3: Mietpreise nach Wohnungsgrösse und Kanton; Darstellung nebeneinander") # Titel der Grafik
 
-plt.savefig('Histogram_2b.png', bbox_inches='tight') # Grafik als .png speichern
-plt.show()
+from datenvis.balken import Balkendiagramm
+from datenvis.mietwuerfel import miet_wuerfel
+
+w = miet_wuerfel('je-d-09.03.03.01.xlsx') # Jahr × Kanton × Zimmerzahl × Grösse
+zimmer = w.zimmer[1:] # 1 bis 6+ Zimmer, ohne Total
+
+fig = figur(15, 5)
+ax = fig.subplots()
+balken = Balkendiagramm(ax, w.jahr(int(w.jahre[-1]))[:, 1:], gruppen=w.kantone, serien=zimmer) # neuestes Jahr
+balken.legende(ncols=len(zimmer))
+ax.set_ylabel('Durchschnittlicher Mietpreis [CHF]')
+
+balken.aktualisieren(w.jahr(int(w.jahre[0]))[:, 1:]) # gleiche Grafik, Höhen des ältesten Jahres
+ax.set_title('Mietpreise %d nach Zimmerzahl und Kanton' % w.jahre[0])
+
+zeigen() # Anzeigen und danach schliessen
 
 
 # ## Visualisierung der Daten mit Matplotlib: Tortdendiagramm
@@ -219,14 +274,14 @@ plt.show()
 
 # #### Information aus dem Dataframe bekommen und Datenpunkte weglassen
 
-# In[17]:
+# In[20]:
 
 
 # Informationen zum Kanton sind im df2_a verfügbar
 df1s['Unnamed: 0']
 
 
-# In[18]:
+# In[21]:
 
 
 # Den ersten Datenpunkt (Schweiz) weglassen (alle anderen auswählen)
@@ -235,10 +290,10 @@ df1s['Durch-schnittlicher Mietpreis '][1:]
 
 # #### Tortendiagramm: Mietpreise anteilig nach Kantonen
 
-# In[19]:
+# In[22]:
 
 
-fig = plt.figure(figsize=(22,22)) # Grösse der Grafik
+fig = figur(22, 22) # Grösse der Grafik
 ax = fig.add_axes((0,0,.5,1)) # Achsen definieren
 
 ax.set_title('Visualisierung 4: Mietpreise anteilig nach Kantonen', 
@@ -247,7 +302,7 @@ ax.set_title('Visualisierung 4: Mietpreise anteilig nach Kantonen',
 #Plotten der Mietpreise ohne Vergleichswert Schweiz (Zeile 0 wird weggellasen, auswählen der Zeilen > 0 mit [1:])
 ax.pie(df1s['Durch-schnittlicher Mietpreis '][1:], labels=df1s['Unnamed: 0'][1:], autopct='%1.1f%%')
 
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # ## Links zu weiteren Tutorials
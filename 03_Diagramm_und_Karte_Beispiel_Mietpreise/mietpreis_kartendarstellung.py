@@ -38,21 +38,39 @@ from pandas import ExcelWriter
 from pandas import ExcelFile
 
 
-# #### Einen Teilbereich der ersten Seite einlesen 
+# #### Hilfsmodule verfügbar machen
 # 
-# Details zum Einlesen des Datenfiles sind im Notebook "Visualisierung mit Histogrammen..." erklärt
+# Die Hilfsmodule im Ordner datenvis (eine Ebene höher) werden über den Suchpfad von Python verfügbar gemacht. Mit figur() wird eine Grafik in der richtigen Grösse erstellt, zeigen() zeigt sie an und schliesst sie danach. lade_mietpreise() aus dem Modul datenvis.mietpreise liest eine Seite des Excel-Files ohne Anmerkungen und speichert sie als Parquet-File. Der BildCache aus dem Modul datenvis.bildcache speichert die Grafiken und zeichnet sie nur neu, wenn sich Daten, Plot-Code oder Einstellungen geändert haben.
 
 # In[3]:
 
 
-# Zweite Seite mit überspringen der Definierten Reihen einlesen
-# Uebersprungene Reihen definieren mit "Skiprows"
-df1s = pd.read_excel('je-d-09.03.03.01.xlsx', sheet_name="2023", header=4, skiprows=[32,33,34,35,36,37,38,39,40,41,42])
+# Übergeordneten Ordner zum Suchpfad hinzufügen
+import sys
+sys.path.append('..')
+
+from datenvis.bildcache import BildCache, zeige
+from datenvis.figuren import figur, zeigen
+from datenvis.mietpreise import lade_mietpreise
 
+cache = BildCache() # Gespeicherte Bilder im Ordner abbildungen.cache
+
+
+# #### Einen Teilbereich der ersten Seite einlesen 
+# 
+# Details zum Einlesen des Datenfiles sind im Notebook "Visualisierung mit Histogrammen..." erklärt
 
 # In[4]:
 
 
+# Seite "2023" ohne Anmerkungen: Kopfzeile und Ende der Tabelle werden gesucht
+# (wie pd.read_excel(..., header=4, skiprows=[32,...,42])), danach aus dem Parquet-File gelesen
+df1s = lade_mietpreise('je-d-09.03.03.01.xlsx', blatt="2023")
+
+
+# In[5]:
+
+
 df1s
 
 
@@ -64,7 +82,7 @@ df1s
 # 
 # Matplotlib wird weitering benötigt.
 
-# In[5]:
+# In[6]:
 
 
 # Matplotlib zum erstellen der Grafiken
@@ -79,7 +97,7 @@ import matplotlib.pyplot as plt
 #     
 #     conda install geopandas
 
-# In[6]:
+# In[7]:
 
 
 # Geopandas importieren
@@ -92,16 +110,16 @@ import geopandas as gpd
 # 
 # https://data.geo.admin.ch
 # 
-# Die zur Verfügung gestellten .shp-files können zu .geojson konvertiert werden. Dazu wird das tool 'ogr2ogr' in der commandline mit folgendem Befehl aufgerufen:
+# Die beiliegende Datei switzerland.geojson wurde aus den zur Verfügung gestellten .shp-files mit dem tool 'ogr2ogr' (Teil des GDAL-package https://pypi.org/project/GDAL/, wird zusammen mit GeoPandas installiert) erstellt:
 #     
 # ogr2ogr -f GeoJSON -t_srs EPSG:4326 -simplify 1000 switzerland.geojson swissBOUNDARIES3D_1_5_TLM_KANTONSGEBIET.shp
 # 
-# Das tool 'ogr2ogr' ist teil GDAL-package https://pypi.org/project/GDAL/ die zusammen mit GeoPandas installiert wird.
+# Damit gibt es nur eine Auflösung (Toleranz 1000 m): zu grob für einen vergrösserten Ausschnitt, zu fein für ein kleines Bild. Das Hilfsmodul datenvis.geodaten (siehe unten) kann das .shp-file auch direkt lesen, z.B. lade_kantone('swissBOUNDARIES3D_1_5_TLM_KANTONSGEBIET.shp'), und speichert vereinfachte Grenzen für mehrere Toleranzen.
 # 
 
 # ## Geodaten Visualisieren: Kartendarstellung von .geojson-Files
 
-# In[7]:
+# In[8]:
 
 
 # GeoJson-file mit GeoPandas importieren und anzeigen
@@ -110,38 +128,55 @@ print (geo_df.columns)
 geo_df.head()
 
 
+# #### Aufbereitete Kantonsebene: eine Zeile pro Kanton
+# 
+# Im GeoJSON-File bestehen viele Kantone aus mehreren Zeilen (Teile des Kantons, siehe unten). Das Hilfsmodul datenvis.geodaten fasst die Teile einmal pro Kanton zusammen, berechnet einen Punkt im Inneren und das umgebende Rechteck jedes Kantons und speichert das Resultat als GeoParquet-File (binär, viel schneller zu lesen als GeoJSON). Alle Karten unten verwenden diese Ebene.
+# 
+# Zusätzlich werden die Grenzen mit mehreren Toleranzen vereinfacht (Detailstufen, Spalten geometrie_100, geometrie_500, ...). karte() zeichnet wie plot() von GeoPandas, wählt aber die gröbste Detailstufe, die bei der Grösse und Auflösung der Grafik noch nicht sichtbar ist.
+
+# In[9]:
+
+
+from datenvis.geodaten import ecken, karte, lade_kantone
+
+kantone = lade_kantone('switzerland.geojson') # beim ersten Mal aus dem GeoJSON-File, danach aus dem GeoParquet-File
+print(kantone.shape)
+print('Ecken pro Detailstufe (Toleranz in m):', ecken(kantone))
+kantone.head()
+
+
 # #### Kartendarstellung: Kantone und Kantonsgrenzen
 # 
 # Das .geojson-File enthält Informationen zu Kantonen und Kantonsgrenzen; diese können visualisiert werden.
 
-# In[8]:
+# In[10]:
 
 
 # basic map plot
 plt.rcParams.update({'font.size': 15}) # Schriftgrösse definieren
-fig, ax = plt.subplots(figsize=(20,20)) # Plots initialisieren
-geo_df.plot(ax=ax, column='ERSTELL_J', cmap='OrRd', edgecolor='black') # Karte anzeigen
+ax = figur(20, 20).subplots() # Grafik mit 20 × 20 Zoll und Achsen erstellen
+karte(kantone, ax, column='ERSTELL_J', cmap='OrRd', edgecolor='black') # Karte anzeigen
 ax.set_title('Kartendarstellung: Grundlagen') # Titel setzen
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # #### Kartendarstellung: Einwohnerzahl der Kantone als Heatmap
 # 
 # Zusätzlich entählt das .geojson-File Informationen zur Einwohnerzahl und anderen Kenndaten der Kantone. Die Einwohnerzahl kann als Heatmap auf der Karte angezeigt werden.
 
-# In[9]:
+# In[11]:
 
 
 # Karte mit Kantonsgrenze; Einwohnerzahl als Heatmap
-fig, ax = plt.subplots(figsize=(20,10)) # Grfik und Grösse definieren
-geo_df.plot(ax=ax, column='EINWOHNERZ', cmap='OrRd', edgecolor='black', legend=True, legend_kwds={"label": "Einwohnerzahl"}) # Karte mit Heatmap (cmap)
+ax = figur(20, 10).subplots() # Grafik mit 20 × 10 Zoll und Achsen erstellen
+karte(kantone, ax, column='EINWOHNERZ', cmap='OrRd', edgecolor='black', legend=True, legend_kwds={"label": "Einwohnerzahl"}) # Karte mit Heatmap (cmap)
 ax.set_title('Einwohnerzahl nach Kanton') # Titel festlegen
-plt.show()
+zeigen() # Anzeigen und danach schliessen
 
 
 # ## Geodatenfile Analysieren und Kantonsnamen den Namen im Mietpreis-File zuordnen
 
-# In[10]:
+# In[12]:
 
 
 # Anzahl Zeilen im Geodatensatz anzeigen
@@ -150,14 +185,14 @@ geo_df.shape
 
 # Im Geodatensatz sind mehr Zeilen als Kantone (für viele Kantone sind meherere Einträge enthalten). Um die Kantonsnamen zu vergleichen sollte für jeden Kanton nur ein Eintrag vorhanden sein. Dies kann hier durch weglassen aller Zeilen mit Kantonsfläche 'nan' (not a number) erreicht werden, da dann nur der Haupteintrag für jeden Kanton ausgewählt wird.
 
-# In[11]:
+# In[13]:
 
 
 # Neuen Dataframe erstellen ohne Einträge mit geo_df['KANTONSFLA'] = nan 
 geo_notna = geo_df[geo_df['KANTONSFLA'].notna()]
 
 
-# In[12]:
+# In[14]:
 
 
 geo_notna.shape
@@ -165,7 +200,7 @@ geo_notna.shape
 
 # Wir haben jetzt in geo_notna für jeden Kanton einen Eintrag gespeichert und können ihn anzeigen lassen:
 
-# In[13]:
+# In[15]:
 
 
 # Vergleich der Kantonsnamen nach Index in beiden sortierten Dataframes
@@ -185,21 +220,21 @@ for item in geo_notna['NAME']:
 # 
 # https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.sort_values.html
 
-# In[14]:
+# In[16]:
 
 
 # Sortieren der Geodaten nach Kantonsnamen
 geo_sort = geo_notna.sort_values('NAME',ignore_index=True)
 
 
-# In[15]:
+# In[17]:
 
 
 # Sortieren der Mietpreise nach Kantonsnamen und Weglassen des Eintrags für die Schweiz
 df1s_sorted = df1s[1:].sort_values('Unnamed: 0',ignore_index=True)
 
 
-# In[16]:
+# In[18]:
 
 
 # Vergleich der Kantonsnamen nach Index in beiden sortierten Dataframes
@@ -209,34 +244,34 @@ for num in range(df1s_sorted.shape[0]):
 
 # Die Indices der Kantone stimmen in vier Fällen nicht überein. Dies kann gelöst werden, wenn zwei der Namen ersetzt werden und anschliessend nochmals sortiert wird. 
 
-# In[17]:
+# In[19]:
 
 
 # Ersetzung Nr. 1
 df1s_r = df1s_sorted.replace({'Unnamed: 0': {'Wallis': 'Valais'}})
 
 
-# In[18]:
+# In[20]:
 
 
 # Ersetzung Nr. 2
 df1sr = df1s_r.replace({'Unnamed: 0': {'Tessin': 'Ticino'}})
 
 
-# In[19]:
+# In[21]:
 
 
 # Neue sortierung
 df1sr_sorted = df1sr.sort_values('Unnamed: 0',ignore_index=True)
 
 
-# In[20]:
+# In[22]:
 
 
 df1sr_sorted.shape
 
 
-# In[21]:
+# In[23]:
 
 
 # Überprüfen der Entsprechung und Speichern der entsprechenden Indices in der Liste m_kanton
@@ -248,52 +283,61 @@ for num in range(df1sr_sorted.shape[0]): # Ausgabe der Kantonsnamen in beiden Li
 
 # Die Kantonsnamen sind nun in beiden Listen gleich geordnet. Dadurch kann jeder Eintrag einem Kanton zugeordnet und entsprechend dargestellt werden. Die Zuordnung ist als Indes in der Liste m_kanton gespeichert
 
-# In[22]:
+# In[24]:
 
 
 # Index eines Kantons ausgeben lassen
 m_kanton.index('Zug')
 
 
-# In[23]:
+# In[25]:
 
 
 # Mietpreis eines Kantons ausgeben lassen
 df1sr_sorted['Durch-schnittlicher Mietpreis '][m_kanton.index('Zug')]
 
 
-# ## Visualisierung der Mietpreise auf der Karte
+# #### Systematische Zuordnung über die Kantonsnummer
 # 
-# Für die Visualisierung der Mietpreise wird eine Liste mit dem Mietpreis für jeden Kanton im ursprünglichen Dataframe geo_df erstellt. 
+# Sortieren und Ersetzen funktioniert nur, solange die Namen zufällig gleich sortiert werden; für jede Zeile des Geodatensatzes wird zudem der Name in der Liste m_kanton gesucht. Das Hilfsmodul datenvis.kantone bildet jeden Kantonsnamen (in allen Landessprachen), jedes Kürzel und jede Nummer auf die BFS-Kantonsnummer ab (1 Zürich bis 26 Jura). Die Tabellen werden dann über diese Nummer verbunden, ohne Sortieren und ohne Liste.
 
-# In[24]:
+# In[26]:
 
 
-# Mietpreis für jeden Kanton im Geodatenframe nach Namen auswählen und in der Liste miet_geo speichern
-miet_geo = []
-for item in geo_df['NAME']:
-    #print(item, m_kanton.index(item))
-    miet_geo.append(df1sr_sorted['Durch-schnittlicher Mietpreis '][m_kanton.index(item)])
-#miet_geo
+from datenvis.kantone import kantonsnummer, verbinden
 
+# Kantonsnummern zu den Namen beider Datensätze
+print(kantonsnummer(df1s['Unnamed: 0'][1:]).tolist())
+print(kantonsnummer(geo_notna['NAME']).tolist())
 
-# In[25]:
 
+# ## Visualisierung der Mietpreise auf der Karte
+# 
+# Für die Visualisierung der Mietpreise wird der Mietpreis jedes Kantons an die Zeile des Kantons in der aufbereiteten Ebene kantone angefügt (ohne den Eintrag für die Schweiz, der kein Kanton ist).
+
+# In[27]:
 
-# Transformieren der Liste in ein Dataframe
-df_miet_geo = pd.DataFrame(miet_geo,columns =['Miete'])
 
+# Mietpreis für jeden Kanton im Geodatenframe über die Kantonsnummer zuordnen
+geo_miete = verbinden(kantone, df1s[1:], links='NAME', rechts='Unnamed: 0', spalten=['Durch-schnittlicher Mietpreis '])
+df_miet_geo = pd.DataFrame({'Miete': geo_miete['Durch-schnittlicher Mietpreis ']})
 
-# In[26]:
+
+# In[28]:
 
 
 # Karte mit Kantonsgrenze; Einwohnerzahl als Heatmap
-fig, ax = plt.subplots(figsize=(20,10)) # Grösse festlegen
-ax.set_title('Visualisierung der Mietpreise nach Kantonen: Kartendarstellung', 
-             bbox={'facecolor':'0.8', 'pad':3}, fontsize=20) # Titel festlegen
-geo_df.plot(ax=ax, column=df_miet_geo['Miete'], cmap='OrRd', edgecolor='black', legend=True, legend_kwds={"label": "Mietpreise [CHF]"}) # Karte mit Heatmap (cmap)
-plt.savefig('Mietpreis_Karte.png', bbox_inches='tight') # Grafik als .png speichern
-plt.show()
+def zeichne_karte():
+    fig = figur(20, 10) # Grafik mit 20 × 10 Zoll erstellen
+    ax = fig.subplots()
+    ax.set_title('Visualisierung der Mietpreise nach Kantonen: Kartendarstellung', 
+                 bbox={'facecolor':'0.8', 'pad':3}, fontsize=20) # Titel festlegen
+    karte(kantone, ax, column=df_miet_geo['Miete'], cmap='OrRd', edgecolor='black', legend=True, legend_kwds={"label": "Mietpreise [CHF]"}) # Karte mit Heatmap (cmap)
+    return fig
+
+# Grafik als .png speichern (nur neu zeichnen, wenn sich Daten oder Code geändert haben)
+pfad = cache.abbildung('Mietpreis_Karte.png', zeichne_karte, daten=[kantone, df_miet_geo], bbox_inches='tight')
+zeige(pfad)
 
 
 # Dies ist eine sehr einfache Kartendarstellung. Grundsätzlich können Geodatensätze vielfältig mit anderen Daten kombiniert werden. Zudem gibt es noch weitere Darstellungsmöglichkeiten, z.B. interaktive Karten. 
@@ -0,0 +1,5 @@
+"""Hilfsmodule für die Beispiele zur Datenvisualisierung.
+
+Die Notebooks in den Beispielordnern importieren das Paket über
+``sys.path.append('..')``.
+"""
@@ -0,0 +1,127 @@
+"""Abfragen auf einem spaltenorientierten, partitionierten Speicher der Swissgrid-Daten.
+
+Statt den ganzen CSV-File zu lesen und danach mit ``df.loc`` zu filtern, wird
+der Datensatz einmal als Parquet-Dataset gespeichert, aufgeteilt nach
+Energieträger und Jahr (ein Verzeichnis ``Energietraeger=.../Jahr=...`` pro
+Teil). Eine Abfrage wird zuerst nur beschrieben:
+
+    Abfrage(speicher).traeger('Photovoltaik').zeitraum('2020-01-01', '2024-12-31') \\
+        .aufloesung('W').aggregieren('mean')
+
+Erst ``lesen()`` führt sie aus. Die Filter werden dabei an PyArrow
+weitergegeben: Teile, deren Energieträger oder Jahr nicht passt, werden gar
+nicht geöffnet, und innerhalb eines Files werden Zeilengruppen anhand der
+gespeicherten Minimum/Maximum-Werte von Datum übersprungen. Zeitliche
+Auflösung und Aggregation werden danach nur auf den gelesenen Zeilen berechnet.
+
+Benötigt PyArrow (``conda install pyarrow``).
+"""
+
+import copy
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from . import speicher
+from .stromdaten import DATEI_PRODUKTION, lade_produktion
+
+PARTITIONEN = ['Energietraeger', 'Jahr']
+
+
+def spaltenspeicher_produktion(pfad=DATEI_PRODUKTION, zeilen_pro_gruppe=100_000):
+    """Swissgrid-Produktion als partitioniertes Parquet-Dataset; gibt das Verzeichnis zurück.
+
+    Wird einmal pro Datenstand geschrieben (siehe ``speicher``).
+    """
+    verzeichnis = speicher.cache_verzeichnis(pfad, 'spalten')
+    if speicher.ist_aktuell(verzeichnis, pfad):
+        return verzeichnis
+
+    speicher.markiere_ungueltig(verzeichnis)
+    df = lade_produktion(pfad).sort_values(['Energietraeger', 'Datum'])
+    df['Energietraeger'] = df['Energietraeger'].astype(str)
+    df['Jahr'] = df['Datum'].dt.year
+    ds.write_dataset(
+        pa.Table.from_pandas(df, preserve_index=False), verzeichnis / 'daten', format='parquet',
+        partitioning=PARTITIONEN, partitioning_flavor='hive', existing_data_behavior='delete_matching',
+        max_rows_per_group=zeilen_pro_gruppe, min_rows_per_group=min(zeilen_pro_gruppe, 1024),
+    )
+    speicher.markiere_aktuell(verzeichnis, pfad)
+    return verzeichnis
+
+
+class Abfrage:
+    """Verkettbare, erst bei ``lesen()`` ausgeführte Abfrage auf dem Spaltenspeicher.
+
+    Jede Methode gibt eine neue Abfrage zurück; die ursprüngliche bleibt unverändert.
+    """
+
+    def __init__(self, verzeichnis):
+        self.verzeichnis = verzeichnis
+        self._traeger = None
+        self._von = None
+        self._bis = None
+        self._freq = None
+        self._funktion = 'mean'
+
+    def _mit(self, **felder):
+        neu = copy.copy(self)
+        for name, wert in felder.items():
+            setattr(neu, name, wert)
+        return neu
+
+    def traeger(self, *namen):
+        """Nur die angegebenen Energieträger."""
+        return self._mit(_traeger=list(namen))
+
+    def zeitraum(self, von=None, bis=None):
+        """Nur Einträge mit von <= Datum <= bis."""
+        return self._mit(_von=None if von is None else pd.Timestamp(von),
+                         _bis=None if bis is None else pd.Timestamp(bis))
+
+    def aufloesung(self, freq):
+        """Zeitliche Auflösung des Resultats, z.B. 'W', 'MS', 'QS', 'YS'."""
+        return self._mit(_freq=freq)
+
+    def aggregieren(self, funktion):
+        """Aggregation pro Periode, z.B. 'mean', 'sum', 'min', 'max'."""
+        return self._mit(_funktion=funktion)
+
+    def _dataset(self):
+        return ds.dataset(self.verzeichnis / 'daten', format='parquet', partitioning='hive')
+
+    def filter(self):
+        """PyArrow-Ausdruck der Filter (None ohne Filter)."""
+        bedingungen = []
+        if self._traeger is not None:
+            bedingungen.append(ds.field('Energietraeger').isin(self._traeger))
+        if self._von is not None:
+            bedingungen.append(ds.field('Jahr') >= self._von.year)
+            bedingungen.append(ds.field('Datum') >= self._von.to_pydatetime())
+        if self._bis is not None:
+            bedingungen.append(ds.field('Jahr') <= self._bis.year)
+            bedingungen.append(ds.field('Datum') <= self._bis.to_pydatetime())
+        ausdruck = None
+        for bedingung in bedingungen:
+            ausdruck = bedingung if ausdruck is None else ausdruck & bedingung
+        return ausdruck
+
+    def erklaeren(self):
+        """Anzahl Files, die gelesen werden, und Anzahl Files im Speicher."""
+        dataset = self._dataset()
+        return {
+            'files_gelesen': sum(1 for _ in dataset.get_fragments(filter=self.filter())),
+            'files_total': sum(1 for _ in dataset.get_fragments()),
+        }
+
+    def lesen(self):
+        """Abfrage ausführen; gibt ein DataFrame in Langform zurück (Datum, Energietraeger, Produktion_GWh)."""
+        tabelle = self._dataset().to_table(
+            columns=['Datum', 'Energietraeger', 'Produktion_GWh'], filter=self.filter())
+        df = tabelle.to_pandas()
+        df['Energietraeger'] = df['Energietraeger'].astype('category')
+        if self._freq is None:
+            return df.sort_values(['Energietraeger', 'Datum'], ignore_index=True)
+        gruppiert = df.groupby(['Energietraeger', pd.Grouper(key='Datum', freq=self._freq)], observed=True)
+        return gruppiert['Produktion_GWh'].agg(self._funktion).reset_index()
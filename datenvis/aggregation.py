@@ -0,0 +1,122 @@
+"""Kalender-Aggregationen (Woche, Monat, Quartal, Jahr) für Zeitreihen.
+
+Die Aggregationen werden einmal pro Datenstand berechnet und als Parquet-Files
+neben dem Datenfile gespeichert (siehe ``speicher``). Die Plots lesen dann die
+Auflösung, die zum dargestellten Zeitraum passt: eine Übersicht über mehrere
+Jahre braucht nur so viele Punkte wie Wochen, Monate oder Jahre im Zeitraum
+liegen, nicht so viele wie Zeilen im Datensatz.
+
+Jede Stufe ist ein DataFrame mit den Spalten
+
+    [Gruppe], Datum, <wert>_summe, <wert>_mittel, <wert>_min, <wert>_max,
+    anzahl, vollstaendig
+
+``Datum`` ist der Beginn der Periode, ``anzahl`` die Anzahl Datenpunkte in der
+Periode und ``vollstaendig`` gibt an, ob die Periode vollständig abgedeckt ist
+(z.B. ein angefangenes Jahr am Ende der Zeitreihe).
+
+Benötigt PyArrow zum Speichern (``conda install pyarrow``).
+"""
+
+import pandas as pd
+
+from . import speicher
+from .stromdaten import DATEI_BILANZ, DATEI_PRODUKTION, bilanz_groessen, lade_bilanz, lade_produktion
+
+# Perioden-Codes von Pandas, von fein nach grob
+FREQUENZEN = ['D', 'W', 'M', 'Q', 'Y']
+STUFEN = {'woche': 'W', 'monat': 'M', 'quartal': 'Q', 'jahr': 'Y'}
+
+# Ungefähre Länge einer Periode in Tagen (zur Wahl der Auflösung)
+TAGE_PRO_PERIODE = {'D': 1.0, 'W': 7.0, 'M': 30.44, 'Q': 91.31, 'Y': 365.25}
+
+KENNZAHLEN = {'sum': 'summe', 'mean': 'mittel', 'min': 'min', 'max': 'max'}
+
+
+def berechne_pyramide(df, werte, datum='Datum', gruppe=None, basis='D'):
+    """Alle Stufen gröber als ``basis`` berechnen.
+
+    df: Rohdaten in Langform
+    werte: Liste der zu aggregierenden Spalten
+    datum: Spalte mit dem Datum
+    gruppe: optionale Spalte zum Gruppieren (z.B. 'Energietraeger')
+    basis: Auflösung der Rohdaten ('D' für Tageswerte, 'M' für Monatswerte)
+    """
+    zeit = pd.to_datetime(df[datum])
+    pyramide = {}
+    for stufe, freq in STUFEN.items():
+        if FREQUENZEN.index(freq) <= FREQUENZEN.index(basis):
+            continue
+        perioden = zeit.dt.to_period(freq).rename(datum)
+        schluessel = [perioden] if gruppe is None else [df[gruppe], perioden]
+        gruppiert = df[list(werte)].groupby(schluessel, observed=True, sort=True)
+
+        agg = gruppiert.agg(list(KENNZAHLEN))
+        agg.columns = [f'{wert}_{KENNZAHLEN[kennzahl]}' for wert, kennzahl in agg.columns]
+        agg['anzahl'] = gruppiert.size()
+        agg = agg.reset_index()
+
+        # Erwartete Anzahl Datenpunkte pro Periode (z.B. Tage im Monat, Monate im Quartal)
+        p = pd.PeriodIndex(agg[datum])
+        erwartet = p.asfreq(basis, how='end').asi8 - p.asfreq(basis, how='start').asi8 + 1
+        agg['vollstaendig'] = agg['anzahl'].to_numpy() >= erwartet
+        agg[datum] = p.start_time
+        pyramide[stufe] = agg
+    return pyramide
+
+
+def speichere_pyramide(pyramide, verzeichnis):
+    """Alle Stufen als Parquet-Files ins Verzeichnis schreiben."""
+    for stufe, agg in pyramide.items():
+        agg.to_parquet(verzeichnis / f'{stufe}.parquet', index=False)
+
+
+def lade_pyramide(verzeichnis):
+    """Gespeicherte Stufen aus dem Verzeichnis lesen."""
+    return {pfad.stem: pd.read_parquet(pfad) for pfad in sorted(verzeichnis.glob('*.parquet'))}
+
+
+def _pyramide(quelle, berechnen):
+    verzeichnis = speicher.cache_verzeichnis(quelle, 'aggregation')
+    if speicher.ist_aktuell(verzeichnis, quelle):
+        return lade_pyramide(verzeichnis)
+    speicher.markiere_ungueltig(verzeichnis)
+    pyramide = berechnen()
+    speichere_pyramide(pyramide, verzeichnis)
+    speicher.markiere_aktuell(verzeichnis, quelle)
+    return pyramide
+
+
+def pyramide_produktion(pfad=DATEI_PRODUKTION):
+    """Aggregationen der Swissgrid-Produktion pro Energieträger (einmal pro Datenstand)."""
+    return _pyramide(pfad, lambda: berechne_pyramide(
+        lade_produktion(pfad), ['Produktion_GWh'], gruppe='Energietraeger', basis='D'))
+
+
+def pyramide_bilanz(pfad=DATEI_BILANZ):
+    """Aggregationen der Elektrizitätsbilanz pro Quartal und Jahr (einmal pro Datenstand)."""
+    def berechnen():
+        df = lade_bilanz(pfad)
+        return berechne_pyramide(df, bilanz_groessen(df), basis='M')
+    return _pyramide(pfad, berechnen)
+
+
+def waehle_stufe(pyramide, von, bis, max_punkte=500, basis='D'):
+    """Feinste Stufe, die im Zeitraum höchstens ``max_punkte`` Perioden hat.
+
+    Gibt None zurück, wenn schon die Rohdaten (Auflösung ``basis``) fein genug
+    sind, und die gröbste Stufe, wenn keine Stufe die Bedingung erfüllt.
+    """
+    tage = (pd.Timestamp(bis) - pd.Timestamp(von)).days + 1
+    if tage / TAGE_PRO_PERIODE[basis] <= max_punkte:
+        return None
+    stufen = sorted(pyramide, key=lambda stufe: FREQUENZEN.index(STUFEN[stufe]))
+    for stufe in stufen:
+        if tage / TAGE_PRO_PERIODE[STUFEN[stufe]] <= max_punkte:
+            return stufe
+    return stufen[-1]
+
+
+def zeitraum(agg, von, bis, datum='Datum'):
+    """Perioden einer Stufe, die im Zeitraum [von, bis] beginnen."""
+    return agg[(agg[datum] >= pd.Timestamp(von)) & (agg[datum] <= pd.Timestamp(bis))]
@@ -0,0 +1,194 @@
+"""Datenfiles von opendata.swiss aktualisieren, ohne unveränderte Files neu herunterzuladen.
+
+Die Notebooks nennen einen festen Zeitpunkt der Abfrage; die Datenfiles
+müssen von Hand heruntergeladen werden. Dieses Modul lädt alle Datensätze
+aus DATENSAETZE gleichzeitig (asyncio, jeder Download in einem Thread) und
+fragt bedingt an: mit ``If-None-Match`` (ETag) und ``If-Modified-Since``
+aus dem letzten Download antwortet der Server mit 304, wenn sich nichts
+geändert hat, und das File wird nicht übertragen. Neue Daten werden in
+Blöcken in ``<datei>.part`` geschrieben und erst am Schluss umbenannt; ein
+abgebrochener Download (auch weniger Bytes als ``Content-Length``) lässt das
+alte File stehen und löscht den angefangenen Teil.
+
+Nach einem neuen Download werden die abgeleiteten Daten des Datensatzes
+neu berechnet (z.B. Aggregationen und Spaltenspeicher, siehe ``speicher``),
+nur für die Datensätze, die sich geändert haben.
+
+Aufruf im Terminal (im obersten Ordner des Repositorys):
+
+    python -m datenvis.aktualisierung
+    python -m datenvis.aktualisierung produktion --konfiguration quellen.json
+
+Die Konfiguration ist eine JSON-Liste von {"name", "url", "datei"}; die
+URLs können auch auf einen lokalen Server zeigen (z.B. zum Testen mit
+``python -m http.server``).
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import shutil
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import namedtuple
+from pathlib import Path
+
+from . import speicher
+
+ORDNER_STROM = Path(__file__).resolve().parent.parent / '02-Zeitreihen_Beispiel_Stromproduktion'
+
+Datensatz = namedtuple('Datensatz', ['name', 'url', 'datei', 'nachbearbeiten'], defaults=((),))
+Datensatz.__doc__ = """Datensatz zum Herunterladen: Name, URL, lokales File und Funktionen
+('modul:funktion', mit dem Pfad als Argument), die nach einem neuen Download
+die abgeleiteten Daten berechnen.
+"""
+
+# Die Mietpreise und Geodaten haben keine feste URL (neue Adresse pro Ausgabe); sie
+# können über die Konfiguration ergänzt werden.
+DATENSAETZE = [
+    Datensatz('bilanz', 'https://www.uvek-gis.admin.ch/BFE/ogd/35/'
+                        'ogd35_schweizerische_elektrizitaetsbilanz_monatswerte.csv',
+              ORDNER_STROM / 'ogd35_schweizerische_elektrizitaetsbilanz_monatswerte.csv',
+              ('datenvis.aggregation:pyramide_bilanz',)),
+    Datensatz('produktion', 'https://www.uvek-gis.admin.ch/BFE/ogd/104/ogd104_stromproduktion_swissgrid.csv',
+              ORDNER_STROM / 'ogd104_stromproduktion_swissgrid.csv',
+              ('datenvis.aggregation:pyramide_produktion', 'datenvis.abfrage:spaltenspeicher_produktion')),
+]
+
+Ergebnis = namedtuple('Ergebnis', ['name', 'status', 'groesse', 'dauer', 'meldung'])
+Ergebnis.__doc__ = """Resultat eines Datensatzes: status 'neu', 'aktualisiert', 'unveraendert'
+oder 'fehler'; groesse in Bytes (übertragen), dauer in Sekunden.
+"""
+
+BLOCK = 1 << 16
+META_DATEI = 'http.json'
+
+
+def _meta_datei(datei):
+    return speicher.cache_verzeichnis(datei, 'download') / META_DATEI
+
+
+def _meta(datei):
+    """ETag und Last-Modified des letzten Downloads (leer, wenn das File fehlt oder verändert wurde)."""
+    pfad = _meta_datei(datei)
+    if not Path(datei).exists() or not pfad.exists():
+        return {}
+    with open(pfad, encoding='utf-8') as f:
+        meta = json.load(f)
+    # Von Hand ersetzte Files nicht als unverändert melden
+    return meta if meta.get('fingerabdruck') == speicher.fingerabdruck(datei) else {}
+
+
+def _herunterladen(datensatz, timeout):
+    """Läuft in einem Thread: bedingte Anfrage, Antwort blockweise in das File schreiben.
+
+    Gibt (Status, übertragene Bytes) zurück.
+    """
+    datei = Path(datensatz.datei)
+    meta = _meta(datei)
+    kopf = {'User-Agent': 'datenvis-aktualisierung'}
+    if meta.get('etag'):
+        kopf['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        kopf['If-Modified-Since'] = meta['last_modified']
+    anfrage = urllib.request.Request(datensatz.url, headers=kopf)
+    try:
+        antwort = urllib.request.urlopen(anfrage, timeout=timeout)
+    except urllib.error.HTTPError as fehler:
+        if fehler.code == 304:
+            return 'unveraendert', 0
+        raise
+    teil = datei.with_name(datei.name + '.part')
+    datei.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with antwort, open(teil, 'wb') as f:
+            shutil.copyfileobj(antwort, f, BLOCK)
+            groesse = f.tell()
+            etag, geaendert = antwort.headers.get('ETag'), antwort.headers.get('Last-Modified')
+            laenge = antwort.headers.get('Content-Length')
+        # read() in Blöcken meldet eine abgebrochene Verbindung nicht; wie urlretrieve die Länge prüfen
+        if laenge is not None and groesse < int(laenge):
+            raise urllib.error.ContentTooShortError(
+                'Nur %d von %s Bytes übertragen' % (groesse, laenge), None)
+        status = 'aktualisiert' if datei.exists() else 'neu'
+        os.replace(teil, datei)
+    except BaseException:
+        # Abgebrochener Download: das alte File bleibt, der angefangene Teil wird gelöscht
+        teil.unlink(missing_ok=True)
+        raise
+
+    verzeichnis = _meta_datei(datei).parent
+    verzeichnis.mkdir(parents=True, exist_ok=True)
+    with open(verzeichnis / META_DATEI, 'w', encoding='utf-8') as f:
+        json.dump({'url': datensatz.url, 'etag': etag, 'last_modified': geaendert,
+                   'fingerabdruck': speicher.fingerabdruck(datei)}, f)
+    return status, groesse
+
+
+def nachbearbeiten(datensatz):
+    """Abgeleitete Daten des Datensatzes neu berechnen (nach einem neuen Download)."""
+    for funktion in datensatz.nachbearbeiten:
+        modulname, _, name = funktion.partition(':')
+        getattr(importlib.import_module(modulname), name)(datensatz.datei)
+
+
+async def _aktualisieren(datensatz, sperre, timeout):
+    start = time.perf_counter()
+    async with sperre:
+        try:
+            status, groesse = await asyncio.to_thread(_herunterladen, datensatz, timeout)
+            if status != 'unveraendert':
+                await asyncio.to_thread(nachbearbeiten, datensatz)
+        except Exception as fehler:
+            return Ergebnis(datensatz.name, 'fehler', 0, time.perf_counter() - start,
+                            '%s: %s' % (type(fehler).__name__, fehler))
+    return Ergebnis(datensatz.name, status, groesse, time.perf_counter() - start, None)
+
+
+async def alle_aktualisieren(datensaetze=None, gleichzeitig=4, timeout=60):
+    """Alle Datensätze gleichzeitig aktualisieren (höchstens ``gleichzeitig`` Downloads); gibt Ergebnisse zurück."""
+    sperre = asyncio.Semaphore(gleichzeitig)
+    return await asyncio.gather(*(_aktualisieren(d, sperre, timeout)
+                                  for d in (DATENSAETZE if datensaetze is None else datensaetze)))
+
+
+def aktualisieren(datensaetze=None, gleichzeitig=4, timeout=60):
+    """Wie alle_aktualisieren(), ohne eigene Event-Loop (z.B. im Notebook: await alle_aktualisieren())."""
+    return asyncio.run(alle_aktualisieren(datensaetze, gleichzeitig, timeout))
+
+
+def konfiguration(pfad):
+    """Datensätze aus einer JSON-Liste von {"name", "url", "datei", "nachbearbeiten" (optional)}."""
+    with open(pfad, encoding='utf-8') as f:
+        eintraege = json.load(f)
+    basis = Path(pfad).resolve().parent
+    return [Datensatz(e['name'], e['url'], basis / e['datei'], tuple(e.get('nachbearbeiten', ())))
+            for e in eintraege]
+
+
+def main(argumente=None):
+    parser = argparse.ArgumentParser(description='Datenfiles von opendata.swiss aktualisieren.')
+    parser.add_argument('namen', nargs='*', metavar='NAME', help='Datensätze (ohne Angabe: alle)')
+    parser.add_argument('--konfiguration', metavar='JSON', help='Datensätze aus JSON statt der Standardliste')
+    parser.add_argument('--gleichzeitig', type=int, default=4, help='Anzahl gleichzeitiger Downloads (Standard: 4)')
+    parser.add_argument('--timeout', type=float, default=60, help='Timeout pro Verbindung in s (Standard: 60)')
+    args = parser.parse_args(argumente)
+    datensaetze = konfiguration(args.konfiguration) if args.konfiguration else DATENSAETZE
+    unbekannt = set(args.namen) - {d.name for d in datensaetze}
+    if unbekannt:
+        parser.error('Unbekannter Datensatz: ' + ', '.join(sorted(unbekannt)))
+    if args.namen:
+        datensaetze = [d for d in datensaetze if d.name in args.namen]
+
+    ergebnisse = aktualisieren(datensaetze, args.gleichzeitig, args.timeout)
+    for e in ergebnisse:
+        print('%-16s %-13s %10.1f kB %6.2f s %s' % (e.name, e.status, e.groesse / 1024, e.dauer, e.meldung or ''))
+    return 1 if any(e.status == 'fehler' for e in ergebnisse) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Erkennung von Ausfällen und Ausreissern in den laufend eintreffenden Tageswerten.
+
+Für jeden Energieträger werden Mittelwert und Standardabweichung der letzten
+``fenster`` Werte mitgeführt. Ein neuer Wert ist eine Anomalie, wenn sein
+z-Wert bezüglich dieses Fensters die Grenze überschreitet (z.B. der Einbruch
+von Kernkraft beim Ausfall eines Kraftwerks).
+
+Es gibt zwei Arten, den Detektor zu verwenden:
+
+    - laufend: ``hinzufuegen()`` pro neuem Wert; der Aufwand pro Wert ist
+      konstant (Ringpuffer mit laufender Summe und Quadratsumme), unabhängig
+      von der Länge der Zeitreihe
+    - rückwirkend: ``nachtragen()`` über die ganze Historie, vektorisiert mit
+      kumulierten Summen wie in ``datenvis.validierung``; danach enthält der
+      Detektor den Stand am Ende der Historie und kann laufend weitermachen
+
+Beide Arten liefern die gleichen Meldungen.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .validierung import gleitende_kennzahlen
+
+Meldung = namedtuple('Meldung', ['Datum', 'Energietraeger', 'Produktion_GWh', 'erwartet', 'z'])
+Meldung.__doc__ = """Eine Anomalie: Wert, Mittelwert des Fensters davor (erwartet) und z-Wert."""
+
+RICHTUNGEN = ('beide', 'unten', 'oben')
+
+
+class _Fenster:
+    """Ringpuffer der letzten Werte eines Energieträgers mit laufenden Summen.
+
+    Die Summen werden relativ zum ersten Wert (verschiebung) geführt, damit
+    die Quadratsumme bei grossen Werten genau bleibt.
+    """
+
+    def __init__(self, groesse, verschiebung):
+        self.werte = np.full(groesse, np.nan)
+        self.position = 0
+        self.verschiebung = verschiebung
+        self.anzahl = 0
+        self.summe = 0.0
+        self.quadratsumme = 0.0
+
+    def kennzahlen(self):
+        if self.anzahl == 0:
+            return 0, np.nan, np.nan
+        mittel = self.summe / self.anzahl
+        varianz = max(self.quadratsumme / self.anzahl - mittel ** 2, 0.0)
+        return self.anzahl, mittel + self.verschiebung, np.sqrt(varianz)
+
+    def schieben(self, wert):
+        alt = self.werte[self.position]
+        if not np.isnan(alt): # Ältester Wert fällt aus dem Fenster
+            x = alt - self.verschiebung
+            self.anzahl -= 1
+            self.summe -= x
+            self.quadratsumme -= x * x
+        self.werte[self.position] = wert
+        if not np.isnan(wert):
+            x = wert - self.verschiebung
+            self.anzahl += 1
+            self.summe += x
+            self.quadratsumme += x * x
+        self.position = (self.position + 1) % len(self.werte)
+
+
+class AnomalieDetektor:
+    """Gleitender z-Wert pro Energieträger, laufend oder rückwirkend berechnet.
+
+    fenster: Anzahl vorangehender Werte für Mittelwert und Standardabweichung
+    z_grenze: Anomalie, wenn |z| > z_grenze
+    min_std: untere Grenze der Standardabweichung (in GWh), damit bei sehr
+             gleichmässiger Produktion (z.B. Kernkraft) nicht jede kleine
+             Abweichung gemeldet wird und ein Einbruch trotzdem auffällt
+    richtung: 'beide', 'unten' (nur Einbrüche) oder 'oben' (nur Spitzen)
+    """
+
+    def __init__(self, fenster=30, z_grenze=4.0, min_std=0.5, richtung='beide'):
+        if richtung not in RICHTUNGEN:
+            raise ValueError('richtung muss eines von %s sein' % (RICHTUNGEN,))
+        self.fenster = fenster
+        self.z_grenze = z_grenze
+        self.min_std = min_std
+        self.richtung = richtung
+        self.min_anzahl = max(fenster // 2, 2)
+        self._fenster = {}
+        self.meldungen = []
+
+    def _z(self, wert, anzahl, mittel, std):
+        """z-Wert und Anomalie-Markierung (funktioniert für Zahlen und Arrays)."""
+        with np.errstate(invalid='ignore'):
+            z = (wert - mittel) / np.maximum(std, self.min_std)
+            z = np.where((anzahl >= self.min_anzahl) & ~np.isnan(wert), z, np.nan)
+            if self.richtung == 'unten':
+                anomalie = z < -self.z_grenze
+            elif self.richtung == 'oben':
+                anomalie = z > self.z_grenze
+            else:
+                anomalie = np.abs(z) > self.z_grenze
+        return z, anomalie
+
+    def hinzufuegen(self, traeger, datum, wert):
+        """Einen neuen Tageswert verarbeiten; gibt eine Meldung oder None zurück."""
+        wert = float(wert)
+        fenster = self._fenster.get(traeger)
+        if fenster is None:
+            fenster = self._fenster[traeger] = _Fenster(self.fenster, 0.0 if np.isnan(wert) else wert)
+        anzahl, mittel, std = fenster.kennzahlen()
+        z, anomalie = self._z(wert, anzahl, mittel, std)
+        fenster.schieben(wert)
+        if not anomalie:
+            return None
+        meldung = Meldung(pd.Timestamp(datum), traeger, wert, mittel, float(z))
+        self.meldungen.append(meldung)
+        return meldung
+
+    def aufnehmen(self, df, datum='Datum', gruppe='Energietraeger', wert='Produktion_GWh'):
+        """Neue Zeilen (nach Datum sortiert) einzeln verarbeiten; gibt die neuen Meldungen als DataFrame zurück."""
+        neu = [self.hinzufuegen(t, d, w) for d, t, w in zip(df[datum], df[gruppe], df[wert])]
+        return _tabelle(m for m in neu if m is not None)
+
+    def nachtragen(self, df, datum='Datum', gruppe='Energietraeger', wert='Produktion_GWh'):
+        """Die ganze Historie vektorisiert auswerten; gibt alle Meldungen als DataFrame zurück.
+
+        Der Detektor wird dabei zurückgesetzt und enthält danach die letzten
+        Werte jedes Energieträgers, sodass mit hinzufuegen() laufend
+        weitergemacht werden kann.
+        """
+        zeit = pd.to_datetime(df[datum]).to_numpy()
+        kategorien = df[gruppe].astype('category')
+        codes = kategorien.cat.codes.to_numpy()
+        ordnung = np.lexsort((zeit, codes)) # Nach Energieträger, innerhalb nach Datum
+        c, t = codes[ordnung], zeit[ordnung]
+        v = df[wert].to_numpy(dtype=float)[ordnung]
+
+        gleiche_gruppe = np.zeros(len(c), dtype=bool)
+        gleiche_gruppe[1:] = c[1:] == c[:-1]
+        anzahl, mittel, std = gleitende_kennzahlen(v, gleiche_gruppe, self.fenster)
+        z, anomalie = self._z(v, anzahl, mittel, std)
+
+        # Stand am Ende der Historie: die letzten fenster Werte jeder Gruppe
+        namen = np.asarray(kategorien.cat.categories)
+        start = np.flatnonzero(~gleiche_gruppe)
+        ende = np.append(start[1:], len(c))
+        self._fenster = {}
+        for a, e in zip(start, ende):
+            werte = v[a:e]
+            erster = werte[~np.isnan(werte)]
+            fenster = self._fenster[namen[c[a]]] = _Fenster(self.fenster, erster[0] if len(erster) else 0.0)
+            for x in werte[-self.fenster:]:
+                fenster.schieben(x)
+
+        i = np.flatnonzero(anomalie)
+        meldungen = pd.DataFrame({
+            'Datum': t[i], 'Energietraeger': namen[c[i]], 'Produktion_GWh': v[i],
+            'erwartet': mittel[i], 'z': z[i],
+        }).sort_values(['Datum', 'Energietraeger'], ignore_index=True)
+        self.meldungen = [Meldung(*zeile) for zeile in meldungen.itertuples(index=False)]
+        return meldungen
+
+    def tabelle(self):
+        """Alle bisherigen Meldungen als DataFrame."""
+        return _tabelle(self.meldungen)
+
+
+def _tabelle(meldungen):
+    return pd.DataFrame(list(meldungen), columns=Meldung._fields)
+
+
+def markiere_anomalien(ax, meldungen, traeger, **kwargs):
+    """Meldungen eines Energieträgers als Punkte in eine Achse mit Datum auf der x-Achse zeichnen."""
+    auswahl = meldungen[meldungen['Energietraeger'] == traeger]
+    stil = dict(color='r', marker='o', s=30, zorder=3, label='Anomalie')
+    stil.update(kwargs)
+    return ax.scatter(auswahl['Datum'], auswahl['Produktion_GWh'], **stil)
@@ -0,0 +1,107 @@
+"""Gruppierte und gestapelte Balken als eine einzige PolyCollection.
+
+Mit ``plt.bar`` wird pro Datensatz ein Aufruf gebraucht, die Positionen
+nebeneinander liegender Balken müssen von Hand berechnet werden
+(``indices - width/2``, ``indices + width/2``) und jeder Balken ist ein
+eigenes Rectangle. Bei 27 Kantonen × 6 Zimmerzahlen × 10 Jahren sind das
+tausende Objekte, und jedes Neuzeichnen wird langsam.
+
+Hier werden die Ecken aller Balken in einem Schritt als Array
+(Gruppen, Serien, 5 Ecken, x/y) berechnet und als eine PolyCollection
+gezeichnet. Die Pfade der Collection sind Sichten auf dieses Array: neue
+Höhen (z.B. ein anderes Jahr in einer Animation) werden mit
+``aktualisieren()`` direkt in das Array geschrieben, ohne neue Objekte.
+
+    ax = fig.subplots()
+    balken = Balkendiagramm(ax, hoehen, gruppen=kantone, serien=['2 Zimmer', '6+ Zimmer'])
+    balken.legende()
+    balken.aktualisieren(neue_hoehen)
+"""
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.patches import Patch
+
+
+def balken_ecken(hoehen, breite=0.8, gestapelt=False, ecken=None):
+    """Ecken aller Balken als Array (Gruppen, Serien, 5, 2).
+
+    hoehen: Array (Gruppen, Serien); Gruppe i wird bei x = i gezeichnet, NaN als Höhe 0
+    breite: Breite einer Gruppe (nebeneinander: geteilt durch die Anzahl Serien)
+    gestapelt: Serien übereinander statt nebeneinander
+    ecken: vorhandenes Array, in das geschrieben wird (nur die y-Werte)
+    """
+    hoehen = np.nan_to_num(np.asarray(hoehen, dtype=float).reshape(len(hoehen), -1))
+    if gestapelt:
+        oben = np.cumsum(hoehen, axis=1)
+        unten = oben - hoehen
+    else:
+        oben, unten = hoehen, np.zeros_like(hoehen)
+    if ecken is None:
+        gruppen, serien = hoehen.shape
+        mitte = np.arange(gruppen, dtype=float)[:, None]
+        if gestapelt:
+            links = np.broadcast_to(mitte - breite / 2, hoehen.shape)
+            rechts = links + breite
+        else:
+            links = mitte - breite / 2 + np.arange(serien) * (breite / serien)
+            rechts = links + breite / serien
+        # Ecken: unten links, unten rechts, oben rechts, oben links, zurück zum Anfang
+        ecken = np.empty(hoehen.shape + (5, 2))
+        ecken[..., 0] = np.stack([links, rechts, rechts, links, links], axis=-1)
+    ecken[..., 1] = np.stack([unten, unten, oben, oben, unten], axis=-1)
+    return ecken
+
+
+class Balkendiagramm:
+    """Balken für ein Array (Gruppen, Serien) als eine PolyCollection in ax.
+
+    gruppen: Beschriftungen der x-Achse (z.B. Kantone)
+    serien: Namen der Serien für die Legende (z.B. Zimmerzahlen)
+    farben: eine Farbe pro Serie (Standard: Farbzyklus von Matplotlib)
+    """
+
+    def __init__(self, ax, hoehen, gruppen=None, serien=None, breite=0.8, gestapelt=False, farben=None,
+                 rotation='vertical', **kwargs):
+        self.ax = ax
+        self.gestapelt = gestapelt
+        self.ecken = balken_ecken(hoehen, breite, gestapelt)
+        anzahl_gruppen, anzahl_serien = self.ecken.shape[:2]
+        self.serien = list(serien) if serien is not None else ['Serie %d' % (i + 1) for i in range(anzahl_serien)]
+        if farben is None:
+            farben = ['C%d' % (i % 10) for i in range(anzahl_serien)]
+        self.farben = list(farben)
+
+        # Ein Pfad pro Balken; die Ecken sind schon geschlossen (letzte = erste), mit closed=False
+        # kopiert Matplotlib sie nicht und jeder Pfad bleibt eine Sicht auf self.ecken
+        self.sammlung = PolyCollection(self.ecken.reshape(-1, 5, 2), closed=False,
+                                       facecolors=np.tile(self.farben, anzahl_gruppen), **kwargs)
+        ax.add_collection(self.sammlung)
+
+        ax.set_xlim(-0.5, anzahl_gruppen - 0.5)
+        if gruppen is not None:
+            ax.set_xticks(np.arange(anzahl_gruppen), list(gruppen), rotation=rotation)
+        self._skalieren()
+
+    def _skalieren(self):
+        y = self.ecken[..., 1]
+        unten, oben = min(y.min(), 0.0), max(y.max(), 0.0)
+        rand = 0.05 * (oben - unten or 1.0)
+        self.ax.set_ylim(unten - (rand if unten < 0 else 0), oben + (rand if oben > 0 else 0))
+
+    def aktualisieren(self, hoehen, skalieren=True):
+        """Neue Höhen (gleiche Form wie beim Erstellen) direkt in die Balken schreiben.
+
+        skalieren: y-Achse an die neuen Höhen anpassen (False für feste Achsen, z.B. in einer Animation)
+        Gibt die Liste der geänderten Artists zurück (für FuncAnimation mit blit=True).
+        """
+        balken_ecken(hoehen, gestapelt=self.gestapelt, ecken=self.ecken)
+        self.sammlung.stale = True
+        if skalieren:
+            self._skalieren()
+        return [self.sammlung]
+
+    def legende(self, **kwargs):
+        """Legende mit einem Eintrag pro Serie."""
+        eintraege = [Patch(facecolor=farbe, label=name) for farbe, name in zip(self.farben, self.serien)]
+        return self.ax.legend(handles=eintraege, **kwargs)
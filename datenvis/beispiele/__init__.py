@@ -0,0 +1,15 @@
+"""Die Beispiele als Pipelines (Laden → Umformen → Zeichnen) mit Kommandozeile.
+
+Jedes Modul entspricht einem Notebook (siehe ``datenvis.pipeline``):
+
+    grundlagen            01_Visualisierung_Basics/visualization_basics
+    brownsche_bewegung    01_Visualisierung_Basics/Brownian_motion_1D_2D_3D
+    elektrizitaetsbilanz  02-Zeitreihen_Beispiel_Stromproduktion/Bsp1_...
+    stromproduktion       02-Zeitreihen_Beispiel_Stromproduktion/Bsp2_...
+    korrelation           02-Zeitreihen_Beispiel_Stromproduktion/Bsp3_...
+    mietpreise            03_Diagramm_und_Karte_Beispiel_Mietpreise/mietpreis_diagramme
+    mietpreis_karte       03_Diagramm_und_Karte_Beispiel_Mietpreise/mietpreis_kartendarstellung
+"""
+
+PIPELINES = ['grundlagen', 'brownsche_bewegung', 'elektrizitaetsbilanz', 'stromproduktion', 'korrelation',
+             'mietpreise', 'mietpreis_karte']
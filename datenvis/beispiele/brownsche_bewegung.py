@@ -0,0 +1,93 @@
+"""Pipeline zum Notebook Brownian_motion_1D_2D_3D: Brownsche Bewegung in 1D, 2D und 3D.
+
+Die Trajektorien werden erzeugt, nicht gelesen; die Zufallszahlen sind mit
+SAAT festgelegt, damit jeder Lauf die gleichen Grafiken liefert.
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from ..pipeline import Abbildung, cli
+
+EINGABEN = {}
+TABELLEN = ['trajektorie_2d', 'trajektorie_3d']
+RC = {}
+
+SAAT = 0
+
+
+def brownian(rng, x0, n, dt, delta):
+    """n Schritte der Brownschen Bewegung ab x0 (Array (..., n + 1), erste Spalte x0)."""
+    x0 = np.asarray(x0, dtype=float)
+    r = rng.normal(scale=delta * np.sqrt(dt), size=x0.shape + (n,))
+    return np.concatenate([x0[..., None], x0[..., None] + np.cumsum(r, axis=-1)], axis=-1)
+
+
+def laden(delta=0.25, T=10.0):
+    """Trajektorien wie im Notebook: 10 Realisierungen in 1D, je eine in 2D und 3D."""
+    rng = np.random.default_rng(SAAT)
+    return {
+        '1d': brownian(rng, np.zeros(10), 500, T / 500, delta),
+        '2d': brownian(rng, np.zeros(2), 200, T / 200, delta),
+        '3d': brownian(rng, np.zeros(3), 100, T / 100, delta),
+        'T': T,
+    }
+
+
+def umformen(daten):
+    """Zeitachse zu den 1D-Trajektorien und die Trajektorien in 2D und 3D als Tabellen."""
+    x = daten['1d']
+    return {
+        'zeit': np.linspace(0.0, daten['T'], x.shape[1]),
+        'trajektorien_1d': x,
+        'trajektorie_2d': pd.DataFrame(daten['2d'].T, columns=['x', 'y']),
+        'trajektorie_3d': pd.DataFrame(daten['3d'].T, columns=['x', 'y', 'z']),
+    }
+
+
+def zeichne_trajektorien(fig, r):
+    ax = fig.subplots()
+    ax.plot(r['zeit'], r['trajektorien_1d'].T)
+    ax.set_xlabel('Zeit [arbitrary units]', fontsize=16)
+    ax.set_ylabel('Position x [arbitrary units]', fontsize=16)
+    ax.grid(True)
+
+
+def zeichne_2d(fig, r):
+    ax = fig.subplots()
+    x = r['trajektorie_2d']
+    ax.plot(x['x'], x['y'])
+    ax.plot(x['x'].iloc[0], x['y'].iloc[0], 'go') # Startpunkt grün
+    ax.plot(x['x'].iloc[-1], x['y'].iloc[-1], 'ro') # Endpunkt rot
+    ax.set_title('2D Brownsche Bewegung')
+    ax.set_xlabel('x', fontsize=16)
+    ax.set_ylabel('y', fontsize=16)
+    ax.axis('equal')
+    ax.grid(True)
+    ax.legend(['Trajektorie', 'Startpunkt', 'Endpunkt'], fontsize=12)
+
+
+def zeichne_3d(fig, r):
+    ax = fig.add_subplot(projection='3d')
+    x = r['trajektorie_3d']
+    ax.plot(x['x'].iloc[:1], x['y'].iloc[:1], x['z'].iloc[:1], 'go') # Startpunkt grün
+    ax.plot(x['x'].iloc[-1:], x['y'].iloc[-1:], x['z'].iloc[-1:], 'ro') # Endpunkt rot
+    ax.plot3D(x['x'], x['y'], x['z'])
+    ax.set_xlabel('x-Achse', fontsize=15)
+    ax.set_ylabel('y-Achse', fontsize=15)
+    ax.set_zlabel('z-Achse', fontsize=15, rotation=90)
+    ax.set_title('3D Brownsche Bewegung', fontsize=22)
+    ax.legend(['Startpunkt', 'Endpunkt', 'Trajektorie'], fontsize=15)
+
+
+ABBILDUNGEN = [
+    Abbildung('Brownian', 6.4, 4.8, zeichne_trajektorien),
+    Abbildung('Brownsche_Bewegung_2D', 6.4, 4.8, zeichne_2d),
+    Abbildung('Brownsche_Bewegung_3D', 14, 14, zeichne_3d, rc={'font.size': 10}),
+]
+
+
+if __name__ == '__main__':
+    sys.exit(cli(sys.modules[__name__]))
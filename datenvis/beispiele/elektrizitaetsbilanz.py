@@ -0,0 +1,119 @@
+"""Pipeline zu Bsp1_Visualisierung_Elektrizitaetsbilanz: Monats- und Jahreswerte der Elektrizitätsbilanz."""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .. import quellen
+from ..aggregation import berechne_pyramide
+from ..bilanz import MONATE, BilanzWuerfel
+from ..messung import stufe
+from ..pipeline import BASIS, Abbildung, cli
+from ..stromdaten import DATEI_BILANZ
+
+ORDNER = BASIS / '02-Zeitreihen_Beispiel_Stromproduktion'
+EINGABEN = {'bilanz': ORDNER / DATEI_BILANZ}
+TABELLEN = ['jahreswerte', 'saisonprofil', 'nettoimport']
+RC = {'font.size': 14}
+
+GROESSEN = ['Erzeugung_netto_GWh', 'Einfuhr_GWh', 'Ausfuhr_GWh', 'Endverbrauch_GWh']
+
+
+def laden(bilanz=EINGABEN['bilanz']):
+    return quellen.laden('bilanz', bilanz)
+
+
+def umformen(df):
+    """Würfel Jahr × Monat × Grösse, Summen der vollständigen Jahre, Saisonprofil und Nettoimport."""
+    with stufe('wuerfel', 'gruppieren'):
+        wuerfel = BilanzWuerfel(df, GROESSEN)
+    with stufe('jahreswerte', 'gruppieren'):
+        jahr = berechne_pyramide(df, GROESSEN, basis='M')['jahr']
+    with stufe('saisonprofil', 'berechnen'):
+        saison = pd.DataFrame({g: wuerfel.saisonprofil(g) for g in GROESSEN}, index=pd.Index(MONATE, name='Monat'))
+        netto = pd.DataFrame(wuerfel.nettoimport(), columns=MONATE, index=pd.Index(wuerfel.jahre, name='Jahr'))
+    return {
+        'monatswerte': df,
+        'wuerfel': wuerfel,
+        'jahreswerte': jahr[jahr['vollstaendig']].reset_index(drop=True),
+        'saisonprofil': saison,
+        'nettoimport': netto,
+    }
+
+
+def zeichne_endverbrauch(fig, r):
+    ax = fig.subplots()
+    ax.plot(r['monatswerte']['Endverbrauch_GWh'])
+    ax.set_xlabel('Index der Datenpunkte')
+    ax.set_ylabel('Endverbrauch [GWh]')
+    ax.set_title('Endverbrauch')
+
+
+def zeichne_einfuhr_ausfuhr(fig, r):
+    ax = fig.subplots()
+    ax.plot(r['monatswerte']['Einfuhr_GWh'])
+    ax.plot(r['monatswerte']['Ausfuhr_GWh'])
+    ax.set_xlabel('Index der Datenpunkte')
+    ax.set_ylabel('Einfuhr/Ausfuhr[GWh]')
+    ax.legend(['Einfuhr', 'Ausfuhr'])
+    ax.set_title('Stromeinfuhr und -ausfuhr')
+
+
+def zeichne_endverbrauch_jahr(fig, r):
+    ax = fig.subplots()
+    jahr = r['jahreswerte']
+    ax.plot(jahr['Datum'].dt.year, jahr['Endverbrauch_GWh_summe'])
+    ax.set_xlabel('Jahr')
+    ax.set_ylabel('Endverbrauch [GWh]')
+    ax.set_title('Endverbrauch nach Jahr')
+
+
+def zeichne_jahressummen(fig, r):
+    ax = fig.subplots()
+    jahr = r['jahreswerte']
+    for groesse in GROESSEN:
+        ax.plot(jahr['Datum'].dt.year, jahr[groesse + '_summe'])
+    ax.set_xlabel('Jahr')
+    ax.set_ylabel('Energie [GWh]')
+    ax.legend(['netto Erzeugung', 'Einfuhr', 'Ausfuhr', 'Endverbrauch'])
+    ax.set_title('Erzeugung, Einfuhr, Ausfuhr und Endverbrauch')
+
+
+def zeichne_saisonprofil(fig, r):
+    ax = fig.subplots()
+    profil = r['saisonprofil']
+    jahre = r['wuerfel'].jahre
+    ax.plot(MONATE, profil['Erzeugung_netto_GWh'])
+    ax.plot(MONATE, profil['Endverbrauch_GWh'])
+    ax.set_xlabel('Monat')
+    ax.set_ylabel('Energie [GWh]')
+    ax.legend(['netto Erzeugung', 'Endverbrauch'])
+    ax.set_title('Saisonprofil: Mittelwert pro Monat %d-%d' % (jahre[0], jahre[-1]))
+
+
+def zeichne_nettoimport(fig, r):
+    ax = fig.subplots()
+    netto = r['nettoimport'].to_numpy()
+    jahre = r['wuerfel'].jahre
+    grenze = np.nanmax(np.abs(netto)) # Symmetrische Farbskala um 0
+    bild = ax.imshow(netto.T, cmap='RdBu_r', vmin=-grenze, vmax=grenze, aspect='auto',
+                     extent=(jahre[0] - 0.5, jahre[-1] + 0.5, 12.5, 0.5))
+    fig.colorbar(bild, ax=ax, label='Nettoimport [GWh]')
+    ax.set_yticks(range(1, 13), MONATE)
+    ax.set_xlabel('Jahr')
+    ax.set_title('Nettoimport (Einfuhr - Ausfuhr)')
+
+
+ABBILDUNGEN = [
+    Abbildung('Endverbrauch', 15, 5, zeichne_endverbrauch),
+    Abbildung('Einfuhr_Ausfuhr', 15, 5, zeichne_einfuhr_ausfuhr),
+    Abbildung('Endverbrauch_Jahr', 15, 5, zeichne_endverbrauch_jahr),
+    Abbildung('Jahressummen', 15, 5, zeichne_jahressummen),
+    Abbildung('Saisonprofil', 15, 5, zeichne_saisonprofil),
+    Abbildung('Nettoimport', 15, 8, zeichne_nettoimport),
+]
+
+
+if __name__ == '__main__':
+    sys.exit(cli(sys.modules[__name__]))
@@ -0,0 +1,73 @@
+"""Pipeline zum Notebook visualization_basics: Funktionen und Brownsche Bewegung in 1D.
+
+Die Daten werden erzeugt, nicht gelesen; die Zufallszahlen sind mit SAAT
+festgelegt, damit jeder Lauf die gleichen Grafiken liefert.
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from ..pipeline import Abbildung, cli
+
+EINGABEN = {}
+TABELLEN = ['funktionen', 'trajektorie']
+RC = {}
+
+SAAT = 0
+
+
+def laden(start=0.0, ende=10.0, abstand=0.2):
+    """Datenpunkte auf der x-Achse."""
+    return np.arange(start, ende, abstand)
+
+
+def umformen(x, delta=0.25, dt=0.1, n=60):
+    """Funktionswerte und eine Brownsche Bewegung mit n Schritten im Zeitabstand dt."""
+    rng = np.random.default_rng(SAAT)
+    schritte = rng.normal(scale=delta ** 2 * dt, size=n) # Standardabweichung wie im Notebook
+    return {
+        'funktionen': pd.DataFrame({'x': x, 'sin': np.sin(x), 'cos': np.cos(x), 'sin_03': np.sin(x) * 0.3}),
+        'trajektorie': pd.DataFrame({'Zeit': np.arange(n) * dt, 'Position': np.cumsum(schritte)}),
+    }
+
+
+def zeichne_funktion(fig, r):
+    ax = fig.subplots()
+    f = r['funktionen']
+    ax.plot(f['x'], f['sin'])
+    ax.set_title('Einfache Visualisierung einer Funktion')
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+
+
+def zeichne_funktionen(fig, r):
+    ax = fig.subplots()
+    f = r['funktionen']
+    ax.plot(f['x'], f['sin'])
+    ax.plot(f['x'], f['cos'])
+    ax.plot(f['x'], f['sin_03'])
+    ax.set_title('Einfache Visualisierung mehrerer Funktion')
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+    ax.legend(['sin(x)', 'cos(x)', 'sin(x)*0.3'])
+
+
+def zeichne_brownsche_bewegung(fig, r):
+    ax = fig.subplots()
+    ax.plot(r['trajektorie']['Position'].to_numpy(), 'o:b')
+    ax.set_title('Brownsche Bewegung in 1D')
+    ax.set_xlabel('Zeit [arbitrary units]')
+    ax.set_ylabel('Position [arbitrary units]')
+
+
+ABBILDUNGEN = [
+    Abbildung('Funktion', 6.4, 4.8, zeichne_funktion),
+    Abbildung('Funktionen', 6.4, 4.8, zeichne_funktionen),
+    Abbildung('Brownsche_Bewegung_1D', 6.4, 4.8, zeichne_brownsche_bewegung),
+]
+
+
+if __name__ == '__main__':
+    sys.exit(cli(sys.modules[__name__]))
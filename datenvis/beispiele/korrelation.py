@@ -0,0 +1,115 @@
+"""Pipeline zu Bsp3_Scatterplot_Regression_Korrelation: Prüfung, Regression und Korrelation der Energieträger."""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .. import quellen
+from ..blockweise import auswerten
+from ..messung import stufe
+from ..pipeline import BASIS, Abbildung, cli
+from ..stromdaten import DATEI_PRODUKTION, ENERGIETRAEGER
+from ..validierung import pruefe_produktion
+
+ORDNER = BASIS / '02-Zeitreihen_Beispiel_Stromproduktion'
+EINGABEN = {'produktion': ORDNER / DATEI_PRODUKTION}
+TABELLEN = ['bericht', 'luecken', 'regression', 'kennzahlen', 'korrelation']
+RC = {'font.size': 14}
+
+PAAR = ('Flusskraft', 'Photovoltaik')
+
+
+def laden(produktion=EINGABEN['produktion']):
+    return quellen.laden('produktion', produktion)
+
+
+def umformen(df, paar=PAAR):
+    """Prüfung, Paar von Zeitreihen nach Datum zugeordnet, Regression und Kennzahlen aller Energieträger."""
+    with stufe('pruefung', 'bereinigen'):
+        pruefung = pruefe_produktion(df)
+    with stufe('paar', 'gruppieren'):
+        tag = df[~pruefung.maske['duplikat']].pivot(index='Datum', columns='Energietraeger', values='Produktion_GWh')
+        werte = tag[list(paar)].dropna()
+    with stufe('regression', 'berechnen'):
+        x, y = werte[paar[0]].to_numpy(), werte[paar[1]].to_numpy()
+        b, a = np.polyfit(x, y, deg=1)
+    with stufe('kennzahlen', 'gruppieren'):
+        auswertung = auswerten(df)
+    return {
+        'produktion': df,
+        'bericht': pruefung.bericht,
+        'luecken': pruefung.luecken,
+        'paar': werte,
+        'regression': pd.DataFrame({'x': [paar[0]], 'y': [paar[1]], 'b': [b], 'a': [a],
+                                    'r': [np.corrcoef(x, y)[0, 1]], 'anzahl': [len(werte)]}),
+        'kennzahlen': auswertung.kennzahlen,
+        'korrelation': auswertung.korrelation,
+    }
+
+
+def _beschriften(ax, r):
+    x, y = r['regression'].loc[0, ['x', 'y']]
+    ax.set_xlabel('%s Stromproduktion [GWh]' % x)
+    ax.set_ylabel('%s Stromproduktion [GWh]' % y)
+
+
+def zeichne_uebersicht(fig, r):
+    from ..small_multiples import SmallMultiples, serien_nach_gruppe
+
+    panel = SmallMultiples(ENERGIETRAEGER, ylabel='Stromproduktion [GWh]', fig=fig)
+    panel.aktualisieren(serien_nach_gruppe(r['produktion']))
+
+
+def zeichne_zeitreihen(fig, r):
+    ax = fig.subplots()
+    paar = r['paar']
+    for name in paar.columns:
+        ax.plot(paar.index, paar[name])
+    ax.set_xlim(pd.Timestamp('2015-01-01'), pd.Timestamp('2025-06-01'))
+    ax.set_ylim(-2.0, 110.0)
+    ax.legend(list(paar.columns))
+    ax.set_ylabel('Stromproduktion [GWh]')
+    ax.set_xlabel('Datum')
+
+
+def zeichne_scatterplot(fig, r):
+    ax = fig.subplots()
+    paar = r['paar']
+    ax.scatter(paar.iloc[:, 0], paar.iloc[:, 1], s=10, alpha=0.6, edgecolors='k')
+    _beschriften(ax, r)
+
+
+def zeichne_regression(fig, r):
+    ax = fig.subplots()
+    paar = r['paar']
+    b, a = r['regression'].loc[0, ['b', 'a']]
+    ax.scatter(paar.iloc[:, 0], paar.iloc[:, 1], s=10, alpha=0.6, edgecolors='k')
+    xseq = np.linspace(paar.iloc[:, 0].min(), paar.iloc[:, 0].max(), num=100)
+    ax.plot(xseq, a + b * xseq, color='r', lw=2.0)
+    _beschriften(ax, r)
+    ax.legend(['Datenpunkte', 'Lineare Regression'])
+
+
+def zeichne_dichte(fig, r):
+    from ..dichte import streudiagramm
+
+    paar = r['paar']
+    for ax, modus in zip(fig.subplots(1, 2), ['auto', 'dichte']):
+        gewaehlt, _, _ = streudiagramm(ax, paar.iloc[:, 0], paar.iloc[:, 1], modus=modus, bins=60)
+        _beschriften(ax, r)
+        ax.set_title('Darstellung: ' + gewaehlt)
+        ax.legend()
+
+
+ABBILDUNGEN = [
+    Abbildung('Uebersicht', 15, 20, zeichne_uebersicht),
+    Abbildung('Zeitreihen', 12, 8, zeichne_zeitreihen),
+    Abbildung('Scatterplot', 10, 5, zeichne_scatterplot),
+    Abbildung('Regression', 10, 5, zeichne_regression),
+    Abbildung('Dichte', 20, 6, zeichne_dichte),
+]
+
+
+if __name__ == '__main__':
+    sys.exit(cli(sys.modules[__name__]))
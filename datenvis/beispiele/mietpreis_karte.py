@@ -0,0 +1,67 @@
+"""Pipeline zu mietpreis_kartendarstellung: Mietpreise 2023 pro Kanton auf der Karte der Schweiz."""
+
+import sys
+
+from .. import quellen
+from ..geodaten import DATEI_GEODATEN, NUMMER, karte
+from ..kantone import kantonsnummer, verbinden
+from ..messung import stufe
+from ..pipeline import Abbildung, cli
+from . import mietpreise as diagramme
+
+EINGABEN = {'mietpreise': diagramme.EINGABEN['mietpreise'],
+            'geodaten': diagramme.ORDNER / DATEI_GEODATEN}
+TABELLEN = ['zuordnung']
+RC = {'font.size': 15}
+
+
+def laden(mietpreise=EINGABEN['mietpreise'], geodaten=EINGABEN['geodaten']):
+    """Mietpreise und die aufbereitete Kantonsebene (eine Zeile pro Kanton, siehe geodaten.lade_kantone)."""
+    daten = quellen.alle_laden({'mietpreise': mietpreise, 'geodaten': geodaten})
+    return daten['mietpreise'], daten['geodaten']
+
+
+def umformen(daten):
+    """Mietpreis zu jedem Kanton der Geodaten (Zuordnung der Kantone über die BFS-Kantonsnummer)."""
+    df, geo = daten
+    tabelle = diagramme.umformen(df)['mietpreise'][1:] # Ohne Durchschnitt der Schweiz
+    with stufe('zuordnung', 'bereinigen'):
+        geo = verbinden(geo, tabelle, links='NAME', rechts='Kanton', spalten=['Total']).rename(columns={'Total': 'Miete'})
+        if geo['Miete'].isna().any():
+            raise ValueError('Kein Mietpreis für %s' % ', '.join(geo.loc[geo['Miete'].isna(), 'NAME'].unique()))
+        zuordnung = tabelle[['Kanton', 'Total']].assign(Nummer=kantonsnummer(tabelle['Kanton']))
+        namen = geo[[NUMMER, 'NAME']].rename(columns={NUMMER: 'Nummer'})
+        zuordnung = zuordnung.merge(namen, on='Nummer').sort_values('Nummer', ignore_index=True)
+    return {'geodaten': geo, 'zuordnung': zuordnung[['Nummer', 'NAME', 'Kanton', 'Total']]}
+
+
+def zeichne_grundlagen(fig, r):
+    ax = fig.subplots()
+    karte(r['geodaten'], ax, column='ERSTELL_J', cmap='OrRd', edgecolor='black')
+    ax.set_title('Kartendarstellung: Grundlagen')
+
+
+def zeichne_einwohner(fig, r):
+    ax = fig.subplots()
+    karte(r['geodaten'], ax, column='EINWOHNERZ', cmap='OrRd', edgecolor='black', legend=True,
+          legend_kwds={'label': 'Einwohnerzahl'})
+    ax.set_title('Einwohnerzahl nach Kanton')
+
+
+def zeichne_karte(fig, r):
+    ax = fig.subplots()
+    ax.set_title('Visualisierung der Mietpreise nach Kantonen: Kartendarstellung', bbox={'facecolor': '0.8', 'pad': 3},
+                 fontsize=20)
+    karte(r['geodaten'], ax, column='Miete', cmap='OrRd', edgecolor='black', legend=True,
+          legend_kwds={'label': 'Mietpreise [CHF]'})
+
+
+ABBILDUNGEN = [
+    Abbildung('Karte_Grundlagen', 20, 20, zeichne_grundlagen),
+    Abbildung('Karte_Einwohner', 20, 10, zeichne_einwohner),
+    Abbildung('Mietpreis_Karte', 20, 10, zeichne_karte),
+]
+
+
+if __name__ == '__main__':
+    sys.exit(cli(sys.modules[__name__]))
@@ -0,0 +1,86 @@
+"""Pipeline zu mietpreis_diagramme: Mietpreise 2023 nach Kanton und Zimmerzahl als Histogramme und Tortendiagramm."""
+
+import sys
+
+import pandas as pd
+
+from .. import quellen
+from ..messung import stufe
+from ..mietpreise import DATEI_MIETPREISE, MIETPREIS, ZIMMER
+from ..pipeline import BASIS, Abbildung, cli
+
+ORDNER = BASIS / '03_Diagramm_und_Karte_Beispiel_Mietpreise'
+EINGABEN = {'mietpreise': ORDNER / DATEI_MIETPREISE}
+TABELLEN = ['mietpreise']
+RC = {'font.size': 11}
+
+
+def laden(mietpreise=EINGABEN['mietpreise']):
+    return quellen.laden('mietpreise', mietpreise)
+
+
+def umformen(df):
+    """Tabelle Kanton × Zimmerzahl; die erste Zeile ist der Durchschnitt der Schweiz."""
+    with stufe('mietpreise', 'bereinigen'):
+        spalten = [MIETPREIS + ('.%d' % i if i else '') for i in range(len(ZIMMER))]
+        tabelle = df[spalten].apply(pd.to_numeric, errors='coerce')
+        tabelle.columns = ZIMMER
+        tabelle.insert(0, 'Kanton', df['Unnamed: 0'].str.strip())
+    return {'mietpreise': tabelle}
+
+
+def zeichne_mietpreis(fig, r):
+    ax = fig.subplots()
+    m = r['mietpreise']
+    ax.bar(m['Kanton'], m['Total'])
+    ax.set_xlabel('Kanton')
+    ax.set_ylabel('Durchschnittlicher Mietpreis [CHF]')
+    ax.legend(['Mietpreis 2023'])
+    ax.tick_params(axis='x', labelrotation=90)
+    ax.set_title('Visualisierung 1: Durschnittlicher Mietpreis')
+
+
+def zeichne_uebereinander(fig, r):
+    from ..balken import Balkendiagramm
+
+    ax = fig.subplots()
+    m = r['mietpreise']
+    balken = Balkendiagramm(ax, m[['2 Zimmer', '6+ Zimmer']].to_numpy(), gruppen=m['Kanton'],
+                            serien=['2-Zimmer', '6-Zimmer'], gestapelt=True)
+    ax.set_xlabel('Kanton')
+    ax.set_ylabel('Durchschnittlicher Mietpreis [CHF]')
+    balken.legende()
+    ax.set_title('Visualisierung 2: Vergleich Mietpreise nach Wohnungsgrösse und Kanton')
+
+
+def zeichne_nebeneinander(fig, r):
+    from ..balken import Balkendiagramm
+
+    ax = fig.subplots()
+    m = r['mietpreise']
+    balken = Balkendiagramm(ax, m[['2 Zimmer', '6+ Zimmer']].to_numpy(), gruppen=m['Kanton'],
+                            serien=['2-Zimmer', '6-Zimmer'], breite=2 / 3., farben=['b', 'r'])
+    ax.set_xlabel('Kanton')
+    ax.set_ylabel('Durchschnittlicher Mietpreis [CHF]')
+    balken.legende()
+    ax.set_title('Visualisierung 3: Mietpreise nach Wohnungsgrösse und Kanton; Darstellung nebeneinander')
+
+
+def zeichne_torte(fig, r):
+    ax = fig.add_axes((0, 0, .5, 1))
+    m = r['mietpreise'][1:] # Ohne Durchschnitt der Schweiz
+    ax.set_title('Visualisierung 4: Mietpreise anteilig nach Kantonen', bbox={'facecolor': '0.8', 'pad': 3},
+                 fontsize=20)
+    ax.pie(m['Total'], labels=m['Kanton'], autopct='%1.1f%%')
+
+
+ABBILDUNGEN = [
+    Abbildung('Mietpreis', 15, 5, zeichne_mietpreis),
+    Abbildung('Histogram_2a', 15, 5, zeichne_uebereinander),
+    Abbildung('Histogram_2b', 15, 5, zeichne_nebeneinander),
+    Abbildung('Torte', 22, 22, zeichne_torte),
+]
+
+
+if __name__ == '__main__':
+    sys.exit(cli(sys.modules[__name__]))
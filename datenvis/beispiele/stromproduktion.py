@@ -0,0 +1,132 @@
+"""Pipeline zu Bsp2_Visualisierung_Stromproduktion: Zeitreihen, Zyklen und Anomalien pro Energieträger."""
+
+import sys
+
+import pandas as pd
+
+from .. import quellen
+from ..aggregation import berechne_pyramide, waehle_stufe
+from ..anomalien import AnomalieDetektor, markiere_anomalien
+from ..messung import stufe
+from ..pipeline import BASIS, Abbildung, cli
+from ..spektrum import (dominante_perioden, periodogramm, tagesmatrix, zeichne_periodogramme, zeichne_zerlegung,
+                        zerlegen)
+from ..stromdaten import DATEI_PRODUKTION, ENERGIETRAEGER
+
+ORDNER = BASIS / '02-Zeitreihen_Beispiel_Stromproduktion'
+EINGABEN = {'produktion': ORDNER / DATEI_PRODUKTION}
+TABELLEN = ['aggregiert', 'perioden', 'anomalien']
+RC = {'font.size': 14}
+
+
+def laden(produktion=EINGABEN['produktion']):
+    return quellen.laden('produktion', produktion)
+
+
+def umformen(df, max_punkte=800):
+    """Aggregation passend zum ganzen Zeitraum, Periodogramme, Zerlegung und Anomalien."""
+    with stufe('aggregation', 'gruppieren'):
+        pyramide = berechne_pyramide(df, ['Produktion_GWh'], gruppe='Energietraeger', basis='D')
+        aufloesung = waehle_stufe(pyramide, df['Datum'].min(), df['Datum'].max(), max_punkte=max_punkte)
+    with stufe('tagesmatrix', 'gruppieren'):
+        tage, matrix, namen = tagesmatrix(df)
+    with stufe('periodogramm', 'berechnen'):
+        frequenzen, leistung = periodogramm(matrix)
+        perioden = dominante_perioden(frequenzen, leistung, namen, anzahl=3)
+    with stufe('zerlegung', 'berechnen'):
+        zerlegung = zerlegen(matrix, perioden=(7, 365))
+    with stufe('anomalien', 'berechnen'):
+        anomalien = AnomalieDetektor(fenster=30, z_grenze=4.0).nachtragen(df)
+    return {
+        'produktion': df,
+        'aggregiert': pyramide[aufloesung or 'woche'],
+        'tage': tage,
+        'matrix': matrix,
+        'namen': namen,
+        'frequenzen': frequenzen,
+        'leistung': leistung,
+        'perioden': perioden,
+        'zerlegung': zerlegung,
+        'anomalien': anomalien,
+    }
+
+
+def zeichne_flusskraft(fig, r):
+    ax = fig.subplots()
+    df = r['produktion']
+    fluss = df[df['Energietraeger'] == 'Flusskraft']
+    ax.plot(fluss['Datum'], fluss['Produktion_GWh'])
+    ax.set_xlabel('Datum')
+    ax.set_ylabel('Stromproduktion [GWh]')
+    ax.set_title('Stromproduktion Flusskraftwerke Schweiz')
+
+
+def zeichne_mittelwerte(fig, r):
+    ax = fig.subplots()
+    agg = r['aggregiert']
+    traeger = ['Flusskraft', 'Kernkraft', 'Speicherkraft', 'Thermische']
+    for name in traeger:
+        auswahl = agg[agg['Energietraeger'] == name]
+        ax.plot(auswahl['Datum'], auswahl['Produktion_GWh_mittel'])
+    ax.set_xlabel('Datum')
+    ax.set_ylabel('Stromproduktion [GWh]')
+    ax.legend(traeger)
+
+
+def zeichne_uebersicht(fig, r):
+    from ..small_multiples import SmallMultiples, serien_nach_gruppe
+
+    panel = SmallMultiples(ENERGIETRAEGER, ylabel='Stromproduktion [GWh]', fig=fig)
+    panel.aktualisieren(serien_nach_gruppe(r['produktion']))
+
+
+def zeichne_zoom(fig, r):
+    import matplotlib.dates as mdates
+
+    from ..zoom import ZoomAnsicht, ZoomPyramide
+
+    df = r['produktion'].sort_values(['Energietraeger', 'Datum'])
+    gruppen = dict(tuple(df.groupby('Energietraeger', observed=True)))
+    axs = fig.subplots(len(ENERGIETRAEGER), 1, sharex=True)
+    ansichten = [] # Ansichten bis zum Setzen der x-Achse behalten (Callbacks sind schwach referenziert)
+    for ax, name in zip(axs, ENERGIETRAEGER):
+        gruppe = gruppen[name]
+        pyramide = ZoomPyramide(mdates.date2num(gruppe['Datum']), gruppe['Produktion_GWh'])
+        ansichten.append(ZoomAnsicht(ax, pyramide, label=name))
+        ax.set_ylim(-10.0, 160.0)
+        ax.legend()
+    axs[3].set_ylabel('Stromproduktion [GWh]')
+    axs[-1].set_xlabel('Datum')
+    axs[0].set_xlim(pd.Timestamp('2016-01-01'), pd.Timestamp('2025-06-01'))
+
+
+def zeichne_spektren(fig, r):
+    zeichne_periodogramme(r['frequenzen'], r['leistung'], r['namen'], r['perioden'], fig=fig)
+
+
+def zeichne_komponenten(fig, r):
+    zeichne_zerlegung(r['tage'], r['matrix'], r['zerlegung'], r['namen'], fig=fig)
+
+
+def zeichne_anomalien(fig, r):
+    from ..small_multiples import SmallMultiples, serien_nach_gruppe
+
+    panel = SmallMultiples(ENERGIETRAEGER, ylabel='Stromproduktion [GWh]', fig=fig)
+    panel.aktualisieren(serien_nach_gruppe(r['produktion']))
+    for ax, name in zip(panel.axs, panel.namen):
+        markiere_anomalien(ax, r['anomalien'], name)
+
+
+ABBILDUNGEN = [
+    Abbildung('Stromproduktion_Flusskraft', 15, 5, zeichne_flusskraft),
+    Abbildung('Mittelwerte', 15, 7, zeichne_mittelwerte),
+    Abbildung('Uebersicht', 15, 20, zeichne_uebersicht),
+    Abbildung('Zoom', 15, 20, zeichne_zoom),
+    Abbildung('Periodogramme', 15, 20, zeichne_spektren),
+    Abbildung('Zerlegung', 18, 20, zeichne_komponenten),
+    Abbildung('Anomalien', 15, 20, zeichne_anomalien),
+]
+
+
+if __name__ == '__main__':
+    sys.exit(cli(sys.modules[__name__]))
@@ -0,0 +1,97 @@
+"""Elektrizitätsbilanz als dichter Würfel Jahr × Monat × Grösse.
+
+Die Monatswerte werden einmal in ein NumPy-Array der Form
+(Anzahl Jahre, 12, Anzahl Grössen) umgeordnet. Fehlende Monate (z.B. im
+laufenden Jahr) sind NaN und in der Maske ``gueltig`` als False markiert.
+Jahr und Monat sind direkt Indizes ins Array; Auswahlen wie "alle Januarwerte",
+Saisonprofile oder Differenzen zum Vorjahr sind damit Slices über das Array,
+ohne Filtern nach Bedingungen und ohne Abzählen von Zeilen.
+
+Jeder Monat darf nur einmal vorkommen: mehrere Zeilen für denselben Monat
+(z.B. provisorische und definitive Werte) ergeben einen ValueError, statt
+dass die letzte Zeile die anderen stillschweigend überschreibt.
+"""
+
+import numpy as np
+
+from .stromdaten import DATEI_BILANZ, bilanz_groessen, lade_bilanz
+
+MONATE = ['Jan', 'Feb', 'Mär', 'Apr', 'Mai', 'Jun', 'Jul', 'Aug', 'Sep', 'Okt', 'Nov', 'Dez']
+
+
+class BilanzWuerfel:
+    """Monatswerte der Elektrizitätsbilanz als Array (Jahr, Monat, Grösse).
+
+    werte: Array (Jahre, 12, Grössen), NaN für fehlende Monate
+    gueltig: Maske (Jahre, 12), True wo ein Monatswert vorhanden ist
+    jahre: Jahreszahlen zur ersten Achse (lückenlos aufsteigend)
+    groessen: Spaltennamen zur dritten Achse
+
+    Ein Monat, der mehrmals vorkommt, oder eine Monatszahl ausserhalb 1-12 ergibt einen ValueError.
+    """
+
+    def __init__(self, df, groessen=None):
+        groessen = list(groessen or bilanz_groessen(df))
+        jahr = df['Jahr'].to_numpy()
+        monat = df['Monat'].to_numpy()
+
+        ungueltig = (monat < 1) | (monat > 12)
+        if ungueltig.any():
+            raise ValueError('Monat ausserhalb 1-12: %s' % ', '.join(map(str, np.unique(monat[ungueltig]))))
+        self.jahr0 = int(jahr.min())
+        self.jahre = np.arange(self.jahr0, int(jahr.max()) + 1)
+        self.groessen = groessen
+        self._index = {name: i for i, name in enumerate(groessen)}
+
+        # Jeder Monat eine Zelle; mehrere Zeilen in derselben Zelle würden sich überschreiben
+        zelle = (jahr - self.jahr0) * 12 + monat - 1
+        mehrfach = np.flatnonzero(np.bincount(zelle, minlength=len(self.jahre) * 12) > 1)
+        if len(mehrfach):
+            raise ValueError('Mehrere Zeilen für %d Monate: %s' % (
+                len(mehrfach), ', '.join('%d-%02d' % (self.jahr0 + z // 12, z % 12 + 1) for z in mehrfach[:5])))
+
+        self.werte = np.full((len(self.jahre), 12, len(groessen)), np.nan)
+        self.gueltig = np.zeros((len(self.jahre), 12), dtype=bool)
+        self.werte[jahr - self.jahr0, monat - 1] = df[groessen].to_numpy(dtype=float)
+        self.gueltig[jahr - self.jahr0, monat - 1] = True
+
+    def groesse(self, name):
+        """Array (Jahre, 12) einer Grösse."""
+        return self.werte[:, :, self._index[name]]
+
+    def monat(self, monat, name):
+        """Werte eines Monats (1-12) über alle Jahre."""
+        return self.werte[:, monat - 1, self._index[name]]
+
+    def jahr(self, jahr, name=None):
+        """Alle Monatswerte eines Jahres, als Array (12, Grössen) oder für eine Grösse."""
+        zeile = self.werte[jahr - self.jahr0]
+        return zeile if name is None else zeile[:, self._index[name]]
+
+    def vollstaendige_jahre(self):
+        """Maske der Jahre mit allen zwölf Monatswerten."""
+        return self.gueltig.all(axis=1)
+
+    def jahressumme(self, name):
+        """Jahressummen; NaN für unvollständige Jahre."""
+        return np.where(self.vollstaendige_jahre(), self.groesse(name).sum(axis=1), np.nan)
+
+    def saisonprofil(self, name):
+        """Mittelwert jedes Monats über alle Jahre mit einem Wert (Array mit 12 Werten)."""
+        anzahl = self.gueltig.sum(axis=0)
+        summe = np.nansum(self.groesse(name), axis=0)
+        return np.where(anzahl > 0, summe / np.maximum(anzahl, 1), np.nan)
+
+    def vorjahresdifferenz(self, name):
+        """Differenz zum gleichen Monat des Vorjahres, Array (Jahre - 1, 12)."""
+        werte = self.groesse(name)
+        return werte[1:] - werte[:-1]
+
+    def nettoimport(self):
+        """Einfuhr minus Ausfuhr pro Jahr und Monat (positiv: Importüberschuss)."""
+        return self.groesse('Einfuhr_GWh') - self.groesse('Ausfuhr_GWh')
+
+
+def bilanz_wuerfel(pfad=DATEI_BILANZ, groessen=None):
+    """Elektrizitätsbilanz lesen und als BilanzWuerfel zurückgeben."""
+    return BilanzWuerfel(lade_bilanz(pfad), groessen)
@@ -0,0 +1,173 @@
+"""Zwischenspeicher für gerenderte Grafiken.
+
+Beim erneuten Ausführen eines Notebooks wird jede Grafik neu gezeichnet und
+gespeichert, auch wenn sich weder Daten noch Plot-Code geändert haben. Der
+BildCache berechnet aus allem, was das Bild bestimmt, einen Schlüssel:
+
+    - die Daten, die in die Grafik eingehen (Arrays, DataFrames, Listen, Zahlen)
+    - die Parameter des Plots (Dictionary)
+    - den Code der Zeichenfunktion (Bytecode und Konstanten wie Titel)
+    - die relevanten rcParams (Schriftgrösse, Figurengrösse, dpi, ...) und
+      die Matplotlib-Version
+
+Ist ein Bild mit diesem Schlüssel gespeichert, wird es ohne Zeichnen
+zurückgegeben. Sonst wird die Zeichenfunktion aufgerufen und das Resultat
+gespeichert. Übersteigt der Speicher das Budget, werden die am längsten
+nicht mehr verwendeten Bilder gelöscht.
+"""
+
+import hashlib
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from .figuren import VERWALTUNG
+
+VERZEICHNIS = 'abbildungen.cache'
+
+# rcParams, die das Aussehen der Grafiken in den Beispielen bestimmen
+RC_SCHLUESSEL = (
+    'figure.figsize', 'figure.dpi', 'figure.facecolor', 'savefig.dpi', 'savefig.bbox',
+    'font.size', 'font.family', 'font.sans-serif', 'axes.prop_cycle', 'axes.grid',
+    'lines.linewidth', 'lines.markersize', 'image.cmap', 'legend.fontsize',
+)
+
+
+def _code(h, code):
+    """Bytecode, Namen und Konstanten einer Funktion (rekursiv für innere Funktionen)."""
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for konstante in code.co_consts:
+        if hasattr(konstante, 'co_code'):
+            _code(h, konstante)
+        else:
+            h.update(repr(konstante).encode())
+
+
+def _daten(h, objekt):
+    """Inhalt eines Objekts in den Hash aufnehmen."""
+    if isinstance(objekt, np.ndarray):
+        h.update(str((objekt.dtype, objekt.shape)).encode())
+        if objekt.dtype.hasobject:
+            h.update(pickle.dumps(objekt.tolist()))
+        else:
+            h.update(np.ascontiguousarray(objekt).data)
+    elif isinstance(objekt, (pd.DataFrame, pd.Series, pd.Index)):
+        h.update(repr(getattr(objekt, 'columns', getattr(objekt, 'name', None))).encode())
+        try:
+            _daten(h, pd.util.hash_pandas_object(objekt, index=True).to_numpy())
+        except TypeError: # z.B. Geometrien in einem GeoDataFrame
+            h.update(pickle.dumps(objekt))
+    elif isinstance(objekt, dict):
+        for schluessel in sorted(objekt, key=repr):
+            h.update(repr(schluessel).encode())
+            _daten(h, objekt[schluessel])
+    elif isinstance(objekt, (list, tuple)):
+        h.update(b'(')
+        for element in objekt:
+            _daten(h, element)
+        h.update(b')')
+    else:
+        h.update(repr(objekt).encode())
+
+
+class BildCache:
+    """Gerenderte Grafiken im Verzeichnis ``verzeichnis``, höchstens ``budget_mb`` MB.
+
+    verzeichnis: ohne Angabe VERZEICHNIS (beim Erstellen gelesen)
+
+    verwaltung: FigurenVerwaltung, welche die gezeichneten Figures schliesst
+    treffer, verfehlt: Anzahl Bilder aus dem Speicher bzw. neu gezeichnet
+    """
+
+    def __init__(self, verzeichnis=None, budget_mb=200, verwaltung=VERWALTUNG):
+        self.verzeichnis = Path(verzeichnis or VERZEICHNIS)
+        self.verwaltung = verwaltung
+        self.budget = int(budget_mb * 1024 * 1024)
+        self.treffer = 0
+        self.verfehlt = 0
+
+    def schluessel(self, zeichnen=None, daten=(), parameter=None, rc=RC_SCHLUESSEL):
+        """Schlüssel (Hex-String) aus Zeichenfunktion, Daten, Parametern und rcParams."""
+        h = hashlib.blake2b(digest_size=20)
+        h.update(matplotlib.__version__.encode())
+        if zeichnen is not None:
+            _code(h, zeichnen.__code__)
+        _daten(h, daten)
+        _daten(h, parameter)
+        _daten(h, {name: matplotlib.rcParams[name] for name in rc})
+        return h.hexdigest()
+
+    def abbildung(self, datei, zeichnen, daten=(), parameter=None, **savefig_kwargs):
+        """Grafik aus dem Speicher holen oder mit ``zeichnen()`` neu erstellen; gibt den Pfad zurück.
+
+        datei: Zielfile (z.B. 'Stromproduktion_Flusskraft.png'); das Format folgt aus der Endung
+        zeichnen: Funktion ohne Argumente, welche die Grafik zeichnet und die
+                  Figure zurückgibt (ohne Rückgabe wird plt.gcf() verwendet)
+        daten: alle Daten, die in die Grafik eingehen
+        parameter: Dictionary mit weiteren Parametern, von denen die Grafik abhängt
+        savefig_kwargs: werden an savefig() weitergegeben (z.B. bbox_inches='tight')
+        """
+        datei = Path(datei)
+        schluessel = self.schluessel(zeichnen, daten, (parameter, savefig_kwargs))
+        gespeichert = self.verzeichnis / (schluessel + datei.suffix)
+
+        if gespeichert.exists():
+            self.treffer += 1
+            os.utime(gespeichert) # Zuletzt verwendet: wird beim Aufräumen zuletzt gelöscht
+            shutil.copyfile(gespeichert, datei)
+            return datei
+
+        self.verfehlt += 1
+        fig = zeichnen()
+        if fig is None:
+            fig = plt.gcf()
+        self.verzeichnis.mkdir(parents=True, exist_ok=True)
+        temp = gespeichert.with_name(gespeichert.stem + '.tmp' + datei.suffix)
+        self.verwaltung.speichern(temp, fig, **savefig_kwargs)
+        os.replace(temp, gespeichert)
+        shutil.copyfile(gespeichert, datei)
+        self.aufraeumen(behalten=gespeichert)
+        return datei
+
+    def groesse(self):
+        """Belegter Speicher in Bytes."""
+        return sum(p.stat().st_size for p in self.verzeichnis.glob('*') if p.is_file())
+
+    def aufraeumen(self, behalten=None):
+        """Am längsten nicht verwendete Bilder löschen, bis der Speicher im Budget ist.
+
+        behalten: dieses Bild wird nicht gelöscht (das zuletzt gezeichnete)
+        """
+        bilder = [(p.stat(), p) for p in self.verzeichnis.glob('*') if p.is_file()]
+        total = sum(st.st_size for st, _ in bilder)
+        for st, pfad in sorted(bilder, key=lambda b: b[0].st_mtime_ns):
+            if total <= self.budget:
+                break
+            if pfad == behalten:
+                continue
+            pfad.unlink(missing_ok=True)
+            total -= st.st_size
+
+    def leeren(self):
+        """Alle gespeicherten Bilder löschen."""
+        shutil.rmtree(self.verzeichnis, ignore_errors=True)
+
+
+def zeige(datei):
+    """Gespeichertes Bild im Notebook anzeigen (ausserhalb von Jupyter nur den Pfad ausgeben)."""
+    try:
+        from IPython import get_ipython
+        from IPython.display import Image, display
+    except ImportError:
+        get_ipython = None
+    if get_ipython is None or get_ipython() is None:
+        print(datei)
+        return
+    display(Image(filename=str(datei)))
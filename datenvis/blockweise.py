@@ -0,0 +1,184 @@
+"""Blockweise Auswertung grosser Swissgrid-Exporte, die nicht in den Speicher passen.
+
+Der CSV-File wird mit ``pd.read_csv(chunksize=...)`` in Blöcken gelesen. Jeder
+Block wird zu Teilresultaten zusammengefasst, die sich mit den Teilresultaten
+der anderen Blöcke kombinieren lassen:
+
+    - Anzahl, Summe, Minimum, Maximum, Mittelwert und Quadratsumme der
+      Abweichungen (M2) pro Energieträger (und optional pro Periode); zwei
+      Teilresultate werden mit der Formel von Chan et al. kombiniert
+    - Summen der (verschobenen) Werte, Quadrate und Produkte für jedes Paar von
+      Energieträgern, jeweils nur über die Zeitpunkte, an denen beide einen
+      Wert haben (daraus folgt die Korrelationsmatrix)
+
+Der Speicherbedarf hängt nur von der Blockgrösse und der Anzahl Gruppen ab,
+nicht von der Grösse des Files. Das Resultat entspricht (bis auf Rundung)
+``auswerten()`` auf dem ganzen DataFrame im Speicher.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .stromdaten import DATEI_PRODUKTION
+
+Auswertung = namedtuple('Auswertung', ['kennzahlen', 'korrelation'])
+Auswertung.__doc__ = """Resultat von auswerten() und blockweise_auswerten().
+
+kennzahlen: anzahl, summe, mittel, std, min, max pro Energieträger (und Periode)
+korrelation: Korrelationsmatrix der Energieträger (Pearson, paarweise vollständige Zeitpunkte)
+"""
+
+
+class Kennzahlen:
+    """Kombinierbare Kennzahlen pro Gruppe (Anzahl, Summe, Min, Max, Mittelwert, M2)."""
+
+    def __init__(self):
+        self.tabelle = None
+
+    @staticmethod
+    def aus_gruppen(gruppiert):
+        tabelle = gruppiert.agg(['count', 'sum', 'min', 'max', 'mean'])
+        tabelle.columns = ['anzahl', 'summe', 'min', 'max', 'mittel']
+        tabelle['m2'] = gruppiert.var(ddof=0).fillna(0.0) * tabelle['anzahl']
+        return tabelle
+
+    def hinzufuegen(self, tabelle):
+        """Teilresultat (aus aus_gruppen()) mit dem bisherigen Stand kombinieren."""
+        if self.tabelle is None:
+            self.tabelle = tabelle
+            return
+        a, b = self.tabelle.align(tabelle, join='outer')
+        a = a.fillna({'anzahl': 0, 'summe': 0.0, 'mittel': 0.0, 'm2': 0.0})
+        b = b.fillna({'anzahl': 0, 'summe': 0.0, 'mittel': 0.0, 'm2': 0.0})
+        n = a['anzahl'] + b['anzahl']
+        delta = b['mittel'] - a['mittel']
+        anteil = (b['anzahl'] / n.where(n > 0)).fillna(0.0)
+        self.tabelle = pd.DataFrame({
+            'anzahl': n,
+            'summe': a['summe'] + b['summe'],
+            'min': np.fmin(a['min'], b['min']),
+            'max': np.fmax(a['max'], b['max']),
+            'mittel': a['mittel'] + delta * anteil,
+            'm2': a['m2'] + b['m2'] + delta ** 2 * a['anzahl'] * anteil,
+        })
+
+    def resultat(self):
+        t = self.tabelle.sort_index()
+        std = np.sqrt(t['m2'] / (t['anzahl'] - 1).where(t['anzahl'] > 1))
+        return pd.DataFrame({
+            'anzahl': t['anzahl'].astype(np.int64), 'summe': t['summe'], 'mittel': t['mittel'],
+            'std': std, 'min': t['min'], 'max': t['max'],
+        })
+
+
+class Komomente:
+    """Kombinierbare Summen für die paarweise Korrelation mehrerer Zeitreihen.
+
+    Für jedes Paar (i, j) werden über die Zeitpunkte, an denen beide Werte
+    vorhanden sind, Anzahl, Summe von x_i, Summe von x_i**2 und Summe von
+    x_i * x_j aufsummiert. Die Werte werden vorher um einen festen Wert pro
+    Spalte verschoben (Mittelwert beim ersten Auftreten), damit die Summen
+    numerisch genau bleiben.
+    """
+
+    def __init__(self):
+        self.namen = []
+        self.verschiebung = np.zeros(0)
+        self.n = np.zeros((0, 0))
+        self.sx = np.zeros((0, 0))
+        self.sxx = np.zeros((0, 0))
+        self.sxy = np.zeros((0, 0))
+
+    def _erweitern(self, spalten):
+        neu = [name for name in spalten if name not in self.namen]
+        if not neu:
+            return
+        k, m = len(self.namen), len(self.namen) + len(neu)
+        for feld in ('n', 'sx', 'sxx', 'sxy'):
+            alt = getattr(self, feld)
+            gross = np.zeros((m, m))
+            gross[:k, :k] = alt
+            setattr(self, feld, gross)
+        self.namen += neu
+        self.verschiebung = np.append(self.verschiebung, np.zeros(len(neu)))
+        return neu
+
+    def hinzufuegen(self, breit):
+        """Block in breiter Form (eine Zeile pro Zeitpunkt, eine Spalte pro Zeitreihe)."""
+        neu = self._erweitern(breit.columns) or []
+        for name in neu:
+            mittel = breit[name].mean()
+            self.verschiebung[self.namen.index(name)] = 0.0 if np.isnan(mittel) else mittel
+
+        x = breit.reindex(columns=self.namen).to_numpy(dtype=float) - self.verschiebung
+        gueltig = ~np.isnan(x)
+        m = gueltig.astype(float)
+        x0 = np.where(gueltig, x, 0.0)
+        self.n += m.T @ m
+        self.sx += x0.T @ m
+        self.sxx += (x0 * x0).T @ m
+        self.sxy += x0.T @ x0
+
+    def korrelation(self):
+        n = self.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = self.sxy - self.sx * self.sx.T / n
+            var_i = self.sxx - self.sx ** 2 / n
+            var_j = var_i.T
+            r = cov / np.sqrt(var_i * var_j)
+        r[n < 2] = np.nan
+        ordnung = np.argsort(self.namen)
+        namen = [self.namen[i] for i in ordnung]
+        return pd.DataFrame(r[np.ix_(ordnung, ordnung)], index=namen, columns=namen)
+
+
+def _gruppen(df, freq):
+    schluessel = [df['Energietraeger']]
+    if freq is not None:
+        schluessel.append(pd.to_datetime(df['Datum']).dt.to_period(freq).rename('Periode'))
+    return df.groupby(schluessel, observed=True)['Produktion_GWh']
+
+
+def _breit(df):
+    return df.pivot_table(index='Datum', columns='Energietraeger', values='Produktion_GWh',
+                          aggfunc='mean', observed=True)
+
+
+def auswerten(df, freq=None):
+    """Kennzahlen und Korrelationsmatrix für ein DataFrame im Speicher (Referenz)."""
+    gruppiert = _gruppen(df, freq)
+    kennzahlen = pd.DataFrame({
+        'anzahl': gruppiert.count().astype(np.int64), 'summe': gruppiert.sum(), 'mittel': gruppiert.mean(),
+        'std': gruppiert.std(), 'min': gruppiert.min(), 'max': gruppiert.max(),
+    }).sort_index()
+    korrelation = _breit(df).corr()
+    korrelation = korrelation.sort_index().sort_index(axis=1)
+    korrelation.index.name = korrelation.columns.name = None
+    return Auswertung(kennzahlen, korrelation)
+
+
+def blockweise_auswerten(pfad=DATEI_PRODUKTION, chunksize=1_000_000, freq=None):
+    """Kennzahlen und Korrelationsmatrix blockweise aus dem CSV-File berechnen.
+
+    Der File muss nach Datum sortiert sein (wie der Swissgrid-Export). Die
+    Zeilen des letzten Datums eines Blocks werden zum nächsten Block
+    übernommen, damit alle Werte eines Zeitpunkts zusammen ausgewertet werden.
+    freq: optionale Periode für die Kennzahlen, z.B. 'M' oder 'Y'
+    """
+    kennzahlen = Kennzahlen()
+    komomente = Komomente()
+    rest = None
+    for block in pd.read_csv(pfad, chunksize=chunksize):
+        kennzahlen.hinzufuegen(Kennzahlen.aus_gruppen(_gruppen(block, freq)))
+
+        if rest is not None:
+            block = pd.concat([rest, block], ignore_index=True)
+        letzter = block['Datum'].iloc[-1]
+        offen = (block['Datum'] == letzter).to_numpy()
+        rest = block[offen]
+        komomente.hinzufuegen(_breit(block[~offen]))
+    if rest is not None:
+        komomente.hinzufuegen(_breit(rest))
+    return Auswertung(kennzahlen.resultat(), komomente.korrelation())
@@ -0,0 +1,108 @@
+"""Datensätze einmal laden und an Worker-Prozesse weitergeben, ohne sie zu kopieren.
+
+Wird die Arbeit auf mehrere Prozesse verteilt (z.B. beim Export aller
+Grafiken), liest sonst jeder Prozess die CSV- und Excel-Files selbst und
+hält eine eigene Kopie im Speicher. Der Broker lädt jeden Datensatz einmal
+im Hauptprozess und schreibt ihn als Arrow-IPC-File in ein temporäres
+Verzeichnis, wenn möglich im gemeinsamen Speicher (/dev/shm). Die Worker
+öffnen das File mit Memory-Mapping: das Betriebssystem teilt die Seiten
+zwischen allen Prozessen, Zahlen- und Datumsspalten werden ohne Kopie als
+DataFrame verwendet. Das Öffnen dauert Millisekunden.
+
+    with Broker() as broker:
+        broker.laden({'produktion': pfad_csv})
+        pool = ProcessPoolExecutor(initializer=quellen.verbinden, initargs=(broker.katalog(),))
+
+In den Workern liefert quellen.laden() dann die geteilten Datensätze. Was
+Arrow nicht darstellen kann (GeoDataFrames, Spalten mit gemischten Typen),
+wird mit pickle gespeichert: einmal geladen, aber in jedem Prozess kopiert.
+Beim Schliessen (oder am Ende des Programms) wird das Verzeichnis gelöscht.
+"""
+
+import pickle
+import shutil
+import tempfile
+import weakref
+from pathlib import Path
+
+import pandas as pd
+
+from . import quellen
+
+# Gemeinsamer Speicher unter Linux; sonst das normale temporäre Verzeichnis
+SHM = Path('/dev/shm')
+
+
+def schreiben(df, datei):
+    """Datensatz als Arrow-IPC-File (oder pickle, falls Arrow nicht geht) speichern; gibt den Pfad zurück."""
+    import pyarrow as pa
+
+    datei = Path(datei)
+    try:
+        if type(df) is not pd.DataFrame:
+            raise TypeError(type(df).__name__)
+        tabelle = pa.Table.from_pandas(df)
+    except (TypeError, pa.ArrowException):
+        datei = datei.with_suffix('.pickle')
+        with open(datei, 'wb') as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return datei
+    datei = datei.with_suffix('.arrow')
+    with pa.OSFile(str(datei), 'wb') as f, pa.ipc.new_file(f, tabelle.schema) as schreiber:
+        schreiber.write_table(tabelle)
+    return datei
+
+
+def lesen(datei):
+    """Mit schreiben() gespeicherten Datensatz öffnen (Arrow: Memory-Mapping, Spalten ohne Kopie)."""
+    datei = Path(datei)
+    if datei.suffix == '.pickle':
+        with open(datei, 'rb') as f:
+            return pickle.load(f)
+    import pyarrow as pa
+
+    tabelle = pa.ipc.open_file(pa.memory_map(str(datei), 'r')).read_all()
+    return tabelle.to_pandas(split_blocks=True)
+
+
+class Broker:
+    """Geteilte Datensätze in einem temporären Verzeichnis.
+
+    ordner: Verzeichnis, in dem das temporäre Verzeichnis angelegt wird
+            (Standard: /dev/shm, falls vorhanden)
+    """
+
+    def __init__(self, ordner=None):
+        if ordner is None and SHM.is_dir():
+            ordner = SHM
+        self.verzeichnis = Path(tempfile.mkdtemp(prefix='datenvis-broker-', dir=ordner))
+        self.dateien = {}
+        self._aufraeumen = weakref.finalize(self, shutil.rmtree, self.verzeichnis, ignore_errors=True)
+
+    def veroeffentlichen(self, name, pfad, daten):
+        """Datensatz der Quelle name aus dem Datenfile pfad für die Worker speichern; gibt den Pfad zurück."""
+        schluessel = quellen.schluessel(name, pfad)
+        datei = schreiben(daten, self.verzeichnis / ('%d_%s' % (len(self.dateien), name)))
+        self.dateien[schluessel] = str(datei)
+        return datei
+
+    def laden(self, pfade):
+        """Quellen {Name: Pfad} gleichzeitig laden (datenvis.quellen) und veröffentlichen."""
+        for name, daten in quellen.alle_laden(pfade).items():
+            self.veroeffentlichen(name, pfade[name], daten)
+        return self
+
+    def katalog(self):
+        """{(Name, Pfad): File} für quellen.verbinden() in den Workern."""
+        return dict(self.dateien)
+
+    def schliessen(self):
+        """Temporäres Verzeichnis mit allen Files löschen."""
+        self._aufraeumen()
+        self.dateien.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *fehler):
+        self.schliessen()
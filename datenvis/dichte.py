@@ -0,0 +1,88 @@
+"""Scatterplot mit Dichte-Darstellung für grosse Datenmengen.
+
+Bei stündlichen oder viertelstündlichen Daten hat ein Scatterplot Hunderttausende
+bis Millionen Punkte. Jeder Punkt mit Rand und Transparenz gezeichnet dauert
+lange, und das Resultat ist eine einfarbige Fläche. In der Dichte-Darstellung
+werden die Punkte in ein Raster gleich grosser Zellen eingeteilt (Zellindex
+berechnen und mit np.bincount() zählen, wie np.histogram2d(), aber ohne Suche
+in den Zellgrenzen) und die Anzahl Punkte pro Zelle wird mit einer Farbskala
+als Bild gezeichnet. Die Zeit zum Zeichnen hängt dann nur von der Anzahl
+Zellen ab, nicht von der Anzahl Punkte.
+"""
+
+import numpy as np
+from matplotlib.colors import LogNorm
+
+# Ab dieser Anzahl Punkte wird im Modus 'auto' die Dichte gezeichnet
+GRENZE_PUNKTE = 20000
+
+
+def regression(x, y):
+    """Steigung b und Achsenabschnitt a der linearen Regression (wie np.polyfit(x, y, 1))."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    dx = x - x.mean()
+    b = np.dot(dx, y - y.mean()) / np.dot(dx, dx)
+    return b, y.mean() - b * x.mean()
+
+
+def histogramm2d(x, y, bins=200):
+    """Anzahl Punkte pro Zelle in einem Raster mit bins × bins gleich grossen Zellen.
+
+    Gibt (Anzahl, x-Kanten, y-Kanten) zurück wie np.histogram2d(x, y, bins); ohne Punkte
+    sind alle Zellen leer und die Kanten gehen wie bei NumPy von 0 bis 1.
+    """
+    def zellen(v):
+        if len(v) == 0:
+            return v.astype(np.int64), np.linspace(0.0, 1.0, bins + 1)
+        v0, v1 = v.min(), v.max()
+        if v1 <= v0:
+            v0, v1 = v0 - 0.5, v1 + 0.5
+        index = ((v - v0) * (bins / (v1 - v0))).astype(np.int64)
+        return np.minimum(index, bins - 1), np.linspace(v0, v1, bins + 1)
+
+    ix, xkanten = zellen(x)
+    iy, ykanten = zellen(y)
+    anzahl = np.bincount(ix * bins + iy, minlength=bins * bins).reshape(bins, bins)
+    return anzahl, xkanten, ykanten
+
+
+def streudiagramm(ax, x, y, modus='auto', grenze=GRENZE_PUNKTE, bins=200, regressionslinie=True,
+                  cmap='viridis', colorbar=True):
+    """Scatterplot oder Dichte-Darstellung von y gegen x in die Achse ax zeichnen.
+
+    modus: 'punkte' (Scatterplot), 'dichte' (2D-Histogramm) oder 'auto'
+           (Dichte ab ``grenze`` Punkten)
+    bins: Anzahl Zellen pro Achse für die Dichte
+    regressionslinie: Regressionslinie über den Daten zeichnen
+
+    Gibt (Modus, b, a) zurück; b und a sind Steigung und Achsenabschnitt der
+    Regression (None ohne Regressionslinie).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    gueltig = np.isfinite(x) & np.isfinite(y)
+    x, y = x[gueltig], y[gueltig]
+
+    if modus == 'auto':
+        modus = 'dichte' if len(x) >= grenze else 'punkte'
+    elif modus == 'dichte' and len(x) == 0:
+        modus = 'punkte' # Ohne Punkte gibt es keine Dichte (LogNorm braucht mindestens eine Zelle)
+
+    if modus == 'dichte':
+        anzahl, xkanten, ykanten = histogramm2d(x, y, bins=bins)
+        anzahl = np.ma.masked_equal(anzahl, 0) # Leere Zellen transparent
+        bild = ax.imshow(anzahl.T, origin='lower', aspect='auto', interpolation='nearest',
+                         extent=(xkanten[0], xkanten[-1], ykanten[0], ykanten[-1]),
+                         cmap=cmap, norm=LogNorm(), label='Datenpunkte')
+        if colorbar:
+            ax.figure.colorbar(bild, ax=ax, label='Anzahl Datenpunkte')
+    else:
+        ax.scatter(x, y, s=10, alpha=0.6, edgecolors='k', label='Datenpunkte')
+
+    b = a = None
+    if regressionslinie and len(x) > 1:
+        b, a = regression(x, y)
+        xseq = np.linspace(x.min(), x.max(), num=100)
+        ax.plot(xseq, a + b * xseq, color='r', lw=2.0, zorder=3, label='Lineare Regression')
+    return modus, b, a
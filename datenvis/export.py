@@ -0,0 +1,205 @@
+"""Alle Grafiken der Beispiele ohne Bildschirm exportieren, parallel in mehreren Prozessen.
+
+Die Beispiele werden als Pipelines aus ``datenvis.beispiele`` ausgeführt
+(siehe ``datenvis.pipeline``). Jede Grafik ist ein eigener Auftrag, die
+Aufträge werden auf die Prozesse verteilt. Ein Prozess lädt und formt die
+Daten einer Pipeline nur beim ersten Auftrag dieser Pipeline um und
+verwendet das Resultat für alle weiteren Grafiken. Die Datenfiles werden
+vorher einmal im Hauptprozess gelesen und über einen Broker (siehe
+``datenvis.broker``) an alle Prozesse verteilt. Gezeichnet wird ohne
+pyplot (Backend Agg) in Figures aus dem Pool einer FigurenVerwaltung, die
+Grafik wird in allen gewünschten Formaten (PNG, SVG, PDF) gespeichert.
+
+Aufruf im Terminal (im obersten Ordner des Repositorys):
+
+    python -m datenvis.export --ziel export --format png svg pdf --prozesse 4
+
+Am Schluss wird eine Tabelle mit der Zeit pro Grafik ausgegeben. Mit
+``--trace export.json`` messen alle Prozesse ihre Stufen (siehe
+``datenvis.messung``); die Ereignisse werden in einem Trace gesammelt, in
+dem jeder Prozess eine eigene Zeile hat.
+"""
+
+import argparse
+import pickle
+import sys
+import time
+import traceback
+import warnings
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from . import quellen
+from .beispiele import PIPELINES
+from .broker import Broker
+from .messung import MESSUNG, Messung, stufe
+from .pipeline import FORMATE, abbildung_zeichnen, ausfuehren, figur_speichern, modul
+
+# Pro Prozess: Resultate (oder Fehler) der Pipelines und die FigurenVerwaltung
+_RESULTATE = {}
+_VERWALTUNG = None
+
+Export = namedtuple('Export', ['pipeline', 'name', 'daten', 'zeichnen', 'export', 'fehler', 'ereignisse'])
+Export.__doc__ = """Resultat von abbildung_exportieren(): Zeiten in Sekunden, Fehlermeldung
+oder None und die gemessenen Stufen (leer ohne Messung).
+daten: Laden und Umformen (0 wenn der Prozess die Daten schon hat)
+"""
+
+
+def _start(trace=False, katalog=None):
+    """Initialisierung jedes Prozesses: Backend Agg, bevor pyplot importiert wird; geteilte Datensätze
+    eintragen; mit trace die Messung starten."""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    quellen.PROZESSE = False # Die Worker sind schon Prozesse: Datenfiles in Threads laden
+    quellen.verbinden(katalog or {})
+    if trace:
+        MESSUNG.starten()
+
+
+def _resultat(pipeline):
+    """Resultat der Pipeline, einmal pro Prozess berechnet; gibt (Resultat, Zeit in s) zurück."""
+    if pipeline in _RESULTATE:
+        resultat = _RESULTATE[pipeline]
+        if isinstance(resultat, Exception):
+            raise resultat
+        return resultat, 0.0
+    start = time.perf_counter()
+    try:
+        _RESULTATE[pipeline] = ausfuehren(pipeline).resultat
+    except Exception as fehler: # z.B. fehlendes Datenfile: nicht für jede Grafik neu versuchen
+        _RESULTATE[pipeline] = fehler
+        raise
+    return _RESULTATE[pipeline], time.perf_counter() - start
+
+
+def auftraege(pipelines=None):
+    """Liste von (Pipeline, Abbildung) für alle Grafiken der Pipelines (ohne Angabe: alle)."""
+    return [(name, abbildung.name) for name in (pipelines or PIPELINES)
+            for abbildung in modul(name).ABBILDUNGEN]
+
+
+def abbildung_exportieren(pipeline, name, ziel, formate=FORMATE, dpi=100):
+    """Eine Grafik einer Pipeline zeichnen und in allen Formaten nach ziel/<Pipeline>/ speichern; gibt ein Export zurück."""
+    global _VERWALTUNG
+    if _VERWALTUNG is None:
+        from .figuren import FigurenVerwaltung
+        _VERWALTUNG = FigurenVerwaltung(pyplot=False)
+    zeiten = [0.0, 0.0, 0.0]
+    fehler = None
+    try:
+        resultat, zeiten[0] = _resultat(pipeline)
+        abbildung = next(a for a in modul(pipeline).ABBILDUNGEN if a.name == name)
+        ordner = Path(ziel) / pipeline
+        ordner.mkdir(parents=True, exist_ok=True)
+
+        with stufe(pipeline + '/' + name):
+            start = time.perf_counter()
+            fig = abbildung_zeichnen(pipeline, abbildung, resultat, _VERWALTUNG, dpi)
+            zeiten[1] = time.perf_counter() - start
+            start = time.perf_counter()
+            try:
+                figur_speichern(fig, ordner, name, formate, dpi)
+            finally:
+                _VERWALTUNG.schliessen(fig)
+            zeiten[2] = time.perf_counter() - start
+    except Exception:
+        fehler = traceback.format_exc(limit=-1).strip().splitlines()[-1]
+    return Export(pipeline, name, *zeiten, fehler, MESSUNG.abholen())
+
+
+def teilen(broker, pipelines=None):
+    """Datenfiles der Pipelines gleichzeitig lesen und im Broker veröffentlichen; gibt den Katalog zurück.
+
+    Ein Datenfile, das nicht gelesen werden kann, wird mit einer Warnung übergangen:
+    der Fehler wird dann von den Grafiken der Pipeline gemeldet. Kann der Broker einen
+    Datensatz nicht speichern (kein Platz in /dev/shm, Daten lassen sich nicht mit
+    pickle speichern), lesen die Prozesse das Datenfile selbst. Andere Fehler des
+    Brokers werden weitergegeben.
+    """
+    pfade = {name: pfad for p in (pipelines or PIPELINES) for name, pfad in modul(p).EINGABEN.items()
+             if name in quellen.QUELLEN}
+    quellen.starten(pfade)
+    for name, pfad in pfade.items():
+        try:
+            daten = quellen.laden(name, pfad)
+        except Exception as fehler: # wird beim Ausführen der Pipeline noch einmal gemeldet
+            warnings.warn('Datensatz %s (%s) nicht geteilt, Datenfile nicht lesbar: %s' % (name, pfad, fehler),
+                          RuntimeWarning, stacklevel=2)
+            continue
+        try:
+            broker.veroeffentlichen(name, pfad, daten)
+        except (OSError, pickle.PicklingError, TypeError) as fehler:
+            warnings.warn('Datensatz %s nicht geteilt, die Prozesse lesen %s selbst: %s' % (name, pfad, fehler),
+                          RuntimeWarning, stacklevel=2)
+    return broker.katalog()
+
+
+def exportieren(pipelines=None, ziel='export', formate=FORMATE, prozesse=None, dpi=100, trace=False, geteilt=True):
+    """Alle Grafiken parallel exportieren; gibt eine Liste von Export zurück (mit trace samt gemessenen Stufen).
+
+    geteilt: Datenfiles einmal lesen und mit einem Broker an die Prozesse verteilen
+    """
+    liste = auftraege(pipelines)
+    reihenfolge = {auftrag: i for i, auftrag in enumerate(liste)}
+    resultate = []
+    with Broker() as broker:
+        katalog = teilen(broker, pipelines) if geteilt else {}
+        with ProcessPoolExecutor(max_workers=prozesse, initializer=_start, initargs=(trace, katalog)) as pool:
+            laufend = [pool.submit(abbildung_exportieren, p, n, ziel, tuple(formate), dpi) for p, n in liste]
+            for auftrag in as_completed(laufend):
+                resultate.append(auftrag.result())
+    return sorted(resultate, key=lambda r: reihenfolge[r[:2]])
+
+
+def zusammenfassung(resultate, gesamtzeit=None):
+    """Tabelle mit der Zeit pro Grafik und den Fehlern (einmal pro Pipeline) als Text."""
+    zeilen = ['%-48s %10s %12s %10s' % ('Grafik', 'Daten [s]', 'Zeichnen [s]', 'Export [s]')]
+    fehler = {}
+    for pipeline, name, daten, zeichnen, export, meldung, _ in resultate:
+        if meldung:
+            fehler.setdefault(pipeline, meldung)
+            continue
+        zeilen.append('%-48s %10.2f %12.2f %10.2f' % (pipeline + '/' + name, daten, zeichnen, export))
+    for pipeline, meldung in fehler.items():
+        zeilen.append('%-48s FEHLER: %s' % (pipeline, meldung))
+    fuss = '%d Grafiken aus %d Pipelines' % (sum(1 for r in resultate if not r.fehler),
+                                            len({r.pipeline for r in resultate}))
+    if gesamtzeit is not None:
+        fuss += ' in %.1f s' % gesamtzeit
+    zeilen.append(fuss)
+    return '\n'.join(zeilen)
+
+
+def main(argumente=None):
+    parser = argparse.ArgumentParser(description='Grafiken aller Beispiele parallel exportieren.')
+    parser.add_argument('pipelines', nargs='*', metavar='PIPELINE',
+                        help='Pipelines aus datenvis.beispiele (ohne Angabe: alle): ' + ', '.join(PIPELINES))
+    parser.add_argument('--ziel', default='export', help='Zielordner (Standard: export)')
+    parser.add_argument('--format', nargs='+', default=['png'], choices=FORMATE, dest='formate',
+                        help='Formate (Standard: png)')
+    parser.add_argument('--prozesse', type=int, default=None, help='Anzahl Prozesse (Standard: Anzahl CPUs)')
+    parser.add_argument('--dpi', type=int, default=100, help='Auflösung für PNG (Standard: 100)')
+    parser.add_argument('--ohne-broker', action='store_false', dest='geteilt',
+                        help='Datenfiles in jedem Prozess selbst lesen statt einmal für alle')
+    parser.add_argument('--trace', metavar='DATEI',
+                        help='Stufen in allen Prozessen messen und als Trace (JSON) speichern')
+    args = parser.parse_args(argumente)
+    unbekannt = set(args.pipelines) - set(PIPELINES)
+    if unbekannt:
+        parser.error('Unbekannte Pipeline: ' + ', '.join(sorted(unbekannt)))
+
+    start = time.perf_counter()
+    resultate = exportieren(args.pipelines, args.ziel, args.formate, args.prozesse, args.dpi, bool(args.trace),
+                            args.geteilt)
+    print(zusammenfassung(resultate, time.perf_counter() - start))
+    if args.trace:
+        messung = Messung()
+        messung.ereignisse = [e for r in resultate for e in r.ereignisse]
+        print('Trace gespeichert:', messung.speichern(args.trace))
+    return 1 if any(r.fehler for r in resultate) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Erstellen, Anzeigen, Speichern und Schliessen von Grafiken.
+
+``plt.figure().set_figheight(5)`` gefolgt von ``plt.figure().set_figwidth(15)``
+erstellt zwei Figures; gezeichnet wird nur in die zweite. pyplot hält alle
+Figures in einer Liste, bis sie mit ``plt.close()`` geschlossen werden. In
+einem Skript oder einer Batch-Verarbeitung (Backend Agg, ``plt.show()`` tut
+nichts) wächst der Speicher so mit jeder Grafik, bis Matplotlib mit "More
+than 20 figures have been opened" warnt.
+
+Die Funktionen hier erstellen eine Figure in der richtigen Grösse mit einem
+Aufruf (``figur(15, 5)``) und schliessen sie nach dem Anzeigen bzw. Speichern
+(``zeigen()``, ``speichern()``). ``zeigen()`` zeigt nur die eine Figure, nicht
+alle offenen wie ``plt.show()``.
+
+Ohne pyplot (``FigurenVerwaltung(pyplot=False)``, z.B. für den Export vieler
+Grafiken) werden die Figures nicht bei pyplot angemeldet. Geschlossene
+Figures werden geleert und nach Grösse in einem Pool aufbewahrt; die nächste
+Figure gleicher Grösse verwendet Figure und Canvas wieder. Figures mit
+besonderen Argumenten (z.B. ``layout='constrained'``) kommen nicht in den
+Pool, damit ihre Einstellungen nicht in eine andere Grafik gelangen.
+
+Beobachter (``VERWALTUNG.beobachter``) werden mit jeder Figure aufgerufen,
+bevor sie angezeigt oder gespeichert wird, z.B. um alle Grafiken eines
+Notebooks zusätzlich als File zu speichern.
+"""
+
+import weakref
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+class FigurenVerwaltung:
+    """Erstellt Figures und schliesst sie nach dem Anzeigen oder Speichern.
+
+    pyplot: Figures bei pyplot anmelden (für Notebooks und plt.*-Aufrufe);
+            sonst eigenständige Figures mit Agg-Canvas aus einem Pool
+    pool_groesse: Anzahl geleerter Figures, die pro Grösse aufbewahrt werden
+    beobachter: Funktionen fig -> None, aufgerufen vor dem Anzeigen und Speichern
+    """
+
+    def __init__(self, pyplot=True, pool_groesse=4):
+        self.pyplot = pyplot
+        self.pool_groesse = pool_groesse
+        self._pool = {}
+        self._offen = weakref.WeakValueDictionary()
+        # Figures ohne besondere Argumente (layout, facecolor, ...); nur diese kommen in den Pool
+        self._poolbar = weakref.WeakSet()
+        self.beobachter = []
+        self.erstellt = 0
+        self.wiederverwendet = 0
+
+    @staticmethod
+    def _schluessel(breite, hoehe, dpi):
+        return round(float(breite), 3), round(float(hoehe), 3), round(float(dpi), 3)
+
+    @classmethod
+    def _groesse(cls, fig):
+        return cls._schluessel(*fig.get_size_inches(), fig.get_dpi())
+
+    def figur(self, breite=15, hoehe=5, dpi=None, **kwargs):
+        """Neue (oder wiederverwendete, leere) Figure mit breite × hoehe Zoll."""
+        if self.pyplot:
+            fig = plt.figure(figsize=(breite, hoehe), dpi=dpi, **kwargs)
+            self.erstellt += 1
+        else:
+            # Die neue Figure erhält genau die Auflösung des Schlüssels; beim Schliessen wird
+            # derselbe Schlüssel aus Grösse und Auflösung der Figure berechnet
+            if dpi is None:
+                dpi = plt.rcParams['figure.dpi']
+            schluessel = self._schluessel(breite, hoehe, dpi)
+            frei = self._pool.get(schluessel)
+            if frei and not kwargs:
+                fig = frei.pop()
+                self.wiederverwendet += 1
+            else:
+                fig = Figure(figsize=(breite, hoehe), dpi=dpi, **kwargs)
+                FigureCanvasAgg(fig)
+                self.erstellt += 1
+                if not kwargs:
+                    self._poolbar.add(fig)
+        self._offen[id(fig)] = fig
+        return fig
+
+    def schliessen(self, fig=None):
+        """Figure schliessen (ohne Angabe: die aktuelle pyplot-Figure)."""
+        if fig is None:
+            fig = plt.gcf()
+        self._offen.pop(id(fig), None)
+        if self.pyplot or fig.canvas.manager is not None:
+            plt.close(fig)
+            return
+        if fig not in self._poolbar:
+            return
+        frei = self._pool.setdefault(self._groesse(fig), [])
+        if len(frei) < self.pool_groesse:
+            # clear() entfernt nur den Inhalt; Einstellungen der Figure auf die Standardwerte zurücksetzen
+            fig.clear()
+            fig.set_layout_engine(None)
+            fig.set_facecolor(plt.rcParams['figure.facecolor'])
+            fig.set_edgecolor(plt.rcParams['figure.edgecolor'])
+            frei.append(fig)
+
+    def _melden(self, fig):
+        for beobachter in self.beobachter:
+            beobachter(fig)
+
+    def zeigen(self, fig=None, schliessen=True):
+        """Figure anzeigen und danach schliessen (ohne Angabe: die aktuelle pyplot-Figure).
+
+        schliessen: False für Figures, die nach dem Anzeigen weiterverwendet werden
+        """
+        if fig is None:
+            fig = plt.gcf()
+        self._melden(fig)
+        if fig.canvas.manager is not None:
+            _anzeigen(fig)
+        if schliessen:
+            self.schliessen(fig)
+
+    def speichern(self, datei, fig=None, **savefig_kwargs):
+        """Figure speichern und danach schliessen; gibt den Pfad zurück."""
+        if fig is None:
+            fig = plt.gcf()
+        self._melden(fig)
+        try:
+            fig.savefig(datei, **savefig_kwargs)
+        finally:
+            self.schliessen(fig)
+        return datei
+
+    def offen(self):
+        """Anzahl Figures, die erstellt, aber noch nicht geschlossen wurden."""
+        if self.pyplot:
+            return sum(1 for fig in list(self._offen.values()) if plt.fignum_exists(fig.number))
+        return len(self._offen)
+
+
+def _anzeigen(fig):
+    """Nur fig anzeigen; plt.show() würde alle offenen Figures anzeigen (und im Notebook schliessen)."""
+    if 'inline' in plt.get_backend():
+        # Notebook: Bild in der Ausgabe der Zelle
+        from IPython.display import display
+        display(fig)
+        return
+    if fig.canvas.required_interactive_framework is None:
+        return  # z.B. Agg: es gibt kein Fenster
+    fig.canvas.manager.show()
+    if not plt.isinteractive():
+        # Wie plt.show() in einem Skript: warten, bis das Fenster geschlossen wird
+        fig.canvas.mpl_connect('close_event', lambda ereignis: fig.canvas.stop_event_loop())
+        fig.canvas.start_event_loop()
+
+
+# Verwaltung für die Notebooks (mit pyplot)
+VERWALTUNG = FigurenVerwaltung()
+
+
+def figur(breite=15, hoehe=5, **kwargs):
+    """Neue pyplot-Figure mit breite × hoehe Zoll (ersetzt set_figheight/set_figwidth)."""
+    return VERWALTUNG.figur(breite, hoehe, **kwargs)
+
+
+def zeigen(fig=None, schliessen=True):
+    """Figure anzeigen und danach schliessen."""
+    VERWALTUNG.zeigen(fig, schliessen)
+
+
+def speichern(datei, fig=None, **savefig_kwargs):
+    """Figure speichern und danach schliessen."""
+    return VERWALTUNG.speichern(datei, fig, **savefig_kwargs)
+
+
+def schliessen(fig=None):
+    """Figure schliessen."""
+    VERWALTUNG.schliessen(fig)
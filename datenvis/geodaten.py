@@ -0,0 +1,168 @@
+"""Kantonsgrenzen als aufbereitete Ebene: eine Zeile pro Kanton, als GeoParquet gespeichert.
+
+Das GeoJSON-File von swisstopo (``switzerland.geojson``) hat mehr Zeilen als
+Kantone: Kantone mit Exklaven oder Seen bestehen aus mehreren Teilen, und
+nur die Hauptzeile hat Kantonsfläche und Einwohnerzahl (die anderen NaN).
+Jede Karte müsste die Teile wieder zusammensuchen und das GeoJSON-File (Text)
+neu lesen.
+
+kantone_aufbereiten() fasst die Teile pro Kantonsnummer zu einer Geometrie
+zusammen (dissolve), übernimmt die Werte der Hauptzeile und berechnet
+einmal:
+
+    - KUERZEL: Kürzel des Kantons (siehe ``kantone``)
+    - punkt_x, punkt_y: ein Punkt sicher im Inneren (z.B. für Beschriftungen)
+    - minx, miny, maxx, maxy: umgebendes Rechteck (z.B. zum Zoomen auf einen Kanton)
+    - geometrie_100, geometrie_500, ...: vereinfachte Grenzen pro Toleranz in Metern (TOLERANZEN)
+
+lade_kantone() speichert das Resultat als GeoParquet-File
+(``<datei>.cache/kantone/kantone_<Toleranzen>.parquet``, siehe ``speicher``) und liest
+beim nächsten Mal nur noch dieses binäre File. Ändert sich das Datenfile,
+wird die Ebene neu berechnet.
+
+Detailstufen statt ogr2ogr
+--------------------------
+
+Das GeoJSON-File der Notebooks wurde einmal von Hand mit
+``ogr2ogr -f GeoJSON -t_srs EPSG:4326 -simplify 1000`` aus dem Shapefile
+von swisstopo erstellt: eine einzige Auflösung, zu grob für einen
+vergrösserten Ausschnitt und zu fein für ein kleines Vorschaubild.
+lade_kantone() liest auch das Shapefile direkt (alles, was
+geopandas.read_file() lesen kann), rechnet in EPSG:4326 um und speichert
+neben der Originalgeometrie eine vereinfachte Geometrie pro Toleranz.
+Vereinfacht wird in Metern (LV95) und als Überdeckung
+(``simplify_coverage``): eine Grenze zwischen zwei Kantonen wird auf beiden
+Seiten gleich vereinfacht, es entstehen keine Lücken oder Überlappungen.
+
+karte() zeichnet eine Ebene mit der gröbsten Stufe, deren Toleranz kleiner
+ist als ein Pixel der gespeicherten Grafik (aus der Grösse der Achsen und
+der Auflösung): ein Vorschaubild braucht nur einen Bruchteil der Ecken.
+
+    kantone = lade_kantone('swissBOUNDARIES3D_1_5_TLM_KANTONSGEBIET.shp')
+    karte(kantone, ax, column='EINWOHNERZ', cmap='OrRd')
+"""
+
+import geopandas as gpd
+import shapely
+
+from . import speicher
+from .kantone import kuerzel
+
+DATEI_GEODATEN = 'switzerland.geojson'
+NUMMER = 'KANTONSNUM'
+DATEI_KANTONE = 'kantone_%s.parquet'
+
+# Toleranzen der Detailstufen in Metern, Koordinatensystem der Ebene und zum Vereinfachen (LV95)
+TOLERANZEN = (100, 500, 1000, 5000)
+CRS_KARTE = 'EPSG:4326'
+CRS_METER = 'EPSG:2056'
+STUFE = 'geometrie_%d'
+GITTER = 0.01
+
+
+def vereinfachen(geometrie, toleranz):
+    """Grenzen (GeoSeries in Metern) mit der Toleranz vereinfachen, gemeinsame Grenzen gleich.
+
+    Ecken, die nur durch Rundungsfehler verschieden sind, werden zuerst auf ein Gitter von
+    GITTER Metern gelegt. Ist die Geometrie dann keine gültige Überdeckung (z.B. überlappende
+    Flächen), wird jede Fläche für sich vereinfacht (gültig, aber Grenzen zwischen Kantonen
+    können abweichen).
+    """
+    if not shapely.coverage_is_valid(geometrie.values):
+        geometrie = geometrie.set_precision(GITTER)
+    if shapely.coverage_is_valid(geometrie.values):
+        return geometrie.simplify_coverage(toleranz)
+    return geometrie.simplify(toleranz, preserve_topology=True)
+
+
+def kantone_aufbereiten(geo, nummer=NUMMER, toleranzen=TOLERANZEN):
+    """Eine Zeile pro Kanton: Teile zusammengefasst, Werte der Hauptzeile, Punkt, Rechteck und Detailstufen."""
+    # Hauptzeilen (mit Kantonsfläche) zuerst, damit 'first' deren Werte übernimmt; 'first' überspringt NaN
+    reihenfolge = geo['KANTONSFLA'].isna().argsort(kind='stable') if 'KANTONSFLA' in geo else slice(None)
+    kantone = geo.iloc[reihenfolge].dissolve(by=nummer, aggfunc='first', sort=True).reset_index()
+
+    # Detailstufen in Metern berechnen, danach alles in Längen- und Breitengrad
+    metrisch = kantone.geometry
+    if kantone.crs is not None and kantone.crs.is_geographic:
+        metrisch = metrisch.to_crs(CRS_METER)
+    stufen = {STUFE % toleranz: vereinfachen(metrisch, toleranz) for toleranz in toleranzen}
+    if kantone.crs is not None:
+        kantone = kantone.to_crs(CRS_KARTE)
+        stufen = {spalte: stufe.to_crs(CRS_KARTE) for spalte, stufe in stufen.items()}
+    for spalte, stufe in stufen.items():
+        kantone[spalte] = stufe
+
+    kantone['KUERZEL'] = kuerzel(kantone[nummer]).to_numpy()
+    punkte = kantone.representative_point()
+    kantone['punkt_x'], kantone['punkt_y'] = punkte.x.to_numpy(), punkte.y.to_numpy()
+    return kantone.join(kantone.bounds)
+
+
+def lade_kantone(pfad=DATEI_GEODATEN, toleranzen=TOLERANZEN):
+    """Aufbereitete Kantonsebene; aus dem Zwischenspeicher oder einmal pro Datenstand aus dem Datenfile.
+
+    Der Name des GeoParquet-Files enthält die Toleranzen: mit anderen Toleranzen wird neu berechnet.
+    """
+    verzeichnis = speicher.cache_verzeichnis(pfad, 'kantone')
+    datei = verzeichnis / (DATEI_KANTONE % '_'.join(str(toleranz) for toleranz in toleranzen))
+    if not speicher.ist_aktuell(verzeichnis, pfad) or not datei.exists():
+        speicher.markiere_ungueltig(verzeichnis)
+        for alt in verzeichnis.glob('*.parquet'):
+            alt.unlink()
+        kantone_aufbereiten(gpd.read_file(pfad), toleranzen=toleranzen).to_parquet(datei, index=False)
+        speicher.markiere_aktuell(verzeichnis, pfad)
+    return gpd.read_parquet(datei)
+
+
+def stufen(geo):
+    """{Toleranz in Metern: Spalte} der Detailstufen einer Ebene, 0 für die Originalgeometrie."""
+    praefix = STUFE.partition('%')[0]
+    spalten = {0: geo.geometry.name}
+    for spalte in geo.columns:
+        toleranz = spalte[len(praefix):]
+        if spalte.startswith(praefix) and toleranz.isdigit():
+            spalten[int(toleranz)] = spalte
+    return dict(sorted(spalten.items()))
+
+
+def ecken(geo):
+    """Anzahl Ecken aller Grenzen pro Detailstufe {Toleranz: Anzahl}."""
+    return {toleranz: int(shapely.get_num_coordinates(geo[spalte].values).sum())
+            for toleranz, spalte in stufen(geo).items()}
+
+
+def meter_pro_pixel(ax, geo=None, dpi=None):
+    """Grösse eines Pixels in Metern für die Ebene geo (oder den eingestellten Ausschnitt) in den Achsen ax.
+
+    dpi: Auflösung der gespeicherten Grafik; ohne Angabe rcParams['savefig.dpi'] oder die der Figure
+    """
+    import matplotlib
+
+    fig = ax.get_figure()
+    if dpi is None:
+        dpi = matplotlib.rcParams['savefig.dpi']
+        dpi = fig.dpi if dpi == 'figure' else dpi
+    position = ax.get_position()
+    breite = position.width * fig.get_figwidth() * dpi
+    hoehe = position.height * fig.get_figheight() * dpi
+    if geo is None or not ax.get_autoscale_on():
+        (minx, maxx), (miny, maxy) = ax.get_xlim(), ax.get_ylim()
+        crs = None if geo is None else geo.crs
+    else:
+        (minx, miny, maxx, maxy), crs = geo.total_bounds, geo.crs
+    if crs is not None and crs.is_geographic:
+        minx, miny, maxx, maxy = gpd.GeoSeries([shapely.box(minx, miny, maxx, maxy)], crs=crs).to_crs(CRS_METER).total_bounds
+    # Die Karte hat gleiche Massstäbe in x und y und füllt die Achsen nur in einer Richtung ganz aus
+    return max((maxx - minx) / breite, (maxy - miny) / hoehe)
+
+
+def stufe_waehlen(geo, ax, dpi=None):
+    """Spalte der gröbsten Detailstufe, deren Toleranz höchstens ein Pixel ist (sonst die Originalgeometrie)."""
+    pixel = meter_pro_pixel(ax, geo, dpi)
+    passend = [spalte for toleranz, spalte in stufen(geo).items() if toleranz <= pixel]
+    return passend[-1] if passend else geo.geometry.name
+
+
+def karte(geo, ax, dpi=None, **kwargs):
+    """geo.plot(ax=ax, ...) mit der Detailstufe, die zur Grösse der Achsen und zur Auflösung passt; gibt ax zurück."""
+    return geo.set_geometry(stufe_waehlen(geo, ax, dpi)).plot(ax=ax, **kwargs)
@@ -0,0 +1,131 @@
+"""Kantone der Schweiz: eindeutiger Schlüssel und Verbinden von Tabellen mit den Geodaten.
+
+Die Mietpreise nennen die Kantone auf Deutsch ('Wallis', 'Appenzell A. Rh.'),
+die Geodaten in der Sprache des Kantons ('Valais', 'Appenzell Ausserrhoden').
+Statt beide Tabellen nach Namen zu sortieren und einzelne Namen von Hand zu
+ersetzen, wird jeder Eintrag auf die BFS-Kantonsnummer (1 Zürich bis
+26 Jura) abgebildet: aus dem Namen in einer der Landessprachen (oder
+Englisch), dem Kürzel ('VS') oder der Nummer selbst. Gross- und
+Kleinschreibung, Akzente und Satzzeichen spielen keine Rolle.
+
+Danach ist das Zuordnen ein Join über die Nummer (Nachschlagen in der
+Hash-Tabelle eines pd.Index) statt einer Suche in einer Liste für jede Zeile:
+
+    karte = verbinden(geo_df, mietpreise, links='NAME', rechts='Kanton', spalten=['Total'])
+
+Jeder Name wird nur einmal umgeformt (pd.factorize), auch wenn er in
+tausenden Zeilen vorkommt, z.B. bei Daten pro Gemeinde mit dem Kanton als
+Spalte. Für andere Einheiten (z.B. Gemeinden mit der BFS-Gemeindenummer)
+kann verbinden() eine eigene Schlüsselfunktion bekommen.
+"""
+
+import unicodedata
+from collections import namedtuple
+
+import pandas as pd
+
+Kanton = namedtuple('Kanton', ['nummer', 'kuerzel', 'namen'])
+Kanton.__doc__ = """Kanton: BFS-Nummer, Kürzel und Namen (Deutsch, Französisch, Italienisch, Rätoromanisch,
+Englisch und Schreibweisen aus Datensätzen des BFS).
+"""
+
+KANTONE = [
+    Kanton(1, 'ZH', ('Zürich', 'Zurich', 'Zurigo', 'Turitg')),
+    Kanton(2, 'BE', ('Bern', 'Berne', 'Berna')),
+    Kanton(3, 'LU', ('Luzern', 'Lucerne', 'Lucerna')),
+    Kanton(4, 'UR', ('Uri',)),
+    Kanton(5, 'SZ', ('Schwyz', 'Svitto', 'Sviz')),
+    Kanton(6, 'OW', ('Obwalden', 'Obwald', 'Obvaldo', 'Sursilvania')),
+    Kanton(7, 'NW', ('Nidwalden', 'Nidwald', 'Nidvaldo', 'Sutsilvania')),
+    Kanton(8, 'GL', ('Glarus', 'Glaris', 'Glarona', 'Glaruna')),
+    Kanton(9, 'ZG', ('Zug', 'Zoug', 'Zugo')),
+    Kanton(10, 'FR', ('Freiburg', 'Fribourg', 'Friburgo', 'Friburg')),
+    Kanton(11, 'SO', ('Solothurn', 'Soleure', 'Soletta', 'Soloturn')),
+    Kanton(12, 'BS', ('Basel-Stadt', 'Bâle-Ville', 'Basilea Città', 'Basilea-Citad', 'Basel-City')),
+    Kanton(13, 'BL', ('Basel-Landschaft', 'Basel-Land', 'Bâle-Campagne', 'Basilea Campagna', 'Basilea-Champagna',
+                      'Basel-Country')),
+    Kanton(14, 'SH', ('Schaffhausen', 'Schaffhouse', 'Sciaffusa', 'Schaffusa')),
+    Kanton(15, 'AR', ('Appenzell Ausserrhoden', 'Appenzell A. Rh.', 'Appenzell Rhodes-Extérieures',
+                      'Appenzello Esterno', 'Appenzell Dadora', 'Appenzell Outer Rhodes')),
+    Kanton(16, 'AI', ('Appenzell Innerrhoden', 'Appenzell I. Rh.', 'Appenzell Rhodes-Intérieures',
+                      'Appenzello Interno', 'Appenzell Dadens', 'Appenzell Inner Rhodes')),
+    Kanton(17, 'SG', ('St. Gallen', 'Sankt Gallen', 'Saint-Gall', 'San Gallo', 'Son Gagl')),
+    Kanton(18, 'GR', ('Graubünden', 'Grisons', 'Grigioni', 'Grischun')),
+    Kanton(19, 'AG', ('Aargau', 'Argovie', 'Argovia')),
+    Kanton(20, 'TG', ('Thurgau', 'Thurgovie', 'Turgovia')),
+    Kanton(21, 'TI', ('Tessin', 'Ticino')),
+    Kanton(22, 'VD', ('Waadt', 'Vaud')),
+    Kanton(23, 'VS', ('Wallis', 'Valais', 'Vallese', 'Vallais')),
+    Kanton(24, 'NE', ('Neuenburg', 'Neuchâtel')),
+    Kanton(25, 'GE', ('Genf', 'Genève', 'Ginevra', 'Genevra', 'Geneva')),
+    Kanton(26, 'JU', ('Jura',)),
+]
+
+
+def normalisieren(name):
+    """Vergleichbare Form eines Namens: ohne Akzente, klein, Satzzeichen und Leerzeichen als ein Leerzeichen."""
+    ohne_akzente = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(''.join(z if z.isalnum() else ' ' for z in ohne_akzente.casefold()).split())
+
+
+def _verzeichnis():
+    """{normalisierter Name, Kürzel oder Nummer: BFS-Nummer}."""
+    verzeichnis = {}
+    for kanton in KANTONE:
+        for name in kanton.namen + (kanton.kuerzel, str(kanton.nummer), '%02d' % kanton.nummer):
+            schluessel = normalisieren(name)
+            if verzeichnis.setdefault(schluessel, kanton.nummer) != kanton.nummer:
+                raise ValueError('Name %r gehört zu zwei Kantonen' % name)
+    return verzeichnis
+
+
+VERZEICHNIS = _verzeichnis()
+KUERZEL = {kanton.nummer: kanton.kuerzel for kanton in KANTONE}
+
+
+def kantonsnummer(werte):
+    """BFS-Kantonsnummern (Int64, <NA> wenn unbekannt) zu Namen, Kürzeln oder Nummern (Series oder Liste).
+
+    Jeder verschiedene Wert wird nur einmal nachgeschlagen.
+    """
+    werte = pd.Series(werte)
+    codes, eindeutig = pd.factorize(werte)
+    nummern = pd.array([VERZEICHNIS.get(normalisieren(w)) for w in eindeutig], dtype='Int64')
+    # factorize gibt -1 für fehlende Werte; take mit allow_fill setzt dort <NA>
+    return pd.Series(nummern.take(codes, allow_fill=True), index=werte.index, name='Kantonsnummer')
+
+
+def kuerzel(werte):
+    """Kürzel der Kantone (z.B. 'VS') zu Namen, Kürzeln oder Nummern."""
+    return kantonsnummer(werte).map(KUERZEL)
+
+
+def verbinden(geo, tabelle, links='NAME', rechts='Kanton', spalten=None, schluessel=kantonsnummer):
+    """Spalten einer Tabelle pro Kanton an jede Zeile der Geodaten anfügen (Join über die Kantonsnummer).
+
+    geo: (Geo)DataFrame, links: Spalte mit Kantonsnamen, Kürzeln oder Nummern
+    tabelle: DataFrame mit einer Zeile pro Kanton, rechts: Spalte mit dem Kanton
+    spalten: anzufügende Spalten der Tabelle (ohne Angabe: alle ausser ``rechts``)
+    schluessel: Funktion, die eine Spalte in den gemeinsamen Schlüssel umformt
+
+    Reihenfolge und Index der Geodaten bleiben; Zeilen ohne passenden Kanton erhalten NaN.
+    Einträge der Tabelle, die kein Kanton sind (z.B. 'Schweiz'), oder Kantone, die mehrmals
+    vorkommen, ergeben einen ValueError.
+    """
+    if spalten is None:
+        spalten = [spalte for spalte in tabelle.columns if spalte != rechts]
+    rechte_schluessel = schluessel(tabelle[rechts])
+    unbekannt = rechte_schluessel.isna().to_numpy()
+    if unbekannt.any():
+        raise ValueError('Unbekannte Einträge in %r: %s' % (rechts, ', '.join(map(str, tabelle.loc[unbekannt, rechts]))))
+    rechte = pd.DataFrame({spalte: tabelle[spalte].to_numpy() for spalte in spalten},
+                          index=pd.Index(rechte_schluessel.array))
+    if not rechte.index.is_unique:
+        doppelt = rechte.index[rechte.index.duplicated()].unique()
+        raise ValueError('Mehrere Zeilen für Kanton %s in %r' % (', '.join(map(str, doppelt)), rechts))
+    # reindex sucht jeden Schlüssel der Geodaten in der Hash-Tabelle des Index (NaN ohne Entsprechung)
+    zugeordnet = rechte.reindex(pd.Index(schluessel(geo[links]).array))
+    ergebnis = geo.copy()
+    for spalte in spalten:
+        ergebnis[spalte] = zugeordnet[spalte].to_numpy()
+    return ergebnis
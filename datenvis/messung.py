@@ -0,0 +1,211 @@
+"""Messung von Zeit, CPU-Zeit und Speicher pro Stufe einer Pipeline.
+
+Wird ein Lauf langsam, zeigt die Messung, welche Stufe die Zeit braucht:
+das Lesen des Excel-Files, das Gruppieren nach Energieträger, das Lesen
+der Geodaten oder das Speichern der Grafiken. Stufen werden im Code mit
+
+    with stufe('read_excel', 'laden'):
+        ...
+
+markiert und können verschachtelt werden. Die Art einer Stufe ist eine von
+ARTEN (laden, bereinigen, gruppieren, berechnen, zeichnen, speichern). Pro
+Stufe werden gemessen:
+
+    - Dauer (Wanduhr) und CPU-Zeit des Threads
+    - Speicherspitze mit tracemalloc: höchster Speicher während der Stufe und
+      Zuwachs gegenüber dem Anfang der Stufe (nur mit speicher=True, weil
+      tracemalloc jede Allokation verlangsamt)
+
+Die Speicherspitze von tracemalloc gilt für den ganzen Prozess, nicht pro
+Thread. Sie wird deshalb nur für Stufen im Hauptthread gemessen, während
+denen keine Stufe in einem anderen Thread läuft (z.B. Laden in den Threads
+von ``quellen``). Für alle anderen Stufen ist die Spitze nicht verfügbar
+(None, in der Zusammenfassung und im Trace 'n/a'); sonst würden sich
+gleichzeitige Stufen die Spitze gegenseitig zurücksetzen.
+
+Die Stufen werden als Trace im Chrome Trace Format (JSON) gespeichert, das
+z.B. Perfetto (https://ui.perfetto.dev) oder speedscope als Flame Graph
+darstellen. Ist die Messung ausgeschaltet (Standard), gibt stufe() einen
+leeren Kontext zurück; der Aufwand ist ein Funktionsaufruf pro Stufe.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+
+ARTEN = ('laden', 'bereinigen', 'gruppieren', 'berechnen', 'zeichnen', 'speichern')
+
+Ereignis = namedtuple('Ereignis', ['name', 'art', 'pfad', 'tiefe', 'start', 'dauer', 'cpu', 'spitze', 'zuwachs',
+                                   'prozess', 'thread'])
+Ereignis.__doc__ = """Eine gemessene Stufe.
+
+pfad: Namen der umgebenden Stufen und der Stufe, getrennt durch ';'
+start: time.perf_counter() am Anfang (in allen Prozessen die gleiche Uhr)
+dauer, cpu: Wanduhr und CPU-Zeit des Threads in Sekunden
+spitze, zuwachs: höchster Speicher in Bytes (tracemalloc) und Zuwachs
+                 gegenüber dem Anfang der Stufe; None ohne Speichermessung und
+                 für Stufen, die gleichzeitig mit Stufen anderer Threads liefen
+"""
+
+_LEER = contextlib.nullcontext()
+
+
+class Messung:
+    """Sammelt die Ereignisse aller Stufen, solange sie aktiv ist.
+
+    speicher: Speicherspitzen mit tracemalloc messen
+    """
+
+    def __init__(self, aktiv=False, speicher=True):
+        self.aktiv = False
+        self.speicher = speicher
+        self.ereignisse = []
+        self._lokal = threading.local()
+        self._sperre = threading.Lock()
+        self._tracemalloc = False
+        # Stufen in anderen Threads als dem Hauptthread: laufende und bisher gestartete
+        self._nebenlaeufig = 0
+        self._nebenlaeufig_gestartet = 0
+        if aktiv:
+            self.starten()
+
+    def starten(self, speicher=None):
+        """Messung einschalten (und tracemalloc starten, falls nötig)."""
+        if speicher is not None:
+            self.speicher = speicher
+        if self.speicher and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracemalloc = True
+        self.aktiv = True
+
+    def beenden(self):
+        """Messung ausschalten; die Ereignisse bleiben erhalten."""
+        self.aktiv = False
+        if self._tracemalloc:
+            tracemalloc.stop()
+            self._tracemalloc = False
+
+    @contextlib.contextmanager
+    def aufnahme(self, speicher=None):
+        """Messung für einen with-Block einschalten."""
+        self.starten(speicher)
+        try:
+            yield self
+        finally:
+            self.beenden()
+
+    def abholen(self):
+        """Bisherige Ereignisse zurückgeben und die Liste leeren (z.B. am Ende eines Auftrags im Worker)."""
+        with self._sperre:
+            ereignisse, self.ereignisse = self.ereignisse, []
+        return ereignisse
+
+    def stufe(self, name, art=None):
+        """Kontext, der die Stufe misst (oder nichts tut, wenn die Messung aus ist).
+
+        art: eine von ARTEN oder None für eine Stufe, die nur andere Stufen zusammenfasst
+        """
+        if not self.aktiv:
+            return _LEER
+        if art is not None and art not in ARTEN:
+            raise ValueError('art muss eines von %s sein' % (ARTEN,))
+        return self._messen(name, art)
+
+    @contextlib.contextmanager
+    def _messen(self, name, art):
+        stapel = getattr(self._lokal, 'stapel', None)
+        if stapel is None:
+            stapel = self._lokal.stapel = []
+        speicher = self.speicher and tracemalloc.is_tracing()
+        nebenthread = speicher and threading.current_thread() is not threading.main_thread()
+        if nebenthread:
+            # Die Spitze nicht zurücksetzen; gleichzeitige Stufen im Hauptthread verlieren ihre Spitze
+            with self._sperre:
+                self._nebenlaeufig += 1
+                self._nebenlaeufig_gestartet += 1
+            speicher = False
+        anfang = None
+        if speicher:
+            with self._sperre:
+                neben = self._nebenlaeufig, self._nebenlaeufig_gestartet
+            # Die Spitze ist global: bisherige Spitze der umgebenden Stufe sichern, dann zurücksetzen
+            anfang, spitze = tracemalloc.get_traced_memory()
+            if stapel:
+                stapel[-1][1] = max(stapel[-1][1], spitze)
+            tracemalloc.reset_peak()
+        rahmen = [name, 0]
+        stapel.append(rahmen)
+        start, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            dauer, cpu = time.perf_counter() - start, time.thread_time() - cpu
+            spitze = zuwachs = None
+            if nebenthread:
+                with self._sperre:
+                    self._nebenlaeufig -= 1
+            if speicher:
+                spitze = max(rahmen[1], tracemalloc.get_traced_memory()[1])
+                zuwachs = spitze - anfang
+                with self._sperre:
+                    if neben != (0, self._nebenlaeufig_gestartet):
+                        spitze = zuwachs = None # eine Stufe in einem anderen Thread lief gleichzeitig
+            pfad = ';'.join(r[0] for r in stapel)
+            stapel.pop()
+            ereignis = Ereignis(name, art, pfad, len(stapel), start, dauer, cpu, spitze, zuwachs,
+                                os.getpid(), threading.get_native_id())
+            with self._sperre:
+                self.ereignisse.append(ereignis)
+
+    def tabelle(self):
+        """Alle Ereignisse als DataFrame (in der Reihenfolge des Anfangs)."""
+        import pandas as pd
+
+        return pd.DataFrame(sorted(self.ereignisse, key=lambda e: e.start), columns=Ereignis._fields)
+
+    def trace(self):
+        """Ereignisse im Chrome Trace Format (Dictionary für json.dump)."""
+        null = min((e.start for e in self.ereignisse), default=0.0)
+        ereignisse = []
+        for e in self.ereignisse:
+            argumente = {'cpu_ms': round(e.cpu * 1e3, 3)}
+            if e.spitze is not None:
+                argumente.update(spitze_mb=round(e.spitze / 2 ** 20, 3), zuwachs_mb=round(e.zuwachs / 2 ** 20, 3))
+            elif self.speicher:
+                argumente.update(spitze_mb='n/a', zuwachs_mb='n/a')
+            ereignisse.append({
+                'name': e.name, 'cat': e.art or 'stufe', 'ph': 'X', 'pid': e.prozess, 'tid': e.thread,
+                'ts': round((e.start - null) * 1e6, 1), 'dur': round(e.dauer * 1e6, 1), 'args': argumente,
+            })
+        return {'traceEvents': ereignisse, 'displayTimeUnit': 'ms'}
+
+    def speichern(self, pfad):
+        """Trace als JSON-File speichern; gibt den Pfad zurück."""
+        with open(pfad, 'w', encoding='utf-8') as f:
+            json.dump(self.trace(), f, ensure_ascii=False)
+        return pfad
+
+    def zusammenfassung(self):
+        """Stufen eingerückt nach Verschachtelung mit Zeit, CPU-Zeit und Speicher als Text."""
+        zeilen = ['%-44s %-11s %9s %9s %11s' % ('Stufe', 'Art', 'Zeit [s]', 'CPU [s]', 'Spitze [MB]')]
+        for e in sorted(self.ereignisse, key=lambda e: (e.prozess, e.thread, e.start)):
+            if e.spitze is not None:
+                spitze = '%11.1f' % (e.spitze / 2 ** 20)
+            else:
+                spitze = '%11s' % ('n/a' if self.speicher else '-')
+            zeilen.append('%-44s %-11s %9.3f %9.3f %s' % ('  ' * e.tiefe + e.name, e.art or '', e.dauer, e.cpu,
+                                                         spitze))
+        return '\n'.join(zeilen)
+
+
+# Messung für alle Pipelines (ausgeschaltet, bis sie gestartet wird)
+MESSUNG = Messung()
+
+
+def stufe(name, art=None):
+    """Stufe mit der gemeinsamen Messung MESSUNG messen."""
+    return MESSUNG.stufe(name, art)
@@ -0,0 +1,194 @@
+"""Einlesen der Mietpreise aus dem Excel-File des Bundesamts für Statistik.
+
+Datenquelle: Bundesamt für Statistik, Durchschnittlicher Mietpreis in
+Franken nach Zimmerzahl und Kanton (je-d-09.03.03.01.xlsx), ein Blatt pro
+Jahr.
+
+Das Excel-File wird mit openpyxl gelesen, einem der langsamsten Leser
+überhaupt, der nur einen Prozessorkern nutzt. Jedes Blatt wird deshalb nur
+einmal gelesen und als Parquet-File gespeichert
+(``<datei>.cache/blaetter/<Blatt>.parquet``, siehe ``speicher``); beim
+nächsten Mal wird es von dort gelesen. Ändert sich das Excel-File, werden
+alle Blätter neu gelesen. Fehlen mehrere Blätter (z.B. für alle Jahre),
+liest einlesen() sie parallel in mehreren Prozessen: jeder Prozess öffnet
+das Excel-File im Modus read_only (die Zeilen werden gestreamt, nicht das
+ganze File geladen), liest nur die Spalten der Tabelle und schreibt das
+Parquet-File selbst. Der Hauptprozess hält so nie mehr als ein Blatt im
+Speicher. Im Terminal (im obersten Ordner des Repositorys):
+
+    python -m datenvis.mietpreise 03_Diagramm_und_Karte_Beispiel_Mietpreise/je-d-09.03.03.01.xlsx
+
+Die Kopfzeile und das Ende der Tabelle werden pro Blatt gesucht statt mit
+``header=4`` und ``skiprows=[32, ..., 42]`` fest vorgegeben:
+
+    - erste Datenzeile: die erste Zeile, in der mehr als die Hälfte der
+      Zellen ausser der ersten Zahlen sind
+    - Kopfzeile: die letzte nicht leere Zeile darüber
+    - Ende: die erste Zeile, die ausser in der ersten Spalte leer ist
+      (Anmerkungen und Fussnoten stehen nur in der ersten Spalte)
+
+Die Spalten heissen wie bei ``pd.read_excel(..., header=...)``: leere
+Überschriften 'Unnamed: <i>', doppelte mit '.1', '.2', ... Einträge, die
+keine Zahl sind (z.B. 'X' für zu wenig Beobachtungen), werden zu NaN.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from . import speicher
+
+DATEI_MIETPREISE = 'je-d-09.03.03.01.xlsx'
+
+# Überschrift der Spalten mit Mietpreisen (Total, dann 1 bis 6 und mehr Zimmer)
+MIETPREIS = 'Durch-schnittlicher Mietpreis '
+ZIMMER = ['Total', '1 Zimmer', '2 Zimmer', '3 Zimmer', '4 Zimmer', '5 Zimmer', '6+ Zimmer']
+# Kanton, dann Mietpreis und Vertrauensintervall pro Zimmerzahl
+SPALTEN = 1 + 2 * len(ZIMMER)
+
+
+def spaltennamen(kopf):
+    """Spaltennamen aus den Zellen der Kopfzeile, wie pd.read_excel sie vergibt."""
+    roh = ['Unnamed: %d' % i if pd.isna(zelle) else str(zelle) for i, zelle in enumerate(kopf)]
+    # Eine doppelte Überschrift erhält die erste Nummer, die noch nirgends in der Kopfzeile vorkommt
+    belegt = set(roh)
+    namen = []
+    for name in roh:
+        if name in namen:
+            nummer = 1
+            while '%s.%d' % (name, nummer) in belegt:
+                nummer += 1
+            name = '%s.%d' % (name, nummer)
+            belegt.add(name)
+        namen.append(name)
+    return namen
+
+
+def finde_tabelle(roh):
+    """Kopfzeile, erste und letzte Datenzeile (+1) eines ohne Kopfzeile gelesenen Blatts."""
+    werte = roh.iloc[:, 1:]
+    zahlen = werte.apply(pd.to_numeric, errors='coerce').notna().sum(axis=1)
+    daten = zahlen > werte.shape[1] / 2
+    if not daten.any():
+        raise ValueError('Keine Datenzeilen gefunden')
+    erste = int(daten.to_numpy().argmax())
+    belegt = roh.iloc[:erste].notna().any(axis=1).to_numpy().nonzero()[0]
+    if len(belegt) == 0:
+        raise ValueError('Keine Kopfzeile über der ersten Datenzeile %d' % erste)
+    leer = werte.iloc[erste:].isna().all(axis=1).to_numpy()
+    ende = erste + (int(leer.argmax()) if leer.any() else len(leer))
+    return int(belegt[-1]), erste, ende
+
+
+def tabelle(roh):
+    """Tabelle (ohne Titel und Anmerkungen) aus einem ohne Kopfzeile gelesenen Blatt."""
+    kopf, erste, ende = finde_tabelle(roh)
+    df = roh.iloc[erste:ende].reset_index(drop=True)
+    df.columns = spaltennamen(roh.iloc[kopf])
+    erste_spalte = df.columns[0]
+    df[erste_spalte] = df[erste_spalte].astype(str)
+    zahlen = df.columns[1:]
+    df[zahlen] = df[zahlen].apply(pd.to_numeric, errors='coerce')
+    return df
+
+
+def blattnamen(pfad=DATEI_MIETPREISE):
+    """Namen der Blätter (Jahre) des Excel-Files, ohne die Daten zu lesen."""
+    from openpyxl import load_workbook
+
+    mappe = load_workbook(pfad, read_only=True)
+    try:
+        return list(mappe.sheetnames)
+    finally:
+        mappe.close()
+
+
+def blaetter_einlesen(pfad, auftraege, spalten=SPALTEN):
+    """Blätter gestreamt lesen (openpyxl read_only, nur die ersten ``spalten`` Spalten) und als Parquet-Files
+    speichern; auftraege ist eine Liste von (Blatt, Parquet-File). Läuft auch in einem eigenen Prozess.
+
+    Das Excel-File wird einmal geöffnet; im Speicher ist immer nur ein Blatt. Jedes Blatt wird zuerst
+    in ein temporäres File geschrieben und erst danach umbenannt: ein abgebrochener Lauf hinterlässt
+    kein halbes Parquet-File unter dem richtigen Namen.
+    """
+    from openpyxl import load_workbook
+
+    mappe = load_workbook(pfad, read_only=True, data_only=True)
+    try:
+        for blatt, datei in auftraege:
+            zeilen = list(mappe[blatt].iter_rows(max_col=spalten, values_only=True))
+            temp = datei.with_name(datei.stem + '.tmp' + datei.suffix)
+            tabelle(pd.DataFrame(zeilen)).to_parquet(temp, index=False)
+            os.replace(temp, datei)
+    finally:
+        mappe.close()
+
+
+def _cache(pfad):
+    """Verzeichnis der Parquet-Files und ob es zum Excel-File passt; ist es veraltet, werden die alten Files
+    gelöscht (der Fingerabdruck wird erst nach dem Einlesen neu geschrieben)."""
+    verzeichnis = speicher.cache_verzeichnis(pfad, 'blaetter')
+    aktuell = speicher.ist_aktuell(verzeichnis, pfad)
+    if not aktuell:
+        speicher.markiere_ungueltig(verzeichnis)
+        for alt in verzeichnis.glob('*.parquet'):
+            alt.unlink()
+    return verzeichnis, aktuell
+
+
+def einlesen(pfad=DATEI_MIETPREISE, blaetter=None, prozesse=None):
+    """Fehlende Blätter parallel einlesen und in den Zwischenspeicher schreiben; gibt {Blatt: Parquet-File} zurück.
+
+    blaetter: Namen der Blätter; ohne Angabe alle
+    prozesse: Anzahl Prozesse (Standard: Anzahl CPUs); die Blätter werden reihum verteilt,
+              mit einem Prozess (oder einem fehlenden Blatt) wird im aufrufenden Prozess gelesen
+    """
+    verzeichnis, aktuell = _cache(pfad)
+    dateien = {blatt: verzeichnis / ('%s.parquet' % blatt) for blatt in (blattnamen(pfad) if blaetter is None
+                                                                          else blaetter)}
+    fehlend = [(blatt, datei) for blatt, datei in dateien.items() if not datei.exists()]
+    anzahl = min(prozesse or os.cpu_count() or 1, len(fehlend))
+    if anzahl == 1:
+        blaetter_einlesen(pfad, fehlend)
+    elif anzahl > 1:
+        with ProcessPoolExecutor(max_workers=anzahl) as pool:
+            # result() gibt Fehler in einem Prozess (z.B. ein Blatt ohne Tabelle) weiter
+            for auftrag in [pool.submit(blaetter_einlesen, pfad, fehlend[i::anzahl]) for i in range(anzahl)]:
+                auftrag.result()
+    if not aktuell:
+        # Erst wenn alle Blätter geschrieben sind, gilt der Zwischenspeicher als gültig
+        speicher.markiere_aktuell(verzeichnis, pfad)
+    return dateien
+
+
+def lade_blaetter(pfad=DATEI_MIETPREISE, blaetter=None, prozesse=None):
+    """Blätter aus dem Parquet-Zwischenspeicher; fehlende werden einmal aus dem Excel-File gelesen (siehe einlesen()).
+
+    Gibt {Blatt: Tabelle} in der Reihenfolge von ``blaetter`` zurück (ohne Angabe: alle Blätter).
+    """
+    return {blatt: pd.read_parquet(datei) for blatt, datei in einlesen(pfad, blaetter, prozesse).items()}
+
+
+def lade_mietpreise(pfad=DATEI_MIETPREISE, blatt='2023'):
+    """Ein Jahr (Blatt) der Mietpreise: Schweiz und 26 Kantone, ohne Anmerkungen."""
+    return lade_blaetter(pfad, [blatt])[blatt]
+
+
+def main(argumente=None):
+    parser = argparse.ArgumentParser(description='Alle Blätter der Mietpreise parallel in den Zwischenspeicher einlesen.')
+    parser.add_argument('datei', nargs='?', default=DATEI_MIETPREISE, help='Excel-File (Standard: %(default)s)')
+    parser.add_argument('--prozesse', type=int, default=None, help='Anzahl Prozesse (Standard: Anzahl CPUs)')
+    args = parser.parse_args(argumente)
+    start = time.perf_counter()
+    dateien = einlesen(args.datei, prozesse=args.prozesse)
+    print('%d Blätter in %.2f s: %s' % (len(dateien), time.perf_counter() - start, ', '.join(dateien)))
+    print('Zwischenspeicher:', speicher.cache_verzeichnis(args.datei, 'blaetter'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Mietpreise aller Jahre als dichter Würfel Jahr × Kanton × Zimmerzahl × Grösse.
+
+Im Excel-File hat jedes Jahr ein eigenes Blatt, und die Zimmerzahlen sind
+Spalten mit Namen wie 'Durch-schnittlicher Mietpreis .2'. Jeder Vergleich
+(zwischen Jahren, Zimmerzahlen oder Kantonen) ist dann ein eigenes
+Auswählen von Spalten. Hier werden alle Jahresblätter einmal in ein
+NumPy-Array der Form (Jahre, Kantone, 7 Zimmerzahlen, 2 Grössen) umgeordnet,
+Grössen sind der Mietpreis und das Vertrauensintervall (±). Kantone, die in
+einem Jahr fehlen, sind NaN.
+
+Wachstum zum Vorjahr, Verhältnis zweier Wohnungsgrössen oder die Rangliste
+der Kantone sind damit je ein Ausdruck über alle Jahre und Kantone:
+
+    w = miet_wuerfel('je-d-09.03.03.01.xlsx')
+    w.wachstum()                      # (Jahre, Kantone, Zimmer), NaN ohne Vorjahr
+    w.verhaeltnis('6+ Zimmer', '2 Zimmer')
+    w.rangliste('Total')
+
+Der Würfel wird neben dem Excel-File gespeichert (``<datei>.cache/wuerfel``,
+siehe ``speicher``) und mit Memory-Mapping geöffnet: gelesen wird erst, was
+gebraucht wird.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from . import speicher
+from .mietpreise import DATEI_MIETPREISE, MIETPREIS, ZIMMER, blattnamen, lade_blaetter
+
+GROESSEN = ['mietpreis', 'vertrauensintervall']
+SCHWEIZ = 'Schweiz'
+
+
+def jahresblaetter(pfad=DATEI_MIETPREISE):
+    """Namen der Blätter, die ein Jahr sind (z.B. '2023'), ohne die Daten zu lesen."""
+    return [blatt for blatt in blattnamen(pfad) if blatt.strip().isdigit()]
+
+
+class MietWuerfel:
+    """Mietpreise als Array (Jahr, Kanton, Zimmer, Grösse).
+
+    werte: Array (Jahre, Kantone, Zimmer, Grössen), NaN für fehlende Werte
+    jahre: Jahreszahlen zur ersten Achse (aufsteigend)
+    kantone: Namen zur zweiten Achse (mit 'Schweiz' für den Durchschnitt)
+    zimmer, groessen: Namen zur dritten und vierten Achse
+    """
+
+    def __init__(self, werte, jahre, kantone, zimmer=ZIMMER, groessen=GROESSEN):
+        self.werte = werte
+        self.jahre = np.asarray(jahre)
+        self.kantone = np.asarray(kantone, dtype=object)
+        self.zimmer = list(zimmer)
+        self.groessen = list(groessen)
+        self._jahr = {int(j): i for i, j in enumerate(self.jahre)}
+        self._kanton = {k: i for i, k in enumerate(self.kantone)}
+        self._zimmer = {z: i for i, z in enumerate(self.zimmer)}
+        self._groesse = {g: i for i, g in enumerate(self.groessen)}
+
+    @classmethod
+    def aus_blaettern(cls, blaetter):
+        """Würfel aus {Blatt: Tabelle} (siehe mietpreise.lade_blaetter); Blattnamen sind die Jahre."""
+        jahre = sorted(int(blatt) for blatt in blaetter)
+        tabellen = {}
+        kantone = {} # Reihenfolge der Kantone wie im neuesten Jahr, danach neue aus älteren Jahren
+        for blatt, df in sorted(blaetter.items(), key=lambda eintrag: -int(eintrag[0])):
+            namen = df.iloc[:, 0].str.strip()
+            preise = [i for i, spalte in enumerate(df.columns) if spalte.startswith(MIETPREIS)]
+            if len(preise) != len(ZIMMER):
+                raise ValueError('Blatt %s: %d Spalten mit Mietpreisen statt %d' % (blatt, len(preise), len(ZIMMER)))
+            # Mietpreis und das Vertrauensintervall in der Spalte rechts davon: (Kantone, Zimmer, Grössen)
+            spalten = np.array([[i, i + 1] for i in preise])
+            tabellen[int(blatt)] = namen, df.to_numpy()[:, spalten].astype(float)
+            kantone.update(dict.fromkeys(namen))
+
+        index = pd.Index(list(kantone))
+        werte = np.full((len(jahre), len(index), len(ZIMMER), len(GROESSEN)), np.nan)
+        for i, jahr in enumerate(jahre):
+            namen, blatt = tabellen[jahr]
+            werte[i, index.get_indexer(namen)] = blatt
+        return cls(werte, jahre, index)
+
+    def speichern(self, verzeichnis):
+        """Werte als .npy und Achsen als JSON ins Verzeichnis schreiben."""
+        np.save(verzeichnis / 'werte.npy', self.werte)
+        with open(verzeichnis / 'achsen.json', 'w', encoding='utf-8') as f:
+            json.dump({'jahre': [int(j) for j in self.jahre], 'kantone': list(self.kantone),
+                       'zimmer': self.zimmer, 'groessen': self.groessen}, f, ensure_ascii=False)
+
+    @classmethod
+    def oeffnen(cls, verzeichnis):
+        """Gespeicherten Würfel öffnen; die Werte werden erst beim Zugriff gelesen (Memory-Mapping)."""
+        with open(verzeichnis / 'achsen.json', encoding='utf-8') as f:
+            achsen = json.load(f)
+        werte = np.load(verzeichnis / 'werte.npy', mmap_mode='r')
+        return cls(werte, achsen['jahre'], achsen['kantone'], achsen['zimmer'], achsen['groessen'])
+
+    def groesse(self, name='mietpreis'):
+        """Array (Jahre, Kantone, Zimmer) einer Grösse."""
+        return self.werte[..., self._groesse[name]]
+
+    def preis(self, zimmer='Total'):
+        """Mietpreise (Jahre, Kantone) einer Zimmerzahl."""
+        return self.werte[:, :, self._zimmer[zimmer], 0]
+
+    def jahr(self, jahr, name='mietpreis'):
+        """Array (Kantone, Zimmer) eines Jahres."""
+        return self.werte[self._jahr[jahr], :, :, self._groesse[name]]
+
+    def kanton(self, kanton, name='mietpreis'):
+        """Array (Jahre, Zimmer) eines Kantons."""
+        return self.werte[:, self._kanton[kanton], :, self._groesse[name]]
+
+    def wachstum(self, abstand=1):
+        """Relative Änderung der Mietpreise gegenüber ``abstand`` Jahre früher, Array (Jahre, Kantone, Zimmer).
+
+        Verglichen wird über die Jahreszahlen, nicht über die Position: fehlt ein Blatt
+        (z.B. 2020), ist das Wachstum 2021 gegenüber dem Vorjahr NaN und nicht die
+        Änderung über zwei Jahre. Ebenso NaN für die ersten ``abstand`` Jahre.
+        abstand muss mindestens 1 sein.
+        """
+        if abstand < 1:
+            raise ValueError('abstand muss mindestens 1 Jahr sein, nicht %r' % abstand)
+        preise = self.groesse()
+        # Position des Jahres jahr - abstand in self.jahre (aufsteigend), falls vorhanden
+        frueher = self.jahre - abstand
+        position = np.minimum(np.searchsorted(self.jahre, frueher), len(self.jahre) - 1)
+        vorhanden = self.jahre[position] == frueher
+        wachstum = np.full(preise.shape, np.nan)
+        wachstum[vorhanden] = preise[vorhanden] / preise[position[vorhanden]] - 1
+        return wachstum
+
+    def verhaeltnis(self, zimmer, bezug='Total'):
+        """Mietpreis einer Zimmerzahl geteilt durch den Mietpreis von ``bezug``, Array (Jahre, Kantone)."""
+        return self.preis(zimmer) / self.preis(bezug)
+
+    def rangliste(self, zimmer='Total'):
+        """Rang jedes Kantons pro Jahr (1: teuerster), Array (Jahre, Kantone); 0 für Schweiz und fehlende Werte."""
+        preise = np.array(self.preis(zimmer))
+        if SCHWEIZ in self._kanton:
+            preise[:, self._kanton[SCHWEIZ]] = np.nan
+        fehlt = np.isnan(preise)
+        reihenfolge = np.argsort(np.where(fehlt, np.inf, -preise), axis=1, kind='stable')
+        rang = np.empty_like(reihenfolge)
+        np.put_along_axis(rang, reihenfolge, np.arange(1, preise.shape[1] + 1)[None, :], axis=1)
+        return np.where(fehlt, 0, rang)
+
+    def tabelle(self, jahr, name='mietpreis'):
+        """DataFrame Kanton × Zimmer eines Jahres."""
+        return pd.DataFrame(self.jahr(jahr, name), index=pd.Index(self.kantone, name='Kanton'),
+                            columns=self.zimmer)
+
+
+def miet_wuerfel(pfad=DATEI_MIETPREISE):
+    """Würfel aller Jahresblätter; aus dem Zwischenspeicher oder einmal pro Datenstand berechnet."""
+    verzeichnis = speicher.cache_verzeichnis(pfad, 'wuerfel')
+    if not speicher.ist_aktuell(verzeichnis, pfad):
+        speicher.markiere_ungueltig(verzeichnis)
+        MietWuerfel.aus_blaettern(lade_blaetter(pfad, jahresblaetter(pfad))).speichern(verzeichnis)
+        speicher.markiere_aktuell(verzeichnis, pfad)
+    return MietWuerfel.oeffnen(verzeichnis)
@@ -0,0 +1,280 @@
+"""Die Beispiele als Pipeline: Laden → Umformen → Zeichnen, ohne Notebook.
+
+Die ``.py``-Files in den Beispielordnern sind Exporte der Notebooks: alles
+wird beim Import ausgeführt, die Filenamen sind fest und jede Grafik wird
+mit pyplot angezeigt. Für die Verwendung als Bibliothek, in einem Worker
+oder im Terminal gibt es zu jedem Beispiel ein Pipeline-Modul im Paket
+``datenvis.beispiele`` mit:
+
+    EINGABEN: Dictionary {Name: Standardpfad} der Datenfiles
+    laden(**pfade): liest die Datenfiles, gibt die Rohdaten zurück; Datenfiles
+                    aus ``datenvis.quellen.QUELLEN`` werden mit quellen.laden()
+                    gelesen und von ausfuehren() vorher gleichzeitig gestartet
+    umformen(daten): reine Datenverarbeitung, gibt ein Dictionary mit den
+                     Resultaten zurück
+    TABELLEN: Namen der Resultate (DataFrames), die als CSV gespeichert werden
+    ABBILDUNGEN: Liste von Abbildung(name, breite, hoehe, zeichnen, rc);
+                 zeichnen(fig, resultat) zeichnet in eine leere Figure
+    RC: rcParams für alle Grafiken des Moduls (z.B. Schriftgrösse)
+
+laden() und umformen() importieren Matplotlib nicht. Matplotlib wird erst
+importiert, wenn Grafiken gezeichnet werden; reine Datenverarbeitung startet
+so schneller und braucht weniger Speicher.
+
+Aufruf im Terminal (im obersten Ordner des Repositorys), z.B.:
+
+    python -m datenvis.beispiele.stromproduktion --out export/stromproduktion --format png svg
+    python -m datenvis.beispiele.korrelation --input produktion.csv --out resultate --nur-daten
+    python -m datenvis.beispiele.elektrizitaetsbilanz --profile
+    python -m datenvis.beispiele.mietpreis_karte --out karte --trace karte.json
+
+Mit ``--trace`` werden Zeit, CPU-Zeit und Speicher pro Stufe gemessen (siehe
+``datenvis.messung``); die Pipelines markieren dazu ihre Stufen.
+"""
+
+import argparse
+import cProfile
+import importlib
+import io
+import pstats
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import pandas as pd
+
+from . import quellen
+from .messung import MESSUNG, stufe
+
+BASIS = Path(__file__).resolve().parent.parent
+FORMATE = ('png', 'svg', 'pdf')
+
+Abbildung = namedtuple('Abbildung', ['name', 'breite', 'hoehe', 'zeichnen', 'rc'], defaults=(None,))
+Abbildung.__doc__ = """Eine Grafik einer Pipeline: Name (für den Filenamen), Grösse in Zoll,
+Zeichenfunktion zeichnen(fig, resultat) und optionale rcParams (ergänzen RC des Moduls).
+"""
+
+Lauf = namedtuple('Lauf', ['resultat', 'dateien', 'zeiten'])
+Lauf.__doc__ = """Resultat von ausfuehren(): Resultate von umformen(), geschriebene Files
+und Zeit pro Schritt in Sekunden ({'laden': ..., 'umformen': ..., <Grafik>: ...}).
+"""
+
+
+def modul(name):
+    """Pipeline-Modul aus datenvis.beispiele (z.B. 'stromproduktion') oder das Modul selbst."""
+    if isinstance(name, str):
+        return importlib.import_module(name if '.' in name else 'datenvis.beispiele.' + name)
+    return name
+
+
+def eingaben(pipeline, pfade=None):
+    """Pfade der Datenfiles: Standardpfade, ersetzt durch ``pfade``.
+
+    pfade: Dictionary {Name: Pfad} oder Liste; Einträge der Liste sind
+           'Name=Pfad' oder Pfade in der Reihenfolge von EINGABEN
+    """
+    pipeline = modul(pipeline)
+    resultat = dict(pipeline.EINGABEN)
+    if isinstance(pfade, dict):
+        pfade = ['%s=%s' % eintrag for eintrag in pfade.items()]
+    namen = list(pipeline.EINGABEN)
+    for i, eintrag in enumerate(pfade or []):
+        name, gleich, pfad = str(eintrag).partition('=')
+        if not gleich:
+            if i >= len(namen):
+                raise ValueError('%s braucht höchstens %d Eingaben' % (pipeline.__name__, len(namen)))
+            name, pfad = namen[i], eintrag
+        if name not in resultat:
+            raise ValueError('Unbekannte Eingabe %r (möglich: %s)' % (name, ', '.join(namen)))
+        resultat[name] = Path(pfad)
+    return resultat
+
+
+def vorladen(pipelines, pfade=None):
+    """Alle Datenfiles der Pipelines im Hintergrund laden (siehe datenvis.quellen); gibt {Name: Future} zurück.
+
+    Vor einem Lauf über mehrere Pipelines aufgerufen, werden die Files
+    gleichzeitig gelesen; jede Pipeline wartet dann in laden() auf ihre Daten.
+    pfade: Dictionary {Name: Pfad}, ersetzt die Standardpfade der Pipelines mit dieser Eingabe
+    """
+    starten = {}
+    for pipeline in pipelines:
+        pipeline = modul(pipeline)
+        eigene = {name: pfad for name, pfad in (pfade or {}).items() if name in pipeline.EINGABEN}
+        for name, pfad in eingaben(pipeline, eigene).items():
+            if name in quellen.QUELLEN:
+                starten[name] = pfad
+    return quellen.starten(starten)
+
+
+def tabellen_speichern(pipeline, resultat, ziel):
+    """Resultate aus TABELLEN als CSV-Files in den Ordner ziel schreiben; gibt die Pfade zurück."""
+    pipeline = modul(pipeline)
+    ziel = Path(ziel)
+    ziel.mkdir(parents=True, exist_ok=True)
+    dateien = []
+    for name in getattr(pipeline, 'TABELLEN', ()):
+        tabelle = resultat[name]
+        datei = ziel / (name + '.csv')
+        with stufe(datei.name, 'speichern'):
+            tabelle.to_csv(datei, index=not isinstance(tabelle.index, pd.RangeIndex))
+        dateien.append(datei)
+    return dateien
+
+
+def abbildung_zeichnen(pipeline, abbildung, resultat, verwaltung, dpi=None):
+    """Eine Abbildung in eine neue Figure der FigurenVerwaltung zeichnen; gibt die Figure zurück.
+
+    dpi: Auflösung, mit der die Figure gespeichert wird; beim Zeichnen als rcParams['savefig.dpi']
+         verfügbar (z.B. für die Wahl der Detailstufe einer Karte, siehe geodaten.karte())
+    """
+    import matplotlib
+
+    rc = dict(getattr(modul(pipeline), 'RC', {}))
+    rc.update(abbildung.rc or {})
+    if dpi is not None:
+        rc['savefig.dpi'] = dpi
+    with stufe(abbildung.name, 'zeichnen'), matplotlib.rc_context(rc):
+        fig = verwaltung.figur(abbildung.breite, abbildung.hoehe)
+        abbildung.zeichnen(fig, resultat)
+    return fig
+
+
+def figur_speichern(fig, ziel, name, formate=('png',), dpi=100):
+    """Figure in allen Formaten als ziel/<name>.<Format> speichern; gibt die Pfade zurück.
+
+    Matplotlib zeichnet die Figure erst beim Speichern; die Zeit dafür gehört
+    zur Stufe 'speichern'.
+    """
+    dateien = []
+    for fmt in formate:
+        datei = Path(ziel) / ('%s.%s' % (name, fmt))
+        with stufe(datei.name, 'speichern'):
+            fig.savefig(datei, format=fmt, dpi=dpi, bbox_inches='tight')
+        dateien.append(datei)
+    return dateien
+
+
+def abbildungen_speichern(pipeline, resultat, ziel, formate=('png',), dpi=100, namen=None, zeiten=None):
+    """Alle (oder die genannten) Abbildungen zeichnen und in allen Formaten speichern.
+
+    Die Figures werden ohne pyplot erstellt und nach dem Speichern in den
+    Pool der FigurenVerwaltung zurückgegeben. Gibt die Pfade zurück; die Zeit
+    pro Abbildung wird in ``zeiten`` eingetragen.
+    """
+    from .figuren import FigurenVerwaltung
+
+    pipeline = modul(pipeline)
+    ziel = Path(ziel)
+    ziel.mkdir(parents=True, exist_ok=True)
+    verwaltung = FigurenVerwaltung(pyplot=False)
+    dateien = []
+    for abbildung in pipeline.ABBILDUNGEN:
+        if namen is not None and abbildung.name not in namen:
+            continue
+        start = time.perf_counter()
+        fig = abbildung_zeichnen(pipeline, abbildung, resultat, verwaltung, dpi)
+        try:
+            dateien += figur_speichern(fig, ziel, abbildung.name, formate, dpi)
+        finally:
+            verwaltung.schliessen(fig)
+        if zeiten is not None:
+            zeiten[abbildung.name] = time.perf_counter() - start
+    return dateien
+
+
+def ausfuehren(pipeline, pfade=None, ziel=None, formate=('png',), grafiken=True, dpi=100):
+    """Pipeline ausführen: laden, umformen und (mit Ziel) Tabellen und Grafiken speichern.
+
+    pfade: Datenfiles (siehe eingaben()); ohne Angabe die Standardpfade
+    ziel: Ordner für CSV-Files und Grafiken; ohne Angabe wird nichts gespeichert
+    grafiken: False, um nur die Tabellen zu speichern (Matplotlib wird nicht importiert)
+    """
+    pipeline = modul(pipeline)
+    pfade = eingaben(pipeline, pfade)
+    zeiten = {}
+    dateien = []
+    name = pipeline.__spec__.name if pipeline.__spec__ else pipeline.__name__
+    with stufe(name.rpartition('.')[2]):
+        start = time.perf_counter()
+        with stufe('laden', 'laden'):
+            vorladen([pipeline], pfade)
+            daten = pipeline.laden(**pfade)
+        zeiten['laden'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with stufe('umformen'):
+            resultat = pipeline.umformen(daten)
+        zeiten['umformen'] = time.perf_counter() - start
+
+        if ziel is not None:
+            dateien += tabellen_speichern(pipeline, resultat, ziel)
+            if grafiken:
+                dateien += abbildungen_speichern(pipeline, resultat, ziel, formate, dpi, zeiten=zeiten)
+    return Lauf(resultat, dateien, zeiten)
+
+
+def _beschreibung(wert):
+    form = getattr(wert, 'shape', None)
+    if form is not None:
+        return '%s %s' % (type(wert).__name__, '×'.join(str(n) for n in form))
+    return type(wert).__name__
+
+
+def cli(pipeline, argumente=None):
+    """Kommandozeile einer Pipeline; gibt den Exit-Code zurück."""
+    pipeline = modul(pipeline)
+    namen = ', '.join(pipeline.EINGABEN) or 'keine'
+    name = pipeline.__spec__.name if pipeline.__spec__ else pipeline.__name__ # Bei -m heisst das Modul __main__
+    parser = argparse.ArgumentParser(prog='python -m ' + name,
+                                     description=(pipeline.__doc__ or '').strip().splitlines()[0])
+    parser.add_argument('--input', nargs='+', default=[], metavar='PFAD',
+                        help='Datenfiles als Pfad (in der Reihenfolge: %s) oder Name=Pfad' % namen)
+    parser.add_argument('--out', type=Path, default=None, metavar='ORDNER',
+                        help='Ordner für Tabellen (CSV) und Grafiken; ohne Angabe wird nur gerechnet')
+    parser.add_argument('--format', nargs='+', default=['png'], choices=FORMATE, dest='formate',
+                        help='Formate der Grafiken (Standard: png)')
+    parser.add_argument('--dpi', type=int, default=100, help='Auflösung für PNG (Standard: 100)')
+    parser.add_argument('--nur-daten', action='store_true', help='Keine Grafiken (Matplotlib wird nicht geladen)')
+    parser.add_argument('--profile', nargs='?', const='-', default=None, metavar='DATEI',
+                        help='Mit cProfile messen; Zusammenfassung ausgeben oder Statistik in DATEI speichern')
+    parser.add_argument('--trace', default=None, metavar='DATEI',
+                        help='Zeit, CPU-Zeit und Speicherspitze pro Stufe messen und als JSON '
+                             '(Chrome Trace Format, z.B. für Perfetto) in DATEI speichern')
+    args = parser.parse_args(argumente)
+    try:
+        pfade = eingaben(pipeline, args.input)
+    except ValueError as fehler:
+        parser.error(str(fehler))
+
+    profil = cProfile.Profile() if args.profile else None
+    if args.trace:
+        MESSUNG.starten()
+    if profil:
+        profil.enable()
+    try:
+        lauf = ausfuehren(pipeline, pfade, args.out, args.formate, not args.nur_daten, args.dpi)
+    finally:
+        if profil:
+            profil.disable()
+        MESSUNG.beenden()
+
+    for name, wert in lauf.resultat.items():
+        print('%-28s %s' % (name, _beschreibung(wert)))
+    for schritt, sekunden in lauf.zeiten.items():
+        print('%-28s %8.3f s' % (schritt, sekunden))
+    for datei in lauf.dateien:
+        print(datei)
+    if profil:
+        if args.profile == '-':
+            ausgabe = io.StringIO()
+            pstats.Stats(profil, stream=ausgabe).sort_stats('cumulative').print_stats(25)
+            print(ausgabe.getvalue(), file=sys.stderr)
+        else:
+            profil.dump_stats(args.profile)
+            print('Profil gespeichert:', args.profile, file=sys.stderr)
+    if args.trace:
+        print(MESSUNG.zusammenfassung(), file=sys.stderr)
+        print('Trace gespeichert:', MESSUNG.speichern(args.trace), file=sys.stderr)
+    return 0
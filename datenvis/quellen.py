@@ -0,0 +1,159 @@
+"""Datenquellen gleichzeitig laden: CSV-, Excel- und GeoJSON-Files.
+
+Ein Bericht über alle Beispiele braucht die Elektrizitätsbilanz, die
+Swissgrid-Produktion, die Mietpreise (Excel) und die Geodaten. Nacheinander
+geladen addieren sich die Zeiten, obwohl das Lesen grösstenteils auf die
+Festplatte wartet oder in C-Code läuft, der den GIL freigibt. Mit
+
+    starten({'produktion': pfad_csv, 'mietpreise': pfad_xlsx})
+    ...
+    df = laden('produktion', pfad_csv)
+
+werden alle Files sofort im Hintergrund gelesen; laden() wartet auf das
+Resultat (oder liest das File selbst, wenn es nicht gestartet wurde). Die
+Zeit bis alle Daten da sind ist dann etwa die Zeit des langsamsten Files.
+
+Jede Quelle in QUELLEN hat einen Namen (wie die Eingaben der Pipelines),
+eine Funktion zum Laden ('modul:funktion', wird erst bei Bedarf importiert)
+und die Angabe, ob in einem Thread oder einem eigenen Prozess geladen wird.
+Prozesse lohnen sich für Parser in reinem Python, die den GIL halten, z.B.
+openpyxl für Excel-Files. Die Prozesse werden mit ``forkserver`` (wo es das
+nicht gibt: ``spawn``) gestartet, nicht mit ``fork``: der Thread-Pool läuft
+dann meist schon, und ein mit fork kopierter Prozess kann an einer Sperre
+hängen bleiben, die gerade ein anderer Thread hielt (z.B. in pandas, pyarrow
+oder logging).
+
+In Worker-Prozessen kann quellen.verbinden() die Datensätze eines Brokers
+(``datenvis.broker``) eintragen; laden() liest sie dann aus dem gemeinsamen
+Speicher statt aus den Datenfiles.
+"""
+
+import importlib
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from .messung import stufe
+
+Quelle = namedtuple('Quelle', ['lader', 'prozess'])
+Quelle.__doc__ = """Datenquelle: lader 'modul:funktion' (Funktion mit dem Pfad als Argument),
+prozess True für Parser, die den GIL halten (in einem eigenen Prozess laden).
+"""
+
+QUELLEN = {
+    'bilanz': Quelle('datenvis.stromdaten:lade_bilanz', False),
+    'produktion': Quelle('datenvis.stromdaten:lade_produktion', False),
+    'mietpreise': Quelle('datenvis.mietpreise:lade_mietpreise', True),
+    'geodaten': Quelle('datenvis.geodaten:lade_kantone', False),
+}
+
+# False: alle Quellen in Threads laden (z.B. wenn schon in einem Worker-Prozess gearbeitet wird)
+PROZESSE = True
+
+# Gestartete Ladevorgänge {(Name, Pfad): Future} und die Pools (erst bei Bedarf erstellt)
+_LAUFEND = {}
+# Datensätze eines Brokers {(Name, Pfad): File}
+_GETEILT = {}
+_THREADS = None
+_PROZESSE = None
+
+
+def registrieren(name, lader, prozess=False):
+    """Quelle hinzufügen oder ersetzen; lader ist 'modul:funktion'."""
+    if ':' not in lader:
+        raise ValueError("lader muss 'modul:funktion' sein, nicht %r" % lader)
+    QUELLEN[name] = Quelle(lader, prozess)
+
+
+def _funktion(lader):
+    modulname, _, funktion = lader.partition(':')
+    return getattr(importlib.import_module(modulname), funktion)
+
+
+def _lesen(name, lader, pfad):
+    """Läuft im Thread oder Prozess: Funktion importieren und das File lesen."""
+    with stufe(name, 'laden'):
+        return _funktion(lader)(pfad)
+
+
+def schluessel(name, pfad):
+    """Schlüssel (Name, absoluter Pfad) eines Datensatzes."""
+    return name, str(Path(pfad).resolve())
+
+
+def _prozess_kontext():
+    """Startmethode der Worker-Prozesse: forkserver oder spawn, nie fork (siehe oben)."""
+    methode = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(methode)
+
+
+def _pool(prozess):
+    global _THREADS, _PROZESSE
+    if prozess and PROZESSE:
+        if _PROZESSE is None:
+            _PROZESSE = ProcessPoolExecutor(mp_context=_prozess_kontext())
+        return _PROZESSE
+    if _THREADS is None:
+        _THREADS = ThreadPoolExecutor(thread_name_prefix='quellen')
+    return _THREADS
+
+
+def starten(pfade):
+    """Alle Quellen {Name: Pfad} im Hintergrund laden; gibt {Name: Future} zurück.
+
+    Eine Quelle, die mit dem gleichen Pfad schon läuft oder geteilt ist, wird nicht noch einmal gestartet.
+    """
+    futures = {}
+    for name, pfad in pfade.items():
+        if name not in QUELLEN:
+            raise KeyError('Unbekannte Quelle %r (registriert: %s)' % (name, ', '.join(QUELLEN)))
+        eintrag = schluessel(name, pfad)
+        if eintrag in _GETEILT:
+            continue
+        if eintrag not in _LAUFEND:
+            quelle = QUELLEN[name]
+            _LAUFEND[eintrag] = _pool(quelle.prozess).submit(_lesen, name, quelle.lader, pfad)
+        futures[name] = _LAUFEND[eintrag]
+    return futures
+
+
+def laden(name, pfad):
+    """Quelle laden: geteilten Datensatz öffnen, auf den gestarteten Ladevorgang warten oder das File lesen.
+
+    Das Resultat wird nicht aufbewahrt; ein zweiter Aufruf liest das File neu.
+    """
+    eintrag = schluessel(name, pfad)
+    if eintrag in _GETEILT:
+        from .broker import lesen
+
+        with stufe(name + ' (geteilt)', 'laden'):
+            return lesen(_GETEILT[eintrag])
+    future = _LAUFEND.pop(eintrag, None)
+    if future is None:
+        return _lesen(name, QUELLEN[name].lader, pfad)
+    with stufe('warten auf ' + name):
+        return future.result()
+
+
+def alle_laden(pfade):
+    """Alle Quellen {Name: Pfad} gleichzeitig laden; gibt {Name: Daten} zurück."""
+    starten(pfade)
+    return {name: laden(name, pfad) for name, pfad in pfade.items()}
+
+
+def verbinden(katalog):
+    """Datensätze eines Brokers {(Name, Pfad): File} eintragen (z.B. als initializer eines Worker-Prozesses)."""
+    _GETEILT.update(katalog)
+
+
+def beenden():
+    """Nicht abgeholte Ladevorgänge abbrechen und die Pools schliessen."""
+    global _THREADS, _PROZESSE
+    for future in _LAUFEND.values():
+        future.cancel()
+    _LAUFEND.clear()
+    for pool in (_THREADS, _PROZESSE):
+        if pool is not None:
+            pool.shutdown()
+    _THREADS = _PROZESSE = None
@@ -0,0 +1,98 @@
+"""Small Multiples: eine Zeitreihe pro Subplot, untereinander mit gemeinsamer x-Achse.
+
+Das Raster mit Achsen, Linien und Legenden wird einmal erstellt. Neue Daten
+(z.B. nach der täglichen Aktualisierung) ersetzen nur die Daten der bestehenden
+Linien mit ``set_data``; Achsen, Beschriftungen und Legenden werden nicht neu
+erzeugt. Bleiben die Achsengrenzen gleich, zeichnet ``zeichnen()`` nur die
+Linien neu über ein gespeichertes Hintergrundbild (Blitting).
+"""
+
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+
+def serien_nach_gruppe(df, datum='Datum', gruppe='Energietraeger', wert='Produktion_GWh'):
+    """Langform-Daten in ein Dictionary {Gruppe: (Datum, Werte)} aufteilen (ein groupby)."""
+    zeit = pd.to_datetime(df[datum])
+    serien = {}
+    for name, index in df.groupby(gruppe, observed=True, sort=False).indices.items():
+        serien[name] = (zeit.to_numpy()[index], df[wert].to_numpy()[index])
+    return serien
+
+
+class SmallMultiples:
+    """Raster mit einem Subplot pro Zeitreihe.
+
+    namen: Namen der Zeitreihen in der Reihenfolge der Subplots
+    sharey: gleiche y-Achse für alle Subplots
+    """
+
+    def __init__(self, namen, figsize=(15, 20), sharey=False, xlabel='Datum', ylabel=None, fig=None):
+        self.namen = list(namen)
+        if fig is None:
+            fig = plt.figure(figsize=figsize)
+        self.fig = fig
+        self.axs = fig.subplots(len(self.namen), 1, sharex=True, sharey=sharey, squeeze=False)[:, 0]
+        self.linien = {}
+        self._legenden = []
+        self._hintergrund = None
+        self._zustand = None
+        for ax, name in zip(self.axs, self.namen):
+            (self.linien[name],) = ax.plot([], [], label=name)
+            ax.xaxis_date()
+            self._legenden.append(ax.legend(loc='upper left'))
+        self.axs[-1].set_xlabel(xlabel)
+        if ylabel:
+            fig.supylabel(ylabel)
+
+    def aktualisieren(self, serien, xlim=None, ylim=None):
+        """Daten der Linien ersetzen.
+
+        serien: Dictionary {Name: (Datum, Werte)}, z.B. von serien_nach_gruppe()
+        xlim, ylim: feste Achsengrenzen; ohne Angabe werden sie aus den Daten bestimmt
+
+        Gezeichnet wird erst beim nächsten Anzeigen oder Speichern der Grafik.
+        """
+        for name, (zeit, werte) in serien.items():
+            if name in self.linien:
+                self.linien[name].set_data(mdates.date2num(zeit), np.asarray(werte, dtype=float))
+        for ax in self.axs:
+            ax.relim()
+            ax.autoscale_view()
+        if xlim is not None:
+            self.axs[0].set_xlim(*(pd.Timestamp(x) for x in xlim))
+        if ylim is not None:
+            for ax in self.axs:
+                ax.set_ylim(*ylim)
+
+    def zeichnen(self):
+        """Grafik rendern.
+
+        Sind Achsengrenzen und Grösse seit dem letzten Aufruf gleich geblieben,
+        wird das gespeicherte Hintergrundbild (Achsen, Beschriftungen, Legenden)
+        wiederhergestellt und nur Linien und Legenden werden darüber gezeichnet.
+        """
+        canvas = self.fig.canvas
+        vordergrund = list(self.linien.values()) + self._legenden
+        zustand = (tuple(ax.get_xlim() + ax.get_ylim() for ax in self.axs), self.fig.bbox.bounds)
+        if self._hintergrund is None or zustand != self._zustand:
+            # Hintergrund ohne Linien und Legenden zeichnen und speichern
+            for artist in vordergrund:
+                artist.set_animated(True)
+            canvas.draw()
+            self._hintergrund = canvas.copy_from_bbox(self.fig.bbox)
+            self._zustand = zustand
+            for artist in vordergrund:
+                artist.set_animated(False)
+        else:
+            canvas.restore_region(self._hintergrund)
+        for artist in vordergrund:
+            artist.axes.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+
+    def speichern(self, pfad):
+        """Grafik als Bild speichern (z.B. nach jeder Aktualisierung)."""
+        self.zeichnen()
+        plt.imsave(pfad, np.asarray(self.fig.canvas.buffer_rgba()))
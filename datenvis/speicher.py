@@ -0,0 +1,47 @@
+"""Zwischenspeicher für abgeleitete Daten neben den Rohdaten.
+
+Abgeleitete Daten (z.B. Aggregationen) werden in einem Verzeichnis
+``<datenfile>.cache/<art>/`` neben dem Datenfile gespeichert. Eine kleine
+JSON-Datei hält Grösse und Änderungszeit des Datenfiles fest; ändert sich das
+Datenfile, ist der Zwischenspeicher ungültig.
+"""
+
+import json
+import os
+from pathlib import Path
+
+META_DATEI = 'quelle.json'
+
+
+def cache_verzeichnis(quelle, art):
+    """Verzeichnis für abgeleitete Daten der Art ``art`` zum Datenfile ``quelle``."""
+    quelle = Path(quelle)
+    return quelle.with_name(quelle.name + '.cache') / art
+
+
+def fingerabdruck(quelle):
+    """Grösse und Änderungszeit des Datenfiles."""
+    st = os.stat(quelle)
+    return {'datei': Path(quelle).name, 'groesse': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def ist_aktuell(verzeichnis, quelle):
+    """True, wenn der Zwischenspeicher zum aktuellen Stand des Datenfiles passt."""
+    meta = Path(verzeichnis) / META_DATEI
+    if not meta.exists():
+        return False
+    with open(meta, encoding='utf-8') as f:
+        return json.load(f) == fingerabdruck(quelle)
+
+
+def markiere_ungueltig(verzeichnis):
+    """Verzeichnis anlegen und vorhandenen Fingerabdruck entfernen (vor dem Neuschreiben)."""
+    verzeichnis = Path(verzeichnis)
+    verzeichnis.mkdir(parents=True, exist_ok=True)
+    (verzeichnis / META_DATEI).unlink(missing_ok=True)
+
+
+def markiere_aktuell(verzeichnis, quelle):
+    """Fingerabdruck schreiben; erst danach gilt der Zwischenspeicher als gültig."""
+    with open(Path(verzeichnis) / META_DATEI, 'w', encoding='utf-8') as f:
+        json.dump(fingerabdruck(quelle), f)
@@ -0,0 +1,221 @@
+"""Spektralanalyse und saisonale Zerlegung der Tageswerte aller Energieträger.
+
+Die Produktion wird einmal in eine Matrix Tage × Energieträger umgeordnet
+(eine Spalte pro Energieträger, ein Eintrag pro Kalendertag). Alle
+Berechnungen laufen danach gleichzeitig über alle Spalten:
+
+    - Periodogramm: Leistung pro Frequenz mit np.fft.rfft entlang der Tage;
+      die stärksten lokalen Maxima ergeben die dominanten Perioden
+      (z.B. 7 Tage für den Wochenzyklus, rund 365 Tage für den Jahreszyklus)
+    - Zerlegung: Trend als zentrierter gleitender Mittelwert (Faltung über
+      die FFT), Saisonkomponente als Mittelwert pro Phase (Tag der Woche bzw.
+      Tag des Jahres), Rest = Daten - Trend - Saison
+
+Es gibt keine Python-Schleife über Tage oder Energieträger.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .stromdaten import ENERGIETRAEGER
+
+Zerlegung = namedtuple('Zerlegung', ['trend', 'saison', 'rest'])
+Zerlegung.__doc__ = """Resultat von zerlegen(); alle Arrays haben die Form (Tage, Energieträger).
+
+trend: zentrierter gleitender Mittelwert über die längste Periode (NaN am Rand)
+saison: Dictionary {Periode: Saisonkomponente}, Mittelwert 0 über eine Periode
+rest: Daten - Trend - Summe der Saisonkomponenten
+"""
+
+
+def tagesmatrix(df, datum='Datum', gruppe='Energietraeger', wert='Produktion_GWh', namen=None):
+    """Langform-Daten als Matrix (Tage, Energieträger) mit einem Eintrag pro Kalendertag.
+
+    Fehlende Tage werden linear interpoliert (am Anfang und Ende mit dem
+    nächsten vorhandenen Wert aufgefüllt), damit die Abtastung gleichmässig ist.
+    Gibt (Tage, Matrix, Namen) zurück.
+    """
+    namen = list(namen or ENERGIETRAEGER)
+    breit = df.pivot_table(index=pd.to_datetime(df[datum]).dt.normalize(), columns=gruppe,
+                           values=wert, aggfunc='mean', observed=True)
+    tage = pd.date_range(breit.index.min(), breit.index.max(), freq='D')
+    breit = breit.reindex(index=tage, columns=namen)
+    breit = breit.interpolate(method='linear', limit_direction='both')
+    return tage, breit.to_numpy(dtype=float), namen
+
+
+def periodogramm(matrix, trend_entfernen=True, fenster=True):
+    """Periodogramm aller Spalten; gibt (Frequenzen in 1/Tag, Leistung (Frequenzen, Spalten)) zurück.
+
+    trend_entfernen: Gerade (Kleinste Quadrate) pro Spalte abziehen, sonst nur den Mittelwert
+    fenster: Hann-Fenster anwenden, damit starke Zyklen weniger in benachbarte Frequenzen streuen
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    n = matrix.shape[0]
+    t = np.arange(n, dtype=float)
+    if trend_entfernen:
+        b, a = np.polyfit(t, matrix, 1) # Eine Gerade pro Spalte in einem Aufruf
+        x = matrix - (a + np.outer(t, b))
+    else:
+        x = matrix - matrix.mean(axis=0)
+    w = np.hanning(n) if fenster else np.ones(n)
+
+    spektrum = np.fft.rfft(x * w[:, None], axis=0)
+    leistung = np.abs(spektrum) ** 2 / np.sum(w ** 2)
+    return np.fft.rfftfreq(n, d=1.0), leistung
+
+
+def dominante_perioden(frequenzen, leistung, namen, anzahl=3, min_periode=2.0):
+    """Die ``anzahl`` stärksten Perioden (lokale Maxima des Periodogramms) pro Spalte.
+
+    min_periode: kürzere Perioden (in Tagen) werden nicht berücksichtigt
+    Gibt ein DataFrame mit Energietraeger, Rang, Periode_Tage und Anteil
+    (Anteil der Leistung an der gesamten Leistung ohne Frequenz 0) zurück.
+    """
+    f = frequenzen[1:-1]
+    p = leistung[1:-1]
+    maximum = (p > leistung[:-2]) & (p >= leistung[2:]) & (f <= 1.0 / min_periode)[:, None]
+    kandidaten = np.where(maximum, p, -np.inf)
+
+    # Die stärksten Maxima pro Spalte (absteigend)
+    index = np.argsort(-kandidaten, axis=0)[:anzahl]
+    staerke = np.take_along_axis(kandidaten, index, axis=0)
+    anteil = staerke / leistung[1:].sum(axis=0)
+
+    spalte = np.broadcast_to(np.arange(len(namen)), index.shape)
+    rang = np.broadcast_to(np.arange(1, len(index) + 1)[:, None], index.shape)
+    gueltig = np.isfinite(staerke)
+    return pd.DataFrame({
+        'Energietraeger': np.asarray(namen)[spalte[gueltig]],
+        'Rang': rang[gueltig],
+        'Periode_Tage': 1.0 / f[index[gueltig]],
+        'Anteil': anteil[gueltig],
+    }).sort_values(['Energietraeger', 'Rang'], ignore_index=True)
+
+
+def _gewichte(periode):
+    """Gewichte des zentrierten gleitenden Mittelwerts über eine Periode.
+
+    Bei gerader Periode wird über periode + 1 Werte gemittelt, mit halbem
+    Gewicht an beiden Enden (2×p-Mittelwert), damit das Fenster zentriert ist.
+    """
+    if periode % 2:
+        return np.full(periode, 1.0 / periode)
+    gewichte = np.full(periode + 1, 1.0 / periode)
+    gewichte[[0, -1]] *= 0.5
+    return gewichte
+
+
+def gleitender_mittelwert(matrix, periode):
+    """Zentrierter gleitender Mittelwert über ``periode`` Tage für alle Spalten.
+
+    Die Faltung mit den Gewichten wird für alle Spalten gleichzeitig als
+    Produkt im Frequenzraum berechnet. Wo das Fenster über die Daten
+    hinausreicht oder NaN-Werte enthält, ist das Resultat NaN.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    gewichte = _gewichte(int(periode))
+    n, k = matrix.shape[0], len(gewichte)
+    laenge = n + k - 1
+    filter_ = np.fft.rfft(gewichte, laenge)[:, None]
+
+    def falten(x):
+        return np.fft.irfft(np.fft.rfft(x, laenge, axis=0) * filter_, laenge, axis=0)[k // 2:k // 2 + n]
+
+    gueltig = np.isfinite(matrix)
+    summe = falten(np.where(gueltig, matrix, 0.0))
+    abdeckung = falten(gueltig.astype(float)) # 1 wo das ganze Fenster gültige Werte hat
+    return np.where(abdeckung > 1.0 - 1e-9, summe, np.nan)
+
+
+def _phasenmittel(matrix, periode):
+    """Mittelwert pro Phase (Zeile modulo periode), zentriert auf Mittelwert 0, auf alle Zeilen übertragen."""
+    n, k = matrix.shape
+    perioden = -(-n // periode)
+    gefuellt = np.full((perioden * periode, k), np.nan)
+    gefuellt[:n] = matrix
+    profil = np.nanmean(gefuellt.reshape(perioden, periode, k), axis=0)
+    profil -= profil.mean(axis=0)
+    return np.tile(profil, (perioden, 1))[:n]
+
+
+def zerlegen(matrix, perioden=(7, 365)):
+    """Additive Zerlegung aller Spalten in Trend, Saisonkomponenten und Rest.
+
+    perioden: Perioden der Saisonkomponenten in Tagen; der Trend ist der
+              gleitende Mittelwert über die längste Periode. Vor dem
+              Mittelwert pro Phase einer Periode wird mit dem gleitenden
+              Mittelwert der nächstkürzeren Periode geglättet, damit z.B. der
+              Wochenzyklus nicht in das Jahresprofil eingeht.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    perioden = sorted(int(p) for p in perioden)
+    trend = gleitender_mittelwert(matrix, perioden[-1])
+    rest = matrix - trend
+
+    saison = {}
+    for i in range(len(perioden) - 1, -1, -1): # von der längsten zur kürzesten Periode
+        geglaettet = gleitender_mittelwert(rest, perioden[i - 1]) if i > 0 else rest
+        saison[perioden[i]] = _phasenmittel(geglaettet, perioden[i])
+        rest = rest - saison[perioden[i]]
+    return Zerlegung(trend, dict(sorted(saison.items())), rest)
+
+
+def _figur(fig, figsize):
+    """Gegebene Figure oder neue pyplot-Figure (pyplot wird erst hier importiert)."""
+    if fig is None:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=figsize)
+    return fig
+
+
+def zeichne_periodogramme(frequenzen, leistung, namen, perioden=None, figsize=(15, 20), fig=None):
+    """Periodogramm pro Energieträger als Small Multiples, x-Achse als Periode in Tagen (logarithmisch).
+
+    perioden: optionales DataFrame von dominante_perioden(); die Perioden werden markiert
+    fig: Figure, in die gezeichnet wird (ohne Angabe eine neue pyplot-Figure)
+    """
+    fig = _figur(fig, figsize)
+    axs = fig.subplots(len(namen), 1, sharex=True, squeeze=False)
+    periode = 1.0 / frequenzen[1:]
+    for i, (ax, name) in enumerate(zip(axs[:, 0], namen)):
+        ax.loglog(periode, leistung[1:, i], label=name)
+        if perioden is not None:
+            for p in perioden.loc[perioden['Energietraeger'] == name, 'Periode_Tage']:
+                ax.axvline(p, color='r', lw=1.0, ls='--')
+                ax.annotate('%.0f d' % p, (p, 1.0), xycoords=('data', 'axes fraction'),
+                            xytext=(3, -3), textcoords='offset points', va='top', color='r')
+        ax.legend(loc='upper left')
+    axs[-1, 0].set_xlabel('Periode [Tage]')
+    fig.supylabel('Leistung')
+    return fig
+
+
+def zeichne_zerlegung(tage, matrix, zerlegung, namen, figsize=(18, 20), fig=None):
+    """Zerlegung als Small Multiples: eine Zeile pro Energieträger, eine Spalte pro Komponente.
+
+    Spalten: Daten mit Trend, eine Spalte pro Saisonkomponente, Rest. Die
+    Saisonkomponenten werden über eine Periode (ab dem ersten Tag) gezeichnet.
+    fig: Figure, in die gezeichnet wird (ohne Angabe eine neue pyplot-Figure)
+    """
+    komponenten = ['Daten und Trend'] + ['Saison %d Tage' % p for p in zerlegung.saison] + ['Rest']
+    fig = _figur(fig, figsize)
+    axs = fig.subplots(len(namen), len(komponenten), squeeze=False, sharex='col')
+    for i, name in enumerate(namen):
+        zeile = axs[i]
+        zeile[0].plot(tage, matrix[:, i], lw=0.5, color='0.6')
+        zeile[0].plot(tage, zerlegung.trend[:, i], color='C0')
+        zeile[0].set_ylabel(name)
+        for ax, (periode, saison) in zip(zeile[1:-1], zerlegung.saison.items()):
+            ax.plot(np.arange(periode), saison[:periode, i], color='C1')
+        zeile[-1].plot(tage, zerlegung.rest[:, i], lw=0.5, color='C2')
+    for ax, titel in zip(axs[0], komponenten):
+        ax.set_title(titel)
+    for ax in axs[-1, 1:-1]:
+        ax.set_xlabel('Tag der Periode')
+    axs[-1, 0].set_xlabel('Datum')
+    axs[-1, -1].set_xlabel('Datum')
+    fig.supylabel('Stromproduktion [GWh]')
+    return fig
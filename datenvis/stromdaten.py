@@ -0,0 +1,34 @@
+"""Einlesen der Datensätze zur Stromproduktion in der Schweiz.
+
+Datenquellen (Bundesamt für Energie):
+
+    https://opendata.swiss/de/dataset/schweizerische-elektrizitatsstatistik-schweizerische-elektrizitatsbilanz-monatswerte
+    https://opendata.swiss/dataset/energiedashboard-ch-stromproduktion-swissgrid
+"""
+
+import pandas as pd
+
+DATEI_BILANZ = 'ogd35_schweizerische_elektrizitaetsbilanz_monatswerte.csv'
+DATEI_PRODUKTION = 'ogd104_stromproduktion_swissgrid.csv'
+
+# Energieträger im Swissgrid-Datensatz (Reihenfolge wie in den Subplots der Notebooks)
+ENERGIETRAEGER = ['Flusskraft', 'Kernkraft', 'Speicherkraft', 'Thermische', 'Photovoltaik', 'Wind']
+
+
+def lade_produktion(pfad=DATEI_PRODUKTION):
+    """Swissgrid-Produktion (Tageswerte) mit Datum als datetime und Energieträger als Kategorie."""
+    df = pd.read_csv(pfad, parse_dates=['Datum'])
+    df['Energietraeger'] = df['Energietraeger'].astype('category')
+    return df
+
+
+def lade_bilanz(pfad=DATEI_BILANZ):
+    """Elektrizitätsbilanz (Monatswerte) mit zusätzlicher Spalte Datum (Monatsanfang)."""
+    df = pd.read_csv(pfad)
+    df['Datum'] = pd.to_datetime(pd.DataFrame({'year': df['Jahr'], 'month': df['Monat'], 'day': 1}))
+    return df
+
+
+def bilanz_groessen(df):
+    """Alle Mengenspalten (in GWh) der Elektrizitätsbilanz."""
+    return [spalte for spalte in df.columns if spalte.endswith('_GWh')]
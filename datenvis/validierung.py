@@ -0,0 +1,157 @@
+"""Prüfung der Swissgrid-Zeitreihen auf Lücken, Duplikate und Ausreisser.
+
+Die Notebooks gehen davon aus, dass jeder Energieträger genau einen Wert pro
+Tag hat. Fehlende oder doppelte Tage verschieben die Zeitreihen gegeneinander,
+wenn sie nach Position verglichen werden (z.B. im Scatterplot). Die Prüfung
+läuft in einem vektorisierten Durchgang über die nach (Energieträger, Datum)
+sortierten Schlüssel:
+
+    - Lücken: Abstand zum vorherigen Tag desselben Energieträgers > 1
+    - Duplikate: gleicher Tag wie der vorherige Eintrag (der erste bleibt gültig)
+    - negative und fehlende Werte
+    - Zeilen ohne Datum oder Energieträger: lassen sich keiner Zeitreihe
+      zuordnen, werden als eigener Befund markiert und sonst nicht geprüft
+    - Ausreisser: |z| > z_grenze bezüglich Mittelwert und Standardabweichung
+      der vorangehenden ``fenster`` Werte desselben Energieträgers
+
+Die gleitenden Kennzahlen werden über kumulierte Summen berechnet, ohne
+Python-Schleife über Zeilen oder Gruppen.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+Pruefung = namedtuple('Pruefung', ['bericht', 'maske', 'luecken'])
+Pruefung.__doc__ = """Resultat von pruefe_produktion().
+
+bericht: ein Eintrag pro Energieträger mit Anzahl Zeilen, Lücken, Duplikaten usw.
+maske: ein Eintrag pro Zeile von df (gleicher Index) mit den gefundenen Problemen
+luecken: eine Zeile pro Lücke mit Energieträger, letztem Tag davor, nächstem Tag danach
+"""
+
+
+def pruefe_produktion(df, datum='Datum', gruppe='Energietraeger', wert='Produktion_GWh',
+                      fenster=30, z_grenze=4.0):
+    """Swissgrid-Produktion (Langform) prüfen; gibt eine Pruefung zurück."""
+    kategorien = df[gruppe].astype('category')
+    zeitpunkte = pd.to_datetime(df[datum])
+    # Ohne Datum oder Energieträger gibt es keinen Schlüssel (Code -1 bzw. NaT): diese Zeilen weglassen
+    ohne_schluessel = (kategorien.isna() | zeitpunkte.isna()).to_numpy()
+    behalten = np.flatnonzero(~ohne_schluessel)
+    n = len(behalten)
+    codes = kategorien.cat.codes.to_numpy()[behalten].astype(np.int64)
+    tage = zeitpunkte.to_numpy()[behalten].astype('datetime64[D]').astype(np.int64)
+    werte = df[wert].to_numpy(dtype=float)[behalten]
+
+    # Sortieren nach (Energieträger, Tag) über einen kombinierten Schlüssel
+    tag0 = tage.min() if n else 0
+    schluessel = codes * (tage.max() - tag0 + 2 if n else 1) + (tage - tag0)
+    if n and np.all(schluessel[1:] >= schluessel[:-1]):
+        ordnung = np.arange(n)
+    else:
+        ordnung = np.argsort(schluessel, kind='stable')
+    c, t, v = codes[ordnung], tage[ordnung], werte[ordnung]
+
+    gleiche_gruppe = np.zeros(n, dtype=bool)
+    gleiche_gruppe[1:] = c[1:] == c[:-1]
+    abstand = np.zeros(n, dtype=np.int64)
+    abstand[1:] = t[1:] - t[:-1]
+
+    duplikat = gleiche_gruppe & (abstand == 0)
+    luecke = gleiche_gruppe & (abstand > 1)
+    fehlend = np.isnan(v)
+    negativ = v < 0
+    z = _gleitender_z(v, gleiche_gruppe, fenster)
+    with np.errstate(invalid='ignore'):
+        ausreisser = np.abs(z) > z_grenze
+
+    # Maske zurück in die Reihenfolge von df, Zeilen ohne Schlüssel nur mit ihrem eigenen Befund
+    zeile = behalten[ordnung]
+
+    def zurueck(spalte, leer=False):
+        alle = np.full(len(df), leer, dtype=spalte.dtype)
+        alle[zeile] = spalte
+        return alle
+    maske = pd.DataFrame({
+        'duplikat': zurueck(duplikat), 'luecke_davor': zurueck(luecke), 'fehlend': zurueck(fehlend),
+        'negativ': zurueck(negativ), 'ausreisser': zurueck(ausreisser), 'ohne_schluessel': ohne_schluessel,
+        'z': zurueck(z, np.nan),
+    }, index=df.index)
+    maske['ok'] = ~(maske['duplikat'] | maske['fehlend'] | maske['negativ'] | maske['ausreisser']
+                    | maske['ohne_schluessel'])
+
+    namen = np.asarray(kategorien.cat.categories)
+    i = np.flatnonzero(luecke)
+    luecken = pd.DataFrame({
+        gruppe: namen[c[i]],
+        'letzter_tag': t[i - 1].astype('datetime64[D]'),
+        'naechster_tag': t[i].astype('datetime64[D]'),
+        'fehlende_tage': abstand[i] - 1,
+    })
+
+    # Bericht pro Energieträger: Zählen mit bincount, erster/letzter Tag aus den Gruppengrenzen
+    def zaehlen(gewichte=None):
+        return np.bincount(c, weights=gewichte, minlength=len(namen)).astype(np.int64)
+    start = np.flatnonzero(~gleiche_gruppe)
+    ende = np.append(start[1:], n)[:len(start)] - 1
+    vorhanden = c[start]
+    bericht = pd.DataFrame({
+        'zeilen': zaehlen(),
+        'luecken': zaehlen(luecke),
+        'fehlende_tage': zaehlen(np.where(luecke, abstand - 1, 0)),
+        'duplikate': zaehlen(duplikat),
+        'fehlende_werte': zaehlen(fehlend),
+        'negative_werte': zaehlen(negativ),
+        'ausreisser': zaehlen(ausreisser),
+    }, index=pd.Index(namen, name=gruppe)).iloc[vorhanden]
+    bericht.insert(1, 'erster_tag', t[start].astype('datetime64[D]'))
+    bericht.insert(2, 'letzter_tag', t[ende].astype('datetime64[D]'))
+    return Pruefung(bericht, maske, luecken)
+
+
+def _gleitender_z(v, gleiche_gruppe, fenster):
+    """z-Wert jedes Eintrags bezüglich der vorangehenden ``fenster`` Werte seiner Gruppe.
+
+    NaN, wenn weniger als fenster // 2 Werte im Fenster liegen oder die
+    Standardabweichung 0 ist.
+    """
+    anzahl, mittel, std = gleitende_kennzahlen(v, gleiche_gruppe, fenster)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = (v - mittel) / std
+    z[(anzahl < max(fenster // 2, 2)) | ~(std > 1e-12) | np.isnan(v)] = np.nan
+    return z
+
+
+def gleitende_kennzahlen(v, gleiche_gruppe, fenster):
+    """Anzahl, Mittelwert und Standardabweichung der vorangehenden ``fenster`` Werte jeder Zeile.
+
+    v: Werte, nach Gruppe und Zeit sortiert (NaN zählt nicht)
+    gleiche_gruppe: True, wenn die Zeile zur gleichen Gruppe gehört wie die vorherige
+
+    Mittelwert und Varianz werden aus kumulierten Summen berechnet; der Anfang
+    des Fensters wird am Beginn der Gruppe abgeschnitten. Mittelwert und
+    Standardabweichung sind NaN, wenn das Fenster leer ist.
+    """
+    n = len(v)
+    gueltig = ~np.isnan(v)
+    # Werte zentrieren, damit die kumulierten Quadrate genau bleiben
+    zentrum = np.nanmean(v) if gueltig.any() else 0.0
+    x = np.where(gueltig, v - zentrum, 0.0)
+
+    s1 = np.concatenate(([0.0], np.cumsum(x)))
+    s2 = np.concatenate(([0.0], np.cumsum(x * x)))
+    k = np.concatenate(([0], np.cumsum(gueltig)))
+
+    # Erste Zeile der Gruppe für jede Zeile
+    start = np.flatnonzero(~gleiche_gruppe)
+    gruppenstart = start[np.searchsorted(start, np.arange(n), side='right') - 1] if n else start
+
+    ende = np.arange(n)  # Fenster endet vor der aktuellen Zeile
+    anfang = np.maximum(ende - fenster, gruppenstart)
+    anzahl = k[ende] - k[anfang]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mittel = (s1[ende] - s1[anfang]) / anzahl
+        varianz = (s2[ende] - s2[anfang]) / anzahl - mittel ** 2
+    return anzahl, mittel + zentrum, np.sqrt(np.maximum(varianz, 0.0))
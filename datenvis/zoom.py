@@ -0,0 +1,192 @@
+"""Mehrstufiger Min/Max-Speicher für schnelles Zoomen in langen Zeitreihen.
+
+Eine Zeitreihe wird einmal in Stufen mit Zweierpotenz-Auflösung zerlegt:
+Stufe 0 sind die Rohdaten, in Stufe k fasst jeder Eintrag 2**k aufeinander
+folgende Datenpunkte zusammen (Minimum, Maximum, Summe, Anzahl). Zum Zeichnen
+wird die gröbste Stufe gewählt, die im sichtbaren Bereich noch mindestens einen
+Eintrag pro Pixel liefert. Minimum und Maximum jedes Eintrags werden als
+senkrechter Strich gezeichnet; so bleiben Spitzen sichtbar, obwohl nur etwa
+zwei Punkte pro Pixel gezeichnet werden.
+
+ZoomAnsicht verbindet den Speicher mit einer Matplotlib-Achse: bei jeder
+Änderung der x-Achse (Zoomen, Verschieben, set_xlim) werden nur die Daten der
+bestehenden Linien ersetzt.
+
+Die Zeitpunkte sind Matplotlib-Datumszahlen: Tage seit einer Epoche
+(``rcParams['date.epoch']``, seit Matplotlib 3.3 1970-01-01, vorher
+0001-01-01). Der gespeicherte Speicher enthält deshalb die Epoche, mit der
+er berechnet wurde; beim Laden werden die Zeitpunkte auf die aktuelle
+Epoche umgerechnet.
+"""
+
+import matplotlib.dates as mdates
+import numpy as np
+
+from . import speicher
+from .stromdaten import DATEI_PRODUKTION, lade_produktion
+
+EPOCHE_STANDARD = '1970-01-01T00:00:00'
+
+
+class ZoomPyramide:
+    """Min/Max/Mittelwert-Stufen einer Zeitreihe.
+
+    zeit: aufsteigend sortierte Zeitpunkte als Matplotlib-Datumszahlen (Tage)
+    werte: Werte der Zeitreihe (NaN für fehlende Werte)
+    epoche: Epoche der Datumszahlen (Standard: die aktuelle von Matplotlib)
+    """
+
+    def __init__(self, zeit, werte, epoche=None):
+        self.epoche = mdates.get_epoch() if epoche is None else epoche
+        zeit = np.asarray(zeit, dtype=float)
+        werte = np.asarray(werte, dtype=float)
+        gueltig = ~np.isnan(werte)
+        self.stufen = [{
+            'von': zeit, 'bis': zeit,
+            'min': werte, 'max': werte,
+            'summe': np.where(gueltig, werte, 0.0), 'anzahl': gueltig.astype(np.int64),
+        }]
+        while len(self.stufen[-1]['von']) > 1:
+            self.stufen.append(_halbieren(self.stufen[-1]))
+
+    @classmethod
+    def aus_stufen(cls, stufen, epoche=None):
+        pyramide = cls.__new__(cls)
+        pyramide.stufen = stufen
+        pyramide.epoche = mdates.get_epoch() if epoche is None else epoche
+        return pyramide
+
+    def __len__(self):
+        return len(self.stufen[0]['von'])
+
+    def wertebereich(self):
+        """Minimum und Maximum der ganzen Zeitreihe."""
+        oben = self.stufen[-1]
+        return float(oben['min'][0]), float(oben['max'][0])
+
+    def zeitbereich(self):
+        return float(self.stufen[0]['von'][0]), float(self.stufen[0]['bis'][-1])
+
+    def abfrage(self, x0, x1, pixel):
+        """Einträge im Bereich [x0, x1] für eine Darstellung mit ``pixel`` Pixeln Breite.
+
+        Gibt die Stufe sowie Zeitpunkt (Mitte des Eintrags), Minimum, Maximum
+        und Mittelwert der Einträge zurück. Je ein Eintrag links und rechts
+        ausserhalb des Bereichs wird mitgeliefert, damit die Linie am Rand
+        nicht abbricht.
+        """
+        roh = self.stufen[0]
+        i0 = max(np.searchsorted(roh['von'], x0, side='left') - 1, 0)
+        i1 = min(np.searchsorted(roh['von'], x1, side='right') + 1, len(roh['von']))
+        punkte = max(i1 - i0, 1)
+
+        # Gröbste Stufe mit mindestens einem Eintrag pro Pixel
+        k = int(np.floor(np.log2(max(punkte / max(pixel, 1), 1))))
+        k = min(k, len(self.stufen) - 1)
+        s = self.stufen[k]
+        j0, j1 = i0 >> k, ((i1 - 1) >> k) + 1
+
+        anzahl = s['anzahl'][j0:j1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mittel = s['summe'][j0:j1] / anzahl
+        mitte = (s['von'][j0:j1] + s['bis'][j0:j1]) / 2
+        return k, mitte, s['min'][j0:j1], s['max'][j0:j1], mittel
+
+    def speichern(self, pfad):
+        arrays = {f'{name}_{k}': s[name] for k, s in enumerate(self.stufen) for name in s}
+        np.savez(pfad, epoche=np.array(self.epoche), **arrays)
+
+    @classmethod
+    def laden(cls, pfad):
+        """Gespeicherte Pyramide; die Zeitpunkte werden auf die aktuelle Epoche von Matplotlib umgerechnet."""
+        with np.load(pfad) as npz:
+            # Files ohne Epoche stammen von Matplotlib >= 3.3 mit der Standard-Epoche
+            epoche = str(npz['epoche']) if 'epoche' in npz.files else EPOCHE_STANDARD
+            anzahl_stufen = 1 + max(int(name.rsplit('_', 1)[1]) for name in npz.files if name != 'epoche')
+            stufen = [{name: npz[f'{name}_{k}'] for name in ('von', 'bis', 'min', 'max', 'summe', 'anzahl')}
+                      for k in range(anzahl_stufen)]
+        # Datumszahl der gespeicherten Epoche in der aktuellen Epoche = Verschiebung in Tagen
+        verschiebung = mdates.date2num(np.datetime64(epoche))
+        if verschiebung:
+            for s in stufen:
+                s['von'], s['bis'] = s['von'] + verschiebung, s['bis'] + verschiebung
+        return cls.aus_stufen(stufen)
+
+
+def _halbieren(s):
+    """Je zwei benachbarte Einträge einer Stufe zusammenfassen."""
+    n = len(s['von'])
+    gerade = n - n % 2
+    def paare(a, op):
+        neu = op(a[0:gerade:2], a[1:gerade:2])
+        return np.append(neu, a[-1:]) if n % 2 else neu
+    with np.errstate(invalid='ignore'):
+        return {
+            'von': paare(s['von'], np.minimum),
+            'bis': paare(s['bis'], np.maximum),
+            'min': paare(s['min'], np.fmin),
+            'max': paare(s['max'], np.fmax),
+            'summe': paare(s['summe'], np.add),
+            'anzahl': paare(s['anzahl'], np.add),
+        }
+
+
+def zoom_produktion(pfad=DATEI_PRODUKTION):
+    """ZoomPyramide pro Energieträger; wird einmal pro Datenstand berechnet und gespeichert."""
+    verzeichnis = speicher.cache_verzeichnis(pfad, 'zoom')
+    if speicher.ist_aktuell(verzeichnis, pfad):
+        return {datei.stem: ZoomPyramide.laden(datei) for datei in sorted(verzeichnis.glob('*.npz'))}
+
+    speicher.markiere_ungueltig(verzeichnis)
+    df = lade_produktion(pfad).sort_values(['Energietraeger', 'Datum'])
+    pyramiden = {}
+    for traeger, gruppe in df.groupby('Energietraeger', observed=True):
+        pyramiden[traeger] = ZoomPyramide(mdates.date2num(gruppe['Datum']), gruppe['Produktion_GWh'])
+        pyramiden[traeger].speichern(verzeichnis / f'{traeger}.npz')
+    speicher.markiere_aktuell(verzeichnis, pfad)
+    return pyramiden
+
+
+class ZoomAnsicht:
+    """Zeichnet eine ZoomPyramide in eine Achse und aktualisiert sie beim Zoomen.
+
+    Es werden zwei Linien angelegt: das Min/Max-Band (senkrechte Striche pro
+    Eintrag) und der Mittelwert. Bei ``xlim_changed`` wird die passende Stufe
+    abgefragt und nur die Daten der Linien werden ersetzt.
+
+    Matplotlib hält Callbacks nur schwach referenziert: die Ansicht muss in
+    einer Variablen gespeichert bleiben, solange die Grafik benutzt wird.
+    """
+
+    def __init__(self, ax, pyramide, label=None, color=None):
+        self.ax = ax
+        self.pyramide = pyramide
+        (self.mittel,) = ax.plot([], [], color=color, lw=1.0, label=label)
+        (self.band,) = ax.plot([], [], color=self.mittel.get_color(), lw=1.0, alpha=0.35)
+        ax.xaxis_date()
+        self.stufe = None
+
+        x0, x1 = pyramide.zeitbereich()
+        y0, y1 = pyramide.wertebereich()
+        rand = 0.05 * (y1 - y0 or 1.0)
+        ax.set_ylim(y0 - rand, y1 + rand)
+        self.verbindung = ax.callbacks.connect('xlim_changed', self.aktualisieren)
+        ax.set_xlim(x0, x1)
+
+    def aktualisieren(self, ax=None):
+        x0, x1 = self.ax.get_xlim()
+        pixel = int(self.ax.bbox.width) or 1
+        self.stufe, mitte, minimum, maximum, mittel = self.pyramide.abfrage(x0, x1, pixel)
+
+        # Min/Max als senkrechte Striche, getrennt durch NaN
+        n = len(mitte)
+        bx = np.empty(3 * n)
+        by = np.empty(3 * n)
+        bx[0::3] = bx[1::3] = mitte
+        bx[2::3] = np.nan
+        by[0::3], by[1::3], by[2::3] = minimum, maximum, np.nan
+        self.band.set_data(bx, by)
+        self.mittel.set_data(mitte, mittel)
+
+    def trennen(self):
+        self.ax.callbacks.disconnect(self.verbindung)
@@ -0,0 +1,63 @@
+import pytest
+
+from datenvis.kantone import KANTONE
+from datenvis.mietpreise import MIETPREIS, ZIMMER
+
+KANTONSNAMEN = [kanton.namen[0] for kanton in KANTONE]
+
+
+def mietpreis(jahr, kanton, zimmer):
+    """Mietpreis der Testdaten: 2 % Wachstum pro Jahr ab 2019."""
+    return (1000 + 10 * kanton) * (1 + 0.25 * zimmer) * 1.02 ** (jahr - 2019)
+
+
+def mietpreise_excel(pfad, jahre, fehlt=None):
+    """Excel-File im Aufbau des BFS: ein Blatt pro Jahr mit Titel, zwei Kopfzeilen, Schweiz, Kantonen
+    und Fussnoten. fehlt: {Jahr: Kanton}, der in diesem Blatt fehlt."""
+    from openpyxl import Workbook
+
+    mappe = Workbook()
+    mappe.remove(mappe.active)
+    for jahr in sorted(jahre, reverse=True):
+        blatt = mappe.create_sheet(str(jahr))
+        blatt.append(['Durchschnittlicher Mietpreis in Franken nach Zimmerzahl und Kanton, %d' % jahr])
+        blatt.append([])
+        blatt.append([None] + sum([[zimmer, None] for zimmer in ZIMMER], []))
+        blatt.append([None] + [MIETPREIS, '± (in Fr.)'] * len(ZIMMER))
+        for i, name in enumerate(['Schweiz'] + KANTONSNAMEN):
+            if (fehlt or {}).get(jahr) == name:
+                continue
+            blatt.append([name] + sum([[mietpreis(jahr, i, z), 10.0 + z] for z in range(len(ZIMMER))], []))
+        blatt.append(['Fussnote: Erläuterung zur Erhebung'])
+    mappe.save(pfad)
+    return pfad
+
+
+@pytest.fixture
+def mietpreise_datei(tmp_path):
+    """Mietpreise 2019 bis 2023 ohne das Blatt 2021; Jura fehlt 2019."""
+    return mietpreise_excel(tmp_path / 'je-d-09.03.03.01.xlsx', [2019, 2020, 2022, 2023], fehlt={2019: 'Jura'})
+
+
+def produktion_csv(pfad, tage=730):
+    """Swissgrid-Produktion (Langform) mit Jahresgang und Rauschen für alle Energieträger."""
+    import numpy as np
+    import pandas as pd
+
+    from datenvis.stromdaten import ENERGIETRAEGER
+
+    rng = np.random.default_rng(0)
+    datum = pd.date_range('2022-01-01', periods=tage, freq='D')
+    jahresgang = np.sin(2 * np.pi * np.arange(tage) / 365.25)
+    teile = [pd.DataFrame({'Datum': datum, 'Energietraeger': traeger,
+                           'Produktion_GWh': (20 + 5 * i + 8 * jahresgang * (-1) ** i
+                                              + rng.normal(scale=1.0, size=tage)).round(1)})
+             for i, traeger in enumerate(ENERGIETRAEGER)]
+    pd.concat(teile).sort_values(['Datum', 'Energietraeger']).to_csv(pfad, index=False)
+    return pfad
+
+
+@pytest.fixture
+def produktion_datei(tmp_path):
+    """Zwei Jahre Tageswerte der Produktion (Kopie in tmp_path)."""
+    return produktion_csv(tmp_path / 'ogd104_stromproduktion_swissgrid.csv')
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from datenvis.abfrage import Abfrage, spaltenspeicher_produktion  # noqa: E402
+from datenvis.stromdaten import ENERGIETRAEGER, lade_produktion  # noqa: E402
+
+
+@pytest.fixture
+def speicher(produktion_datei):
+    return spaltenspeicher_produktion(produktion_datei, zeilen_pro_gruppe=1024)
+
+
+def test_partitionen(speicher, produktion_datei):
+    teile = sorted(p.relative_to(speicher / 'daten').parent.as_posix()
+                   for p in (speicher / 'daten').rglob('*.parquet'))
+    assert len(teile) == len(ENERGIETRAEGER) * 2
+    assert 'Energietraeger=Wind/Jahr=2023' in teile
+    # zweiter Aufruf verwendet den bestehenden Speicher
+    zeit = max(p.stat().st_mtime_ns for p in (speicher / 'daten').rglob('*.parquet'))
+    assert spaltenspeicher_produktion(produktion_datei) == speicher
+    assert max(p.stat().st_mtime_ns for p in (speicher / 'daten').rglob('*.parquet')) == zeit
+
+
+def test_filter_oeffnet_nur_passende_teile(speicher):
+    assert Abfrage(speicher).erklaeren() == {'files_gelesen': 12, 'files_total': 12}
+    abfrage = Abfrage(speicher).traeger('Photovoltaik', 'Wind').zeitraum('2023-03-01', '2023-05-31')
+    assert abfrage.erklaeren() == {'files_gelesen': 2, 'files_total': 12}
+    assert Abfrage(speicher).zeitraum(bis='2022-12-31').erklaeren()['files_gelesen'] == 6
+
+
+def test_lesen_wie_pandas(speicher, produktion_datei):
+    df = lade_produktion(produktion_datei)
+    abfrage = Abfrage(speicher).traeger('Photovoltaik', 'Wind').zeitraum('2022-12-20', '2023-01-10')
+    erwartet = df[df['Energietraeger'].isin(['Photovoltaik', 'Wind'])
+                  & df['Datum'].between('2022-12-20', '2023-01-10')]
+    resultat = abfrage.lesen()
+    assert len(resultat) == 2 * 22
+    pd.testing.assert_frame_equal(
+        resultat.astype({'Energietraeger': str}),
+        erwartet.astype({'Energietraeger': str}).sort_values(['Energietraeger', 'Datum'], ignore_index=True)
+        [['Datum', 'Energietraeger', 'Produktion_GWh']],
+        check_dtype=False)
+
+
+def test_aufloesung_und_aggregation(speicher, produktion_datei):
+    df = lade_produktion(produktion_datei)
+    resultat = Abfrage(speicher).traeger('Kernkraft').aufloesung('MS').aggregieren('max').lesen()
+    erwartet = df[df['Energietraeger'] == 'Kernkraft'].resample('MS', on='Datum')['Produktion_GWh'].max()
+    assert len(resultat) == 24
+    assert resultat['Produktion_GWh'].tolist() == pytest.approx(erwartet.tolist())
+    assert (resultat['Datum'].to_numpy() == erwartet.index.to_numpy()).all()
+
+
+def test_abfrage_unveraendert(speicher):
+    basis = Abfrage(speicher)
+    gefiltert = basis.traeger('Wind').zeitraum('2023-01-01').aufloesung('W')
+    assert basis.filter() is None and basis._freq is None
+    assert gefiltert._traeger == ['Wind'] and gefiltert._bis is None
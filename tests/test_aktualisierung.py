@@ -0,0 +1,73 @@
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from datenvis.aktualisierung import Datensatz, aktualisieren
+
+
+class Handler(SimpleHTTPRequestHandler):
+    """Liefert Files aus dem Verzeichnis des Servers; /abbruch bricht die Übertragung nach einem Teil ab."""
+
+    def do_GET(self):
+        if self.path == '/abbruch':
+            self.send_response(200)
+            self.send_header('Content-Length', str(1 << 20))
+            self.end_headers()
+            self.wfile.write(b'x' * 1000)
+            self.close_connection = True
+            return
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Lokaler HTTP-Server für das Verzeichnis tmp_path/server; gibt (Verzeichnis, Basis-URL) zurück."""
+    verzeichnis = tmp_path / 'server'
+    verzeichnis.mkdir()
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), partial(Handler, directory=str(verzeichnis)))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield verzeichnis, 'http://127.0.0.1:%d' % httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_neu_unveraendert_aktualisiert(server, tmp_path):
+    verzeichnis, url = server
+    quelle = verzeichnis / 'daten.csv'
+    quelle.write_text('a,b\n1,2\n')
+    datensatz = Datensatz('daten', url + '/daten.csv', tmp_path / 'lokal' / 'daten.csv')
+
+    [ergebnis] = aktualisieren([datensatz])
+    assert ergebnis.status == 'neu', ergebnis.meldung
+    assert datensatz.datei.read_text() == 'a,b\n1,2\n'
+
+    # Gleiches File auf dem Server: Antwort 304, nichts übertragen
+    [ergebnis] = aktualisieren([datensatz])
+    assert (ergebnis.status, ergebnis.groesse) == ('unveraendert', 0)
+
+    quelle.write_text('a,b\n1,2\n3,4\n')
+    zeit = quelle.stat().st_mtime + 10
+    os.utime(quelle, (zeit, zeit))
+    [ergebnis] = aktualisieren([datensatz])
+    assert ergebnis.status == 'aktualisiert', ergebnis.meldung
+    assert datensatz.datei.read_text() == 'a,b\n1,2\n3,4\n'
+
+
+@pytest.mark.parametrize('pfad', ['/abbruch', '/fehlt.csv'])
+def test_fehler_laesst_altes_file_stehen(server, tmp_path, pfad):
+    _, url = server
+    datei = tmp_path / 'lokal' / 'daten.csv'
+    datei.parent.mkdir()
+    datei.write_text('alt\n')
+
+    [ergebnis] = aktualisieren([Datensatz('daten', url + pfad, datei)], timeout=5)
+    assert ergebnis.status == 'fehler'
+    assert datei.read_text() == 'alt\n'
+    assert not datei.with_name(datei.name + '.part').exists()
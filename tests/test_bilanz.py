@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from datenvis.bilanz import BilanzWuerfel, bilanz_wuerfel
+
+
+def monatswerte(jahre, monate_im_letzten_jahr=12):
+    """Bilanz mit Einfuhr = 100 * Jahr + Monat und Ausfuhr = 10 * Monat."""
+    zeilen = [(jahr, monat) for jahr in jahre for monat in range(1, 13)
+              if jahr < jahre[-1] or monat <= monate_im_letzten_jahr]
+    df = pd.DataFrame(zeilen, columns=['Jahr', 'Monat'])
+    df['Definitiv'] = 1
+    df['Einfuhr_GWh'] = 100.0 * df['Jahr'] + df['Monat']
+    df['Ausfuhr_GWh'] = 10.0 * df['Monat']
+    return df
+
+
+@pytest.fixture
+def wuerfel():
+    # Zeilen gemischt: die Reihenfolge im File spielt keine Rolle
+    return BilanzWuerfel(monatswerte([2020, 2021, 2022], monate_im_letzten_jahr=3).sample(frac=1, random_state=0))
+
+
+def test_aufbau(wuerfel):
+    assert wuerfel.jahre.tolist() == [2020, 2021, 2022]
+    assert wuerfel.groessen == ['Einfuhr_GWh', 'Ausfuhr_GWh']
+    assert wuerfel.werte.shape == (3, 12, 2)
+    assert wuerfel.gueltig.sum() == 27
+    assert np.isnan(wuerfel.jahr(2022, 'Einfuhr_GWh')[3:]).all()
+    assert wuerfel.vollstaendige_jahre().tolist() == [True, True, False]
+
+
+def test_auswahl(wuerfel):
+    assert wuerfel.monat(2, 'Einfuhr_GWh').tolist() == [202002.0, 202102.0, 202202.0]
+    assert wuerfel.jahr(2021).shape == (12, 2)
+    assert wuerfel.jahr(2021, 'Ausfuhr_GWh')[11] == 120.0
+    assert wuerfel.groesse('Ausfuhr_GWh').shape == (3, 12)
+
+
+def test_auswertungen(wuerfel):
+    summe = wuerfel.jahressumme('Ausfuhr_GWh')
+    assert summe[:2].tolist() == [780.0, 780.0] and np.isnan(summe[2])
+    profil = wuerfel.saisonprofil('Einfuhr_GWh')
+    assert profil[0] == pytest.approx(202101.0) # Januar aus drei Jahren
+    assert profil[11] == pytest.approx(202062.0) # Dezember nur 2020 und 2021
+    assert (wuerfel.vorjahresdifferenz('Einfuhr_GWh')[0] == 100.0).all()
+    assert wuerfel.nettoimport()[0, 0] == 202001.0 - 10.0
+
+
+def test_luecke_zwischen_jahren():
+    df = monatswerte([2020, 2021, 2022])
+    wuerfel = BilanzWuerfel(df[df['Jahr'] != 2021])
+    assert wuerfel.jahre.tolist() == [2020, 2021, 2022]
+    assert not wuerfel.gueltig[1].any()
+
+
+def test_doppelte_monate():
+    df = monatswerte([2020, 2021])
+    doppelt = pd.concat([df, df[(df['Jahr'] == 2021) & (df['Monat'] == 5)].assign(Definitiv=0)])
+    with pytest.raises(ValueError, match='2021-05'):
+        BilanzWuerfel(doppelt)
+
+
+def test_monat_ausserhalb():
+    df = monatswerte([2020])
+    df.loc[0, 'Monat'] = 13
+    with pytest.raises(ValueError, match='13'):
+        BilanzWuerfel(df)
+
+
+def test_aus_csv(tmp_path):
+    pfad = tmp_path / 'bilanz.csv'
+    monatswerte([2020, 2021]).to_csv(pfad, index=False)
+    wuerfel = bilanz_wuerfel(pfad, groessen=['Einfuhr_GWh'])
+    assert wuerfel.werte.shape == (2, 12, 1)
+    assert wuerfel.gueltig.all()
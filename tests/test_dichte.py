@@ -0,0 +1,31 @@
+import matplotlib
+import numpy as np
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+from datenvis.dichte import histogramm2d, streudiagramm  # noqa: E402
+
+
+def test_histogramm2d_wie_numpy():
+    rng = np.random.default_rng(1)
+    x, y = rng.normal(size=1000), rng.normal(size=1000)
+    anzahl, xkanten, ykanten = histogramm2d(x, y, bins=20)
+    erwartet, xerwartet, yerwartet = np.histogram2d(x, y, bins=20)
+    np.testing.assert_array_equal(anzahl, erwartet)
+    np.testing.assert_allclose(xkanten, xerwartet)
+    np.testing.assert_allclose(ykanten, yerwartet)
+
+
+def test_histogramm2d_ohne_punkte():
+    anzahl, xkanten, _ = histogramm2d(np.array([]), np.array([]), bins=4)
+    assert anzahl.shape == (4, 4) and anzahl.sum() == 0
+    np.testing.assert_allclose(xkanten, np.histogram2d([], [], bins=4)[1])
+
+
+def test_streudiagramm_dichte_ohne_punkte():
+    fig = plt.figure()
+    try:
+        assert streudiagramm(fig.subplots(), [np.nan], [1.0], modus='dichte') == ('punkte', None, None)
+    finally:
+        plt.close(fig)
@@ -0,0 +1,98 @@
+import os
+import types
+
+import matplotlib
+import pandas as pd
+import pytest
+
+matplotlib.use('Agg')
+
+from datenvis import export, quellen  # noqa: E402
+from datenvis.broker import Broker, lesen  # noqa: E402
+from datenvis.export import abbildung_exportieren, auftraege, exportieren, teilen, zusammenfassung  # noqa: E402
+
+
+@pytest.fixture
+def csv_quelle(monkeypatch):
+    """Quelle 'tabelle' (CSV, in einem Thread gelesen) nur für den Test."""
+    monkeypatch.setitem(quellen.QUELLEN, 'tabelle', quellen.Quelle('pandas:read_csv', False))
+    yield
+    quellen.beenden()
+
+
+def pipeline(pfad):
+    return types.SimpleNamespace(EINGABEN={'tabelle': str(pfad)}, ABBILDUNGEN=[])
+
+
+def test_teilen_veroeffentlicht_datenfiles(tmp_path, csv_quelle):
+    datei = tmp_path / 'tabelle.csv'
+    pd.DataFrame({'a': [1, 2, 3]}).to_csv(datei, index=False)
+    with Broker(tmp_path) as broker:
+        katalog = teilen(broker, [pipeline(datei)])
+        assert list(katalog) == [quellen.schluessel('tabelle', datei)]
+        assert lesen(katalog[quellen.schluessel('tabelle', datei)])['a'].tolist() == [1, 2, 3]
+
+
+def test_teilen_warnt_bei_fehlendem_datenfile(tmp_path, csv_quelle):
+    with Broker(tmp_path) as broker:
+        with pytest.warns(RuntimeWarning, match='nicht lesbar'):
+            assert teilen(broker, [pipeline(tmp_path / 'fehlt.csv')]) == {}
+
+
+def test_teilen_warnt_wenn_der_broker_nicht_speichern_kann(tmp_path, csv_quelle, monkeypatch):
+    datei = tmp_path / 'tabelle.csv'
+    pd.DataFrame({'a': [1]}).to_csv(datei, index=False)
+
+    def voll(*args):
+        raise OSError(28, 'No space left on device')
+    with Broker(tmp_path) as broker:
+        monkeypatch.setattr(broker, 'veroeffentlichen', voll)
+        with pytest.warns(RuntimeWarning, match='lesen .* selbst'):
+            assert teilen(broker, [pipeline(datei)]) == {}
+
+
+def test_teilen_gibt_fehler_im_broker_weiter(tmp_path, csv_quelle, monkeypatch):
+    datei = tmp_path / 'tabelle.csv'
+    pd.DataFrame({'a': [1]}).to_csv(datei, index=False)
+
+    def fehlerhaft(*args):
+        raise KeyError('Fehler im Broker')
+    with Broker(tmp_path) as broker:
+        monkeypatch.setattr(broker, 'veroeffentlichen', fehlerhaft)
+        with pytest.raises(KeyError):
+            teilen(broker, [pipeline(datei)])
+
+
+def test_auftraege():
+    assert auftraege(['grundlagen']) == [('grundlagen', 'Funktion'), ('grundlagen', 'Funktionen'),
+                                         ('grundlagen', 'Brownsche_Bewegung_1D')]
+
+
+def test_exportieren_parallel(tmp_path):
+    resultate = exportieren(['grundlagen', 'brownsche_bewegung'], tmp_path, formate=('png', 'svg'),
+                            prozesse=2, trace=True)
+    assert [r[:2] for r in resultate] == auftraege(['grundlagen', 'brownsche_bewegung'])
+    assert not [r.fehler for r in resultate if r.fehler]
+    for r in resultate:
+        for endung in ('png', 'svg'):
+            assert (tmp_path / r.pipeline / ('%s.%s' % (r.name, endung))).stat().st_size > 0
+    # jede Grafik wurde in einem der Prozesse gemessen, nicht im Hauptprozess
+    prozesse = {e.prozess for r in resultate for e in r.ereignisse}
+    assert prozesse and os.getpid() not in prozesse
+    assert {r.pipeline + '/' + r.name for r in resultate} <= {e.name for r in resultate for e in r.ereignisse}
+    assert '6 Grafiken aus 2 Pipelines' in zusammenfassung(resultate)
+
+
+def test_fehler_der_pipeline_einmal_pro_prozess(tmp_path, monkeypatch):
+    aufrufe = []
+
+    def fehlerhaft(pipeline):
+        aufrufe.append(pipeline)
+        raise FileNotFoundError('daten.csv')
+    monkeypatch.setattr(export, '_RESULTATE', {})
+    monkeypatch.setattr(export, 'ausfuehren', fehlerhaft)
+    resultate = [abbildung_exportieren('grundlagen', name, tmp_path) for _, name in auftraege(['grundlagen'])]
+    assert aufrufe == ['grundlagen']
+    assert all(r.fehler == 'FileNotFoundError: daten.csv' for r in resultate)
+    assert 'grundlagen                                       FEHLER: FileNotFoundError' in zusammenfassung(resultate)
+    assert zusammenfassung(resultate).endswith('0 Grafiken aus 1 Pipelines')
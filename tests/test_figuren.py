@@ -0,0 +1,91 @@
+import gc
+import os
+
+import matplotlib
+import pytest
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.colors import same_color  # noqa: E402
+
+from datenvis.figuren import FigurenVerwaltung  # noqa: E402
+
+ZYKLEN = 1000
+
+
+def rss():
+    """Belegter Arbeitsspeicher des Prozesses in Bytes (Linux)."""
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def zeichnen(fig):
+    ax = fig.subplots()
+    ax.plot(range(100))
+    ax.set_title('Test')
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/statm'), reason='braucht /proc')
+@pytest.mark.parametrize('pyplot', [False, True])
+def test_speicher_bleibt_konstant(pyplot):
+    verwaltung = FigurenVerwaltung(pyplot=pyplot)
+    # Aufwärmen: Caches von Matplotlib (Schriften, Text) füllen sich beim ersten Zeichnen
+    for _ in range(50):
+        fig = verwaltung.figur(4, 3)
+        zeichnen(fig)
+        verwaltung.schliessen(fig)
+    gc.collect()
+    vorher = rss()
+    for _ in range(ZYKLEN):
+        fig = verwaltung.figur(4, 3)
+        zeichnen(fig)
+        verwaltung.schliessen(fig)
+    del fig
+    gc.collect()
+    assert verwaltung.offen() == 0
+    assert plt.get_fignums() == []
+    assert rss() - vorher < 20 * 2 ** 20
+
+
+def test_pool_verwendet_figures_wieder():
+    verwaltung = FigurenVerwaltung(pyplot=False)
+    for _ in range(ZYKLEN):
+        verwaltung.schliessen(verwaltung.figur(4, 3))
+    assert verwaltung.erstellt == 1
+    assert verwaltung.wiederverwendet == ZYKLEN - 1
+
+
+def test_pool_schluessel_mit_auflosung():
+    verwaltung = FigurenVerwaltung(pyplot=False)
+    fig = verwaltung.figur(4, 3)
+    verwaltung.schliessen(fig)
+    assert verwaltung.figur(4, 3, dpi=plt.rcParams['figure.dpi']) is fig
+    verwaltung.schliessen(fig)
+    assert verwaltung.figur(4, 3, dpi=2 * plt.rcParams['figure.dpi']) is not fig
+
+
+def test_zeigen_zeigt_nur_eine_figure():
+    verwaltung = FigurenVerwaltung()
+    erste, zweite = verwaltung.figur(4, 3), verwaltung.figur(4, 3)
+    verwaltung.zeigen(zweite)
+    assert plt.fignum_exists(erste.number)
+    assert not plt.fignum_exists(zweite.number)
+    verwaltung.schliessen(erste)
+
+
+def test_pool_uebernimmt_keine_einstellungen():
+    verwaltung = FigurenVerwaltung(pyplot=False)
+    besondere = verwaltung.figur(4, 3, layout='constrained', facecolor='red')
+    verwaltung.schliessen(besondere)
+    neue = verwaltung.figur(4, 3)
+    assert neue is not besondere
+    assert neue.get_layout_engine() is None
+
+    # Auch Einstellungen, die beim Zeichnen geändert wurden, bleiben nicht erhalten
+    neue.set_facecolor('red')
+    neue.set_layout_engine('constrained')
+    verwaltung.schliessen(neue)
+    wieder = verwaltung.figur(4, 3)
+    assert wieder is neue
+    assert wieder.get_layout_engine() is None
+    assert same_color(wieder.get_facecolor(), plt.rcParams['figure.facecolor'])
@@ -0,0 +1,179 @@
+import geopandas as gpd
+import matplotlib
+import numpy as np
+import pytest
+import shapely
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+from datenvis.geodaten import (CRS_METER, TOLERANZEN, ecken, kantone_aufbereiten, karte,  # noqa: E402
+                               lade_kantone, meter_pro_pixel, stufe_waehlen, stufen)
+
+# 3 × 2 Kantone von je 20 km × 20 km in LV95, Grenzen mit Zacken von ±300 m alle 50 m
+SPALTEN, ZEILEN, SEITE = 3, 2, 20_000
+X0, Y0 = 2_600_000, 1_200_000
+
+
+def gezackt(rng, laenge):
+    """Abweichung senkrecht zu einer Grenze, alle 50 m ein Punkt (1 km über beide Enden hinaus)."""
+    lage = np.arange(-1000, laenge + 1001, 50.0)
+    return lage, rng.uniform(-300, 300, size=len(lage))
+
+
+def ueberdeckung(seed=0):
+    """Kantone als lückenlose Überdeckung: jede gemeinsame Grenze ist in beiden Flächen identisch."""
+    rng = np.random.default_rng(seed)
+    linien = []
+    for i in range(SPALTEN + 1):
+        y, dx = gezackt(rng, ZEILEN * SEITE)
+        linien.append(shapely.LineString(np.column_stack([X0 + i * SEITE + dx, Y0 + y])))
+    for j in range(ZEILEN + 1):
+        x, dy = gezackt(rng, SPALTEN * SEITE)
+        linien.append(shapely.LineString(np.column_stack([X0 + x, Y0 + j * SEITE + dy])))
+    netz = shapely.union_all(linien)
+    flaechen = [f for f in shapely.get_parts(shapely.polygonize(shapely.get_parts(netz)))
+                if f.area > 0.5 * SEITE ** 2]
+    # Kantonsnummer zeilenweise von unten links
+    flaechen.sort(key=lambda f: (round((f.centroid.y - Y0) // SEITE), f.centroid.x))
+    assert len(flaechen) == SPALTEN * ZEILEN
+    return flaechen
+
+
+@pytest.fixture(scope='module')
+def geo():
+    """Rohdaten wie im GeoJSON-File: Längen- und Breitengrad, Kanton 2 mit einer Exklave ohne Werte."""
+    flaechen = ueberdeckung()
+    exklave = shapely.box(X0 - 5000, Y0, X0 - 2000, Y0 + 3000)
+    namen = ['Zürich', 'Bern', 'Luzern', 'Uri', 'Schwyz', 'Obwalden']
+    roh = gpd.GeoDataFrame({
+        'NAME': namen + ['Bern'],
+        'KANTONSNUM': [1, 2, 3, 4, 5, 6, 2],
+        'KANTONSFLA': [f.area / 1e4 for f in flaechen] + [np.nan],
+        'EINWOHNERZ': [100.0, 200.0, 300.0, 400.0, 500.0, 600.0, np.nan],
+    }, geometry=flaechen + [exklave], crs=CRS_METER)
+    return roh.iloc[[6, 0, 1, 2, 3, 4, 5]].to_crs('EPSG:4326')
+
+
+@pytest.fixture(scope='module')
+def kantone(geo):
+    return kantone_aufbereiten(geo)
+
+
+def test_eine_zeile_pro_kanton(kantone):
+    assert kantone['KANTONSNUM'].tolist() == [1, 2, 3, 4, 5, 6]
+    assert kantone['KUERZEL'].tolist() == ['ZH', 'BE', 'LU', 'UR', 'SZ', 'OW']
+    # Werte der Hauptzeile, die Exklave gehört zur Geometrie
+    bern = kantone.iloc[1]
+    assert bern['EINWOHNERZ'] == 200.0 and not np.isnan(bern['KANTONSFLA'])
+    assert bern.geometry.geom_type == 'MultiPolygon'
+    assert kantone.crs == 'EPSG:4326'
+    punkte = gpd.GeoSeries.from_xy(kantone['punkt_x'], kantone['punkt_y'], crs=kantone.crs)
+    assert kantone.geometry.contains(punkte).all()
+    np.testing.assert_allclose(kantone[['minx', 'miny', 'maxx', 'maxy']].to_numpy(), kantone.bounds.to_numpy())
+
+
+def test_stufen_und_ecken(kantone):
+    assert stufen(kantone) == {0: 'geometry', **{t: 'geometrie_%d' % t for t in TOLERANZEN}}
+    anzahl = list(ecken(kantone).values())
+    assert all(grob < fein for fein, grob in zip(anzahl, anzahl[1:]))
+    assert anzahl[-1] < anzahl[0] / 20
+
+
+@pytest.mark.parametrize('toleranz', TOLERANZEN)
+def test_detailstufe_ohne_luecken_und_ueberlappungen(kantone, toleranz):
+    original = kantone.geometry.to_crs(CRS_METER)
+    stufe = kantone['geometrie_%d' % toleranz].to_crs(CRS_METER)
+    assert stufe.is_valid.all()
+    # gemeinsame Grenzen gleich vereinfacht: die Flächen überdecken zusammen genau das Gebiet
+    assert shapely.coverage_is_valid(stufe.values)
+    assert stufe.union_all().area == pytest.approx(stufe.area.sum(), rel=1e-9)
+    assert stufe.area.sum() == pytest.approx(original.area.sum(), rel=0.05)
+    # simplify_coverage (Visvalingam-Whyatt) verschiebt Grenzen in der Grössenordnung der Toleranz
+    abstand = [a.hausdorff_distance(b) for a, b in zip(original, stufe)]
+    assert max(abstand) < 2 * toleranz
+
+
+def test_vereinfachen_ohne_ueberdeckung():
+    """Überlappende Flächen: jede Fläche für sich vereinfacht, statt eines Fehlers."""
+    from datenvis.geodaten import vereinfachen
+
+    flaechen = gpd.GeoSeries(ueberdeckung()[:2], crs=CRS_METER)
+    flaechen.iloc[1] = flaechen.iloc[1].buffer(1000)
+    vereinfacht = vereinfachen(flaechen, 500)
+    assert vereinfacht.is_valid.all()
+    assert shapely.get_num_coordinates(vereinfacht.values).sum() < shapely.get_num_coordinates(flaechen.values).sum()
+
+
+def test_lade_kantone_zwischenspeicher(geo, tmp_path):
+    datei = tmp_path / 'switzerland.geojson'
+    geo.to_file(datei, driver='GeoJSON')
+    kantone = lade_kantone(datei)
+    assert list(ecken(kantone)) == [0, *TOLERANZEN]
+    parquet, = (tmp_path / 'switzerland.geojson.cache' / 'kantone').glob('*.parquet')
+    zeit = parquet.stat().st_mtime_ns
+    assert lade_kantone(datei)['KUERZEL'].tolist() == kantone['KUERZEL'].tolist()
+    assert parquet.stat().st_mtime_ns == zeit
+
+    # andere Toleranzen: neues File, das alte wird entfernt
+    assert list(stufen(lade_kantone(datei, toleranzen=(2000,)))) == [0, 2000]
+    assert [p.name for p in parquet.parent.glob('*.parquet')] == ['kantone_2000.parquet']
+
+    # neues Datenfile: neu berechnet
+    geo[geo['KANTONSNUM'] != 6].to_file(datei, driver='GeoJSON')
+    assert len(lade_kantone(datei, toleranzen=(2000,))) == 5
+
+
+@pytest.fixture
+def achsen():
+    """Achsen über die ganze Figure von 4 × 4 Zoll."""
+    fig = plt.figure(figsize=(4, 4), dpi=100)
+    yield fig.add_axes((0, 0, 1, 1))
+    plt.close(fig)
+
+
+def test_meter_pro_pixel(achsen):
+    quadrat = gpd.GeoDataFrame(geometry=[shapely.box(0, 0, 40_000, 20_000)], crs=CRS_METER)
+    assert meter_pro_pixel(achsen, quadrat, dpi=100) == pytest.approx(100)
+    assert meter_pro_pixel(achsen, quadrat, dpi=50) == pytest.approx(200)
+    with matplotlib.rc_context({'savefig.dpi': 'figure'}):
+        assert meter_pro_pixel(achsen, quadrat) == pytest.approx(100)
+    with matplotlib.rc_context({'savefig.dpi': 25}):
+        assert meter_pro_pixel(achsen, quadrat) == pytest.approx(400)
+    # eingestellter Ausschnitt statt der ganzen Ebene
+    achsen.set_xlim(0, 4000)
+    achsen.set_ylim(0, 2000)
+    assert meter_pro_pixel(achsen, quadrat, dpi=100) == pytest.approx(10)
+
+
+def test_meter_pro_pixel_laengen_und_breitengrad(achsen, kantone):
+    breite = np.ptp(kantone.to_crs(CRS_METER).total_bounds[[0, 2]])
+    assert meter_pro_pixel(achsen, kantone, dpi=100) == pytest.approx(breite / 400, rel=0.01)
+
+
+@pytest.mark.parametrize('dpi, spalte', [(1000, 'geometry'), (100, 'geometrie_100'), (20, 'geometrie_500'),
+                                         (10, 'geometrie_1000'), (1, 'geometrie_5000')])
+def test_stufe_waehlen(achsen, kantone, dpi, spalte):
+    # ein Pixel ist rund 65 km / (4 Zoll × dpi)
+    assert stufe_waehlen(kantone, achsen, dpi) == spalte
+
+
+def test_stufe_waehlen_kleine_achsen(kantone):
+    fig = plt.figure(figsize=(1, 1), dpi=100)
+    try:
+        assert stufe_waehlen(kantone, fig.add_axes((0, 0, 1, 1))) == 'geometrie_500'
+    finally:
+        plt.close(fig)
+
+
+def test_stufe_waehlen_ohne_stufen(achsen, kantone):
+    assert stufe_waehlen(kantone[['KANTONSNUM', 'geometry']], achsen, dpi=1) == 'geometry'
+
+
+@pytest.mark.parametrize('dpi, toleranz', [(1000, 0), (10, 1000)])
+def test_karte_zeichnet_gewaehlte_stufe(achsen, kantone, dpi, toleranz):
+    assert karte(kantone, achsen, dpi=dpi, column='EINWOHNERZ', cmap='OrRd') is achsen
+    flaechen, = achsen.collections
+    assert sum(len(pfad.vertices) for pfad in flaechen.get_paths()) == ecken(kantone)[toleranz]
+    np.testing.assert_allclose(flaechen.get_array(), kantone['EINWOHNERZ'])
+    assert kantone.geometry.name == 'geometry'
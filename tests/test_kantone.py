@@ -0,0 +1,82 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import box
+
+from datenvis.kantone import KANTONE, kantonsnummer, kuerzel, normalisieren, verbinden
+
+# BFS-Nummern in der offiziellen Reihenfolge (1 Zürich bis 26 Jura)
+BFS = ['ZH', 'BE', 'LU', 'UR', 'SZ', 'OW', 'NW', 'GL', 'ZG', 'FR', 'SO', 'BS', 'BL', 'SH', 'AR', 'AI',
+       'SG', 'GR', 'AG', 'TG', 'TI', 'VD', 'VS', 'NE', 'GE', 'JU']
+
+
+@pytest.mark.parametrize('kanton', KANTONE, ids=lambda k: k.kuerzel)
+def test_alle_namen_kuerzel_und_nummern(kanton):
+    assert BFS[kanton.nummer - 1] == kanton.kuerzel
+    eintraege = list(kanton.namen) + [kanton.kuerzel, kanton.kuerzel.lower(), kanton.nummer, str(kanton.nummer),
+                                      '%02d' % kanton.nummer] + [name.upper() for name in kanton.namen]
+    assert kantonsnummer(eintraege).tolist() == [kanton.nummer] * len(eintraege)
+    assert kuerzel(eintraege).tolist() == [kanton.kuerzel] * len(eintraege)
+
+
+def test_schreibweisen():
+    werte = ['Geneve', 'neuchatel', 'Appenzell A.Rh.', 'appenzell-innerrhoden', ' St.Gallen ', 'Basel Stadt',
+             'Graubunden']
+    assert kantonsnummer(werte).tolist() == [25, 24, 15, 16, 17, 12, 18]
+    assert normalisieren('  Bâle-Ville ') == 'bale ville'
+    assert normalisieren('Appenzell A. Rh.') == normalisieren('appenzell a rh')
+
+
+def test_unbekannt_und_fehlend():
+    nummern = kantonsnummer(pd.Series(['Schweiz', None, 'VS', np.nan, 27, 'VS'], index=list('abcdef')))
+    assert nummern.dtype == 'Int64' and list(nummern.index) == list('abcdef')
+    assert nummern.isna().tolist() == [True, True, False, True, True, False]
+    assert kuerzel(['Schweiz', 'Wallis']).tolist()[1] == 'VS'
+
+
+def test_namen_der_datensaetze():
+    mietpreise = ['Zürich', 'Bern', 'Luzern', 'Uri', 'Schwyz', 'Obwalden', 'Nidwalden', 'Glarus', 'Zug',
+                  'Freiburg', 'Solothurn', 'Basel-Stadt', 'Basel-Landschaft', 'Schaffhausen', 'Appenzell A. Rh.',
+                  'Appenzell I. Rh.', 'St. Gallen', 'Graubünden', 'Aargau', 'Thurgau', 'Tessin', 'Waadt',
+                  'Wallis', 'Neuenburg', 'Genf', 'Jura']
+    geodaten = mietpreise[:9] + ['Fribourg'] + mietpreise[10:14] + [
+        'Appenzell Ausserrhoden', 'Appenzell Innerrhoden', 'St. Gallen', 'Graubünden', 'Aargau', 'Thurgau',
+        'Ticino', 'Vaud', 'Valais', 'Neuchâtel', 'Genève', 'Jura']
+    assert kantonsnummer(mietpreise).tolist() == list(range(1, 27))
+    assert kantonsnummer(geodaten).tolist() == list(range(1, 27))
+
+
+@pytest.fixture
+def geo():
+    # Reihenfolge und Sprache wie in den Geodaten, ein Kanton aus zwei Teilen
+    namen = ['Valais', 'Zürich', 'Ticino', 'Genève', 'Zürich']
+    return gpd.GeoDataFrame({'NAME': namen, 'KANTONSNUM': [23, 1, 21, 25, 1]},
+                            geometry=[box(i, 0, i + 1, 1) for i in range(5)], index=[10, 11, 12, 13, 14])
+
+
+def test_verbinden(geo):
+    tabelle = pd.DataFrame({'Kanton': ['Zürich', 'Wallis', 'Genf'], 'Total': [1800.0, 1200.0, 2000.0],
+                            'Zimmer': [3, 4, 5]})
+    karte = verbinden(geo, tabelle)
+    assert isinstance(karte, gpd.GeoDataFrame)
+    assert list(karte.index) == [10, 11, 12, 13, 14] and 'Total' not in geo
+    assert karte['Total'].tolist()[:2] == [1200.0, 1800.0] and np.isnan(karte['Total'].iloc[2])
+    assert karte['Total'].tolist()[3:] == [2000.0, 1800.0]
+    assert list(karte.columns) == ['NAME', 'KANTONSNUM', 'geometry', 'Total', 'Zimmer']
+    assert list(verbinden(geo, tabelle, spalten=['Zimmer']).columns)[-1] == 'Zimmer'
+
+
+def test_verbinden_eigener_schluessel(geo):
+    tabelle = pd.DataFrame({'Nr': [21, 23], 'Total': [1.0, 2.0]})
+    karte = verbinden(geo, tabelle, links='KANTONSNUM', rechts='Nr',
+                      schluessel=lambda spalte: spalte.astype('Int64'))
+    assert karte['Total'].isna().tolist() == [False, True, False, True, True]
+    assert karte.loc[[10, 12], 'Total'].tolist() == [2.0, 1.0]
+
+
+def test_verbinden_unbekannt_oder_doppelt(geo):
+    with pytest.raises(ValueError, match='Unbekannte Einträge .*Schweiz'):
+        verbinden(geo, pd.DataFrame({'Kanton': ['Schweiz', 'Wallis'], 'Total': [1.0, 2.0]}))
+    with pytest.raises(ValueError, match='Mehrere Zeilen für Kanton 23'):
+        verbinden(geo, pd.DataFrame({'Kanton': ['VS', 'Valais', 'Genf'], 'Total': [1.0, 2.0, 3.0]}))
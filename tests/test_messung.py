@@ -0,0 +1,65 @@
+import threading
+
+import numpy as np
+import pytest
+
+from datenvis.messung import Messung
+
+
+def ereignis(messung, name):
+    return next(e for e in messung.ereignisse if e.name == name)
+
+
+def test_verschachtelte_stufen():
+    messung = Messung()
+    with messung.aufnahme():
+        with messung.stufe('aussen'):
+            with messung.stufe('innen', 'berechnen'):
+                daten = np.ones(2 ** 20) # 8 MB
+            del daten
+    innen, aussen = ereignis(messung, 'innen'), ereignis(messung, 'aussen')
+    assert (innen.pfad, innen.tiefe, innen.art) == ('aussen;innen', 1, 'berechnen')
+    assert innen.spitze >= 8 * 2 ** 20 and innen.zuwachs >= 8 * 2 ** 20
+    # Die Spitze der inneren Stufe zählt auch für die äussere
+    assert aussen.spitze >= innen.spitze
+
+
+def test_unbekannte_art():
+    messung = Messung(aktiv=True, speicher=False)
+    with pytest.raises(ValueError):
+        messung.stufe('x', 'rechnen')
+
+
+def test_ohne_messung_nichts_aufgezeichnet():
+    messung = Messung()
+    with messung.stufe('x'):
+        pass
+    assert messung.ereignisse == []
+
+
+def test_keine_spitze_fuer_gleichzeitige_stufen():
+    messung = Messung()
+    gestartet, fertig = threading.Event(), threading.Event()
+
+    def laden():
+        with messung.stufe('thread', 'laden'):
+            gestartet.set()
+            fertig.wait(5)
+    with messung.aufnahme():
+        with messung.stufe('vorher'):
+            pass
+        thread = threading.Thread(target=laden)
+        with messung.stufe('gleichzeitig'):
+            thread.start()
+            gestartet.wait(5)
+        fertig.set()
+        thread.join()
+        with messung.stufe('nachher'):
+            pass
+    assert ereignis(messung, 'vorher').spitze is not None
+    assert ereignis(messung, 'thread').spitze is None
+    assert ereignis(messung, 'gleichzeitig').spitze is None
+    assert ereignis(messung, 'nachher').spitze is not None
+    assert 'n/a' in messung.zusammenfassung()
+    argumente = {e['name']: e['args'] for e in messung.trace()['traceEvents']}
+    assert argumente['thread']['spitze_mb'] == 'n/a'
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import KANTONSNAMEN, mietpreis
+from datenvis.mietpreise import ZIMMER
+from datenvis.mietwuerfel import GROESSEN, MietWuerfel, jahresblaetter, miet_wuerfel
+
+
+@pytest.fixture
+def wuerfel(mietpreise_datei):
+    return miet_wuerfel(mietpreise_datei)
+
+
+def test_form_und_achsen(wuerfel):
+    assert wuerfel.werte.shape == (4, 27, len(ZIMMER), len(GROESSEN))
+    assert wuerfel.jahre.tolist() == [2019, 2020, 2022, 2023]
+    assert wuerfel.kantone.tolist() == ['Schweiz'] + KANTONSNAMEN
+    assert wuerfel.zimmer == ZIMMER
+
+
+def test_auswahl(wuerfel):
+    assert wuerfel.jahr(2022)[1, 2] == pytest.approx(mietpreis(2022, 1, 2))
+    assert wuerfel.jahr(2022, 'vertrauensintervall')[1, 2] == 12.0
+    assert wuerfel.kanton('Bern')[:, 0] == pytest.approx([mietpreis(j, 2, 0) for j in (2019, 2020, 2022, 2023)])
+    assert wuerfel.preis('6+ Zimmer')[-1, 0] == pytest.approx(mietpreis(2023, 0, 6))
+    # Ein Kanton, der in einem Jahr fehlt, ist NaN
+    assert np.isnan(wuerfel.kanton('Jura')[0]).all()
+    assert not np.isnan(wuerfel.kanton('Jura')[1:]).any()
+
+
+def test_zwischenspeicher(mietpreise_datei):
+    erster = miet_wuerfel(mietpreise_datei)
+    zweiter = miet_wuerfel(mietpreise_datei)
+    assert isinstance(zweiter.werte, np.memmap)
+    np.testing.assert_array_equal(erster.werte, zweiter.werte)
+    assert jahresblaetter(mietpreise_datei) == ['2023', '2022', '2020', '2019']
+
+
+def test_wachstum_ueber_jahreszahlen(wuerfel):
+    wachstum = wuerfel.wachstum()
+    assert wachstum.shape == (4, 27, len(ZIMMER))
+    # 2019 hat kein Vorjahr, 2022 fehlt das Vorjahr 2021: NaN statt Wachstum über zwei Jahre
+    assert np.isnan(wachstum[[0, 2]]).all()
+    assert wachstum[1, :-1] == pytest.approx(np.full((26, len(ZIMMER)), 0.02))
+    assert wachstum[3] == pytest.approx(np.full((27, len(ZIMMER)), 0.02))
+    # Jura fehlt 2019
+    assert np.isnan(wachstum[1, -1]).all()
+
+
+def test_wachstum_mit_abstand(wuerfel):
+    wachstum = wuerfel.wachstum(abstand=2)
+    assert np.isnan(wachstum[[0, 1, 3]]).all()
+    assert wachstum[2, :-1] == pytest.approx(np.full((26, len(ZIMMER)), 1.02 ** 2 - 1))
+
+
+@pytest.mark.parametrize('abstand', [0, -1])
+def test_wachstum_abstand_mindestens_eins(wuerfel, abstand):
+    with pytest.raises(ValueError, match='abstand'):
+        wuerfel.wachstum(abstand)
+
+
+def test_aus_blaettern_ohne_mietpreise():
+    with pytest.raises(ValueError, match='Spalten mit Mietpreisen'):
+        MietWuerfel.aus_blaettern({'2023': pd.DataFrame({'Kanton': ['Bern'], 'Preis': [1.0]})})
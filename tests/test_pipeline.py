@@ -0,0 +1,37 @@
+import json
+
+import pandas as pd
+
+from datenvis.pipeline import cli
+
+
+def test_cli_nur_daten(produktion_datei, tmp_path, capsys):
+    ziel = tmp_path / 'out'
+    assert cli('korrelation', ['--input', str(produktion_datei), '--out', str(ziel), '--nur-daten']) == 0
+    for tabelle in ('bericht', 'luecken', 'regression', 'kennzahlen', 'korrelation'):
+        assert (ziel / (tabelle + '.csv')).exists()
+    assert not list(ziel.glob('*.png'))
+    regression = pd.read_csv(ziel / 'regression.csv')
+    assert regression.loc[0, 'anzahl'] == 730
+    ausgabe = capsys.readouterr().out
+    assert 'regression' in ausgabe and str(ziel / 'bericht.csv') in ausgabe
+
+
+def test_cli_name_und_trace(mietpreise_datei, tmp_path, capsys):
+    ziel, trace = tmp_path / 'out', tmp_path / 'trace.json'
+    argumente = ['--input', 'mietpreise=%s' % mietpreise_datei, '--out', str(ziel), '--nur-daten',
+                 '--trace', str(trace)]
+    assert cli('mietpreise', argumente) == 0
+    mietpreise = pd.read_csv(ziel / 'mietpreise.csv')
+    assert len(mietpreise) == 27
+    ereignisse = json.loads(trace.read_text())['traceEvents']
+    assert {'laden', 'umformen'} <= {e['name'] for e in ereignisse}
+    assert 'Trace gespeichert' in capsys.readouterr().err
+
+
+def test_cli_unbekannte_eingabe(tmp_path, capsys):
+    import pytest
+
+    with pytest.raises(SystemExit):
+        cli('korrelation', ['--input', 'unbekannt=%s' % (tmp_path / 'x.csv'), '--nur-daten'])
+    assert 'unbekannt' in capsys.readouterr().err
@@ -0,0 +1,88 @@
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+
+matplotlib.use('Agg')
+import matplotlib.dates as mdates  # noqa: E402
+import matplotlib.pyplot as plt  # noqa: E402
+
+from datenvis.small_multiples import SmallMultiples, serien_nach_gruppe  # noqa: E402
+
+
+def serien(tage=60, verschiebung=0.0):
+    datum = pd.date_range('2024-01-01', periods=tage, freq='D')
+    return {'a': (datum, np.sin(np.arange(tage) / 5) + verschiebung),
+            'b': (datum, np.cos(np.arange(tage) / 5) + verschiebung)}
+
+
+@pytest.fixture
+def raster():
+    sm = SmallMultiples(['a', 'b'], figsize=(4, 4))
+    yield sm
+    plt.close(sm.fig)
+
+
+def test_serien_nach_gruppe():
+    df = pd.DataFrame({'Datum': ['2024-01-02', '2024-01-01', '2024-01-01'],
+                       'Energietraeger': pd.Categorical(['x', 'y', 'x'], categories=['x', 'y', 'z']),
+                       'Produktion_GWh': [1.0, 2.0, 3.0]})
+    resultat = serien_nach_gruppe(df)
+    assert set(resultat) == {'x', 'y'}
+    zeit, werte = resultat['x']
+    assert list(pd.DatetimeIndex(zeit)) == [pd.Timestamp('2024-01-02'), pd.Timestamp('2024-01-01')]
+    np.testing.assert_array_equal(werte, [1.0, 3.0])
+
+
+def test_aktualisieren_ersetzt_nur_daten(raster):
+    linien, legenden = dict(raster.linien), list(raster._legenden)
+    raster.aktualisieren(serien())
+    raster.aktualisieren(serien(verschiebung=1.0) | {'unbekannt': serien()['a']})
+    assert raster.linien == linien and raster._legenden == legenden
+    assert all(len(ax.lines) == 1 for ax in raster.axs)
+    x, y = raster.linien['b'].get_data()
+    np.testing.assert_allclose(x, mdates.date2num(serien()['b'][0]))
+    np.testing.assert_allclose(y, serien(verschiebung=1.0)['b'][1])
+    assert raster.axs[1].get_ylim()[1] >= 2.0
+
+
+def test_feste_achsengrenzen(raster):
+    raster.aktualisieren(serien(), xlim=('2024-01-10', '2024-01-20'), ylim=(-5, 5))
+    for ax in raster.axs:
+        assert ax.get_xlim() == pytest.approx(mdates.date2num(pd.to_datetime(['2024-01-10', '2024-01-20'])))
+        assert ax.get_ylim() == (-5, 5)
+
+
+def test_blitting_nur_bei_gleichen_grenzen(raster, monkeypatch):
+    aufrufe = []
+    zeichne = raster.fig.canvas.draw
+    monkeypatch.setattr(raster.fig.canvas, 'draw', lambda: aufrufe.append(1) or zeichne())
+    grenzen = dict(xlim=('2024-01-01', '2024-03-01'), ylim=(-3, 3))
+
+    raster.aktualisieren(serien(), **grenzen)
+    raster.zeichnen()
+    assert len(aufrufe) == 1
+
+    # gleiche Grenzen: nur Linien über dem gespeicherten Hintergrund
+    raster.aktualisieren(serien(verschiebung=1.0), **grenzen)
+    raster.zeichnen()
+    assert len(aufrufe) == 1
+    geblittet = np.asarray(raster.fig.canvas.buffer_rgba()).copy()
+
+    # das Resultat entspricht einem vollständigen Neuzeichnen (bis auf die
+    # Reihenfolge an Kanten: Achsenrahmen liegen dort normalerweise über den Linien)
+    zeichne()
+    verschieden = (geblittet != np.asarray(raster.fig.canvas.buffer_rgba())).any(axis=2)
+    assert verschieden.mean() < 1e-3
+
+    # neue Grenzen: Hintergrund wird neu gezeichnet
+    raster.aktualisieren(serien(), xlim=grenzen['xlim'], ylim=(-10, 10))
+    raster.zeichnen()
+    assert len(aufrufe) == 2
+
+
+def test_speichern(raster, tmp_path):
+    raster.aktualisieren(serien())
+    raster.speichern(tmp_path / 'raster.png')
+    bild = plt.imread(tmp_path / 'raster.png')
+    assert bild.shape[:2] == (400, 400)
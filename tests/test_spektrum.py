@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from datenvis.spektrum import dominante_perioden, gleitender_mittelwert, periodogramm, tagesmatrix, zerlegen
+
+TAGE = 4 * 365
+WOCHE = np.array([1.0, 1.5, 1.2, 0.8, 0.5, -2.0, -3.0])
+
+
+def reihen(rng=None):
+    """Zwei Spalten: Trend + Wochen- + Jahreszyklus, und nur ein Jahreszyklus mit Rauschen."""
+    rng = rng or np.random.default_rng(0)
+    t = np.arange(TAGE)
+    woche = WOCHE[t % 7] - WOCHE.mean()
+    jahr = 10 * np.sin(2 * np.pi * t / 365)
+    return np.column_stack([50 + 0.01 * t + woche + jahr, 20 + jahr + rng.normal(scale=0.5, size=TAGE)])
+
+
+def test_tagesmatrix_fuellt_luecken():
+    df = pd.DataFrame({'Datum': [pd.Timestamp('2024-01-01 10:00'), pd.Timestamp('2024-01-04'),
+                                 pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-02')],
+                       'Energietraeger': ['a', 'a', 'b', 'b'],
+                       'Produktion_GWh': [1.0, 4.0, 5.0, 6.0]})
+    tage, matrix, namen = tagesmatrix(df, namen=['b', 'a'])
+    assert list(tage) == list(pd.date_range('2024-01-01', '2024-01-04'))
+    assert namen == ['b', 'a']
+    np.testing.assert_allclose(matrix, [[5, 1], [6, 2], [6, 3], [6, 4]])
+
+
+def test_periodogramm_findet_zyklen():
+    frequenzen, leistung = periodogramm(reihen())
+    assert leistung.shape == (TAGE // 2 + 1, 2)
+    assert frequenzen[1] == pytest.approx(1 / TAGE)
+    perioden = dominante_perioden(frequenzen, leistung, ['mit_woche', 'nur_jahr'], anzahl=2)
+    erste = perioden[perioden['Rang'] == 1].set_index('Energietraeger')['Periode_Tage']
+    assert erste.to_dict() == pytest.approx({'mit_woche': 365, 'nur_jahr': 365})
+    zweite = perioden[(perioden['Energietraeger'] == 'mit_woche') & (perioden['Rang'] == 2)]
+    assert zweite['Periode_Tage'].item() == pytest.approx(7, rel=0.01)
+    assert (perioden['Anteil'] > 0).all() and perioden.groupby('Energietraeger')['Anteil'].sum().max() <= 1
+
+
+def test_periodogramm_ohne_trend():
+    t = np.arange(500, dtype=float)
+    gerade = np.column_stack([3 + 0.5 * t])
+    _, leistung = periodogramm(gerade)
+    assert leistung.max() < 1e-12
+    _, mit_trend = periodogramm(gerade, trend_entfernen=False)
+    assert mit_trend[1:].max() > 1.0
+
+
+def test_dominante_perioden_min_periode():
+    t = np.arange(1000)
+    frequenzen, leistung = periodogramm(np.column_stack([np.sin(2 * np.pi * t / 3) + 0.1 * np.sin(2 * np.pi * t / 50)]))
+    assert dominante_perioden(frequenzen, leistung, ['x'], anzahl=1)['Periode_Tage'].item() == pytest.approx(3, rel=0.01)
+    perioden = dominante_perioden(frequenzen, leistung, ['x'], anzahl=1, min_periode=5.0)
+    assert perioden['Periode_Tage'].item() == pytest.approx(50, rel=0.02)
+
+
+@pytest.mark.parametrize('periode', [5, 6])
+def test_gleitender_mittelwert_wie_pandas(periode):
+    matrix = np.random.default_rng(1).normal(size=(60, 3))
+    matrix[30, 1] = np.nan
+    resultat = gleitender_mittelwert(matrix, periode)
+    if periode % 2:
+        erwartet = pd.DataFrame(matrix).rolling(periode, center=True).mean().to_numpy()
+    else:
+        # 2×p-Mittelwert: Mittel zweier nebeneinanderliegender p-Mittelwerte
+        p = pd.DataFrame(matrix).rolling(periode).mean()
+        erwartet = ((p + p.shift(-1)) / 2).shift(-(periode // 2) + 1).to_numpy()
+    np.testing.assert_allclose(resultat, erwartet, atol=1e-12)
+    assert np.isnan(resultat[:periode // 2]).all() and np.isnan(resultat[30 - periode // 2:31 + periode // 2, 1]).all()
+
+
+def test_zerlegung():
+    matrix = reihen()
+    zerlegung = zerlegen(matrix)
+    assert list(zerlegung.saison) == [7, 365]
+    innen = slice(365, TAGE - 365)
+
+    # Trend über ein Jahr glättet beide Zyklen weg
+    np.testing.assert_allclose(zerlegung.trend[innen, 0], 50 + 0.01 * np.arange(TAGE)[innen], atol=0.05)
+    # Wochenprofil der ersten Spalte, in der zweiten kein Wochenzyklus
+    np.testing.assert_allclose(zerlegung.saison[7][:7, 0], WOCHE - WOCHE.mean(), atol=0.1)
+    assert np.abs(zerlegung.saison[7][:, 1]).max() < 0.2
+    # Jahresprofil ohne den Wochenzyklus
+    np.testing.assert_allclose(zerlegung.saison[365][:365, 0], 10 * np.sin(2 * np.pi * np.arange(365) / 365), atol=0.5)
+    # Mittelwert 0 pro Periode, Summe der Komponenten ergibt die Daten
+    np.testing.assert_allclose(zerlegung.saison[7][:7].mean(axis=0), 0, atol=1e-12)
+    summe = zerlegung.trend + zerlegung.saison[7] + zerlegung.saison[365] + zerlegung.rest
+    np.testing.assert_allclose(summe[innen], matrix[innen])
+    assert np.nanstd(zerlegung.rest[innen, 0]) < 0.2
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from datenvis.validierung import pruefe_produktion
+
+
+def produktion(tage, traeger, werte):
+    return pd.DataFrame({'Datum': pd.to_datetime(tage), 'Energietraeger': traeger, 'Produktion_GWh': werte})
+
+
+def test_leere_tabelle():
+    pruefung = pruefe_produktion(produktion([], [], []))
+    assert len(pruefung.bericht) == 0
+    assert len(pruefung.maske) == 0
+    assert len(pruefung.luecken) == 0
+
+
+def test_zeilen_ohne_datum_oder_energietraeger():
+    df = produktion(['2020-01-01', '2020-01-02', None, '2020-01-04', '2020-01-03'],
+                    ['Wind', 'Wind', 'Wind', np.nan, 'Wind'],
+                    [1.0, 2.0, 3.0, 4.0, 5.0])
+    pruefung = pruefe_produktion(df)
+    assert pruefung.maske['ohne_schluessel'].tolist() == [False, False, True, True, False]
+    assert pruefung.maske['ok'].tolist() == [True, True, False, False, True]
+    assert pruefung.bericht.loc['Wind', 'zeilen'] == 3
+    assert pruefung.bericht.loc['Wind', 'luecken'] == 0
+    assert pruefung.bericht.loc['Wind', 'letzter_tag'] == pd.Timestamp('2020-01-03')
+
+
+def test_nur_zeilen_ohne_schluessel():
+    pruefung = pruefe_produktion(produktion([None, '2020-01-01'], ['Wind', None], [1.0, 2.0]))
+    assert pruefung.maske['ohne_schluessel'].all()
+    assert len(pruefung.bericht) == 0
+
+
+def test_luecken_und_duplikate():
+    df = produktion(['2020-01-01', '2020-01-01', '2020-01-04', '2020-01-01'],
+                    ['Wind', 'Wind', 'Wind', 'Solar'], [1.0, 1.0, 2.0, -1.0])
+    pruefung = pruefe_produktion(df)
+    assert pruefung.maske['duplikat'].tolist() == [False, True, False, False]
+    assert pruefung.maske['negativ'].tolist() == [False, False, False, True]
+    assert pruefung.luecken['fehlende_tage'].tolist() == [2]
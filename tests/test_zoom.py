@@ -0,0 +1,89 @@
+import matplotlib
+import numpy as np
+import pytest
+
+matplotlib.use('Agg')
+import matplotlib.dates as mdates  # noqa: E402
+import matplotlib.pyplot as plt  # noqa: E402
+
+from datenvis.zoom import ZoomAnsicht, ZoomPyramide  # noqa: E402
+
+
+@pytest.fixture
+def reihe():
+    """1000 Werte (nicht durch 2 teilbare Stufen) mit einigen fehlenden Werten."""
+    rng = np.random.default_rng(3)
+    werte = rng.normal(size=1000)
+    werte[[5, 6, 7, 400]] = np.nan
+    return np.arange(1000, dtype=float), werte
+
+
+@pytest.mark.filterwarnings('ignore:All-NaN slice')
+def test_einhuellende_pro_eintrag(reihe):
+    zeit, werte = reihe
+    pyramide = ZoomPyramide(zeit, werte)
+    for k, stufe in enumerate(pyramide.stufen):
+        # Eintrag j der Stufe k fasst die Rohdaten j * 2**k bis (j + 1) * 2**k - 1 zusammen
+        teile = [werte[j << k:(j + 1) << k] for j in range(len(stufe['von']))]
+        np.testing.assert_array_equal(stufe['min'], [np.nanmin(teil) for teil in teile])
+        np.testing.assert_array_equal(stufe['max'], [np.nanmax(teil) for teil in teile])
+        np.testing.assert_array_equal(stufe['anzahl'], [np.count_nonzero(~np.isnan(teil)) for teil in teile])
+        np.testing.assert_array_equal(stufe['von'], zeit[::1 << k])
+        np.testing.assert_array_equal(stufe['bis'], [zeit[j + len(teil) - 1]
+                                                     for j, teil in zip(range(0, len(zeit), 1 << k), teile)])
+    assert len(pyramide.stufen[-1]['von']) == 1
+    assert pyramide.wertebereich() == (np.nanmin(werte), np.nanmax(werte))
+
+
+@pytest.mark.parametrize('pixel, stufe', [(2000, 0), (1000, 0), (500, 1), (250, 2), (100, 3), (1, 9)])
+def test_stufe_passend_zur_breite(reihe, pixel, stufe):
+    zeit, werte = reihe
+    k, mitte, minimum, maximum, mittel = ZoomPyramide(zeit, werte).abfrage(0, 999, pixel)
+    assert k == stufe
+    # Gröbste Stufe mit mindestens einem Eintrag pro Pixel (soweit es so viele Rohdaten gibt)
+    assert len(mitte) >= min(pixel, 1000 >> k)
+    assert len(mitte) == len(minimum) == len(maximum) == len(mittel)
+
+
+def test_ausschnitt(reihe):
+    zeit, werte = reihe
+    k, mitte, minimum, maximum, mittel = ZoomPyramide(zeit, werte).abfrage(100, 199, 25)
+    # 100 Punkte (und je einer am Rand) auf 25 Pixel: Stufe 2 mit je 4 Punkten
+    assert k == 2
+    assert mitte[0] <= 99 and mitte[-1] >= 200
+    j = np.flatnonzero(mitte == 101.5)[0] # Eintrag mit den Rohdaten 100 bis 103
+    assert (minimum[j], maximum[j]) == (werte[100:104].min(), werte[100:104].max())
+    assert mittel[j] == pytest.approx(werte[100:104].mean())
+
+
+def test_laden_rechnet_in_die_aktuelle_epoche_um(tmp_path):
+    tage = np.arange('2020-01-01', '2020-03-01', dtype='datetime64[D]')
+    # Datumszahlen in der Epoche vor Matplotlib 3.3 (0000-12-31), unabhängig von der aktuellen Epoche
+    alte_epoche = '0000-12-31T00:00:00'
+    zahlen = mdates.date2num(tage) - mdates.date2num(np.datetime64(alte_epoche))
+    datei = tmp_path / 'wind.npz'
+    ZoomPyramide(zahlen, np.arange(len(tage), dtype=float), epoche=alte_epoche).speichern(datei)
+
+    pyramide = ZoomPyramide.laden(datei)
+    assert pyramide.epoche == mdates.get_epoch()
+    von, bis = pyramide.zeitbereich()
+    assert mdates.num2date(von).date().isoformat() == '2020-01-01'
+    assert mdates.num2date(bis).date().isoformat() == '2020-02-29'
+    assert pyramide.stufen[-1]['bis'][0] == bis
+
+
+def test_ansicht_aktualisiert_beim_zoomen(reihe):
+    zeit, werte = reihe
+    fig = plt.figure(figsize=(2, 1), dpi=100)
+    try:
+        ax = fig.add_axes((0, 0, 1, 1))
+        ansicht = ZoomAnsicht(ax, ZoomPyramide(zeit, werte))
+        grob = ansicht.stufe
+        ax.set_xlim(100, 150)
+        assert ansicht.stufe < grob
+        x = ansicht.mittel.get_xdata()
+        assert x.min() < 100 and x.max() > 150 and len(x) < 60
+        # Band: pro Eintrag ein senkrechter Strich von Minimum zu Maximum, getrennt durch NaN
+        assert len(ansicht.band.get_xdata()) == 3 * len(x)
+    finally:
+        plt.close(fig)